@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Archive Store
+
+Date-partitioned, compressed storage for data slimmed out of the queue
+(commands, tasks, reports and inbox messages), replacing one small YAML
+file per archived item.
+
+Layout (queue/archive/store/):
+  YYYY-MM-DD.jsonl.gz      segment for the day the records were archived.
+                           Each append adds one gzip member holding JSON lines
+                           ({"kind", "id", "agent", "cmd_id", "project",
+                           "archived_at", "source", "data"}), so a record is
+                           read back by decompressing only its member.
+  YYYY-MM-DD.index.jsonl   one line per record: the record's fields without
+                           "data" plus the member's offset/length and the
+                           record's line number inside the member.
+  .lock                    flock held while appending.
+
+Usage:
+  python3 scripts/archive_store.py query [--kind K] [--id ID] [--cmd CMD] [--agent A]
+                                         [--date YYYY-MM-DD] [--limit N] [--format jsonl|yaml]
+  python3 scripts/archive_store.py stats
+
+Queries read the small per-day indexes (only the given day's with --date) and
+decompress just the members that hold matching records.
+"""
+
+import argparse
+import fcntl
+import gzip
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+KINDS = ('command', 'task', 'report', 'inbox')
+SEGMENT_SUFFIX = '.jsonl.gz'
+INDEX_SUFFIX = '.index.jsonl'
+
+
+def get_store_dir(queue_dir=None):
+    if queue_dir is None:
+        queue_dir = Path(__file__).resolve().parent.parent / 'queue'
+    return Path(queue_dir) / 'archive' / 'store'
+
+
+def make_record(kind, data, record_id=None, agent=None, cmd_id=None, project=None, source=None):
+    """Build a record for append_records(); project defaults to the data's own project field."""
+    if project is None and isinstance(data, dict):
+        project = data.get('project')
+    return {
+        'kind': kind,
+        'id': record_id,
+        'agent': agent,
+        'cmd_id': cmd_id,
+        'project': project if isinstance(project, str) else None,
+        'source': source,
+        'data': data,
+    }
+
+
+@contextmanager
+def store_lock(store_dir):
+    store_dir.mkdir(parents=True, exist_ok=True)
+    with open(store_dir / '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def append_fsync(path, payload):
+    """Append bytes with O_APPEND and fsync; returns the offset they were written at."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        offset = os.lseek(fd, 0, os.SEEK_END)
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+        return offset
+    finally:
+        os.close(fd)
+
+
+def ends_with_newline(path):
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    except OSError:
+        return True  # missing or empty
+
+
+def append_records(records, store_dir=None, now=None):
+    """Append records to today's segment as one gzip member, then index them.
+
+    The segment is written and synced before the index, so an indexed record is
+    always readable. Returns the segment path (None if there was nothing to write).
+    """
+    if not records:
+        return None
+    store_dir = Path(store_dir) if store_dir is not None else get_store_dir()
+    now = now or datetime.now()
+    day = now.strftime('%Y-%m-%d')
+    archived_at = now.strftime('%Y-%m-%dT%H:%M:%S')
+
+    lines = []
+    for record in records:
+        record = dict(record, archived_at=archived_at)
+        lines.append(json.dumps(record, ensure_ascii=False, default=str))
+    member = gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+
+    segment = store_dir / f'{day}{SEGMENT_SUFFIX}'
+    with store_lock(store_dir):
+        offset = append_fsync(segment, member)
+        index_lines = []
+        for seq, record in enumerate(records):
+            entry = {key: value for key, value in record.items() if key != 'data'}
+            entry.update(archived_at=archived_at, segment=segment.name,
+                         offset=offset, length=len(member), seq=seq)
+            index_lines.append(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        index = store_dir / f'{day}{INDEX_SUFFIX}'
+        if not ends_with_newline(index):
+            # a torn last line from an interrupted append must not swallow the next entry
+            index_lines.insert(0, '\n')
+        append_fsync(index, ''.join(index_lines).encode('utf-8'))
+    return segment
+
+
+def index_paths(store_dir, date=None):
+    if date:
+        path = store_dir / f'{date}{INDEX_SUFFIX}'
+        return [path] if path.exists() else []
+    return sorted(store_dir.glob(f'*{INDEX_SUFFIX}'))
+
+
+def iter_index(store_dir=None, date=None):
+    """Yield index entries (oldest day first), skipping torn or corrupt lines."""
+    store_dir = Path(store_dir) if store_dir is not None else get_store_dir()
+    for path in index_paths(store_dir, date):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+
+def matches(entry, kind=None, record_id=None, cmd_id=None, agent=None):
+    if kind and entry.get('kind') != kind:
+        return False
+    if record_id and str(entry.get('id')) != record_id:
+        return False
+    if cmd_id and entry.get('cmd_id') != cmd_id:
+        return False
+    if agent and entry.get('agent') != agent:
+        return False
+    return True
+
+
+def query(store_dir=None, kind=None, record_id=None, cmd_id=None, agent=None, date=None, limit=None):
+    """Return matching records (with 'data'), decompressing only the members that hold them."""
+    store_dir = Path(store_dir) if store_dir is not None else get_store_dir()
+    hits = []
+    for entry in iter_index(store_dir, date):
+        if matches(entry, kind, record_id, cmd_id, agent):
+            hits.append(entry)
+            if limit and len(hits) >= limit:
+                break
+
+    members = {}
+    results = []
+    for entry in hits:
+        key = (entry['segment'], entry['offset'])
+        if key not in members:
+            with open(store_dir / entry['segment'], 'rb') as f:
+                f.seek(entry['offset'])
+                members[key] = gzip.decompress(f.read(entry['length'])).decode('utf-8').splitlines()
+        results.append(json.loads(members[key][entry['seq']]))
+    return results
+
+
+def stats(store_dir=None):
+    """Per-day record counts by kind and on-disk sizes."""
+    store_dir = Path(store_dir) if store_dir is not None else get_store_dir()
+    days = {}
+    for path in index_paths(store_dir):
+        day = path.name[:-len(INDEX_SUFFIX)]
+        counts = {}
+        for entry in iter_index(store_dir, day):
+            counts[entry.get('kind')] = counts.get(entry.get('kind'), 0) + 1
+        segment = store_dir / f'{day}{SEGMENT_SUFFIX}'
+        days[day] = {
+            'records': counts,
+            'segment_bytes': segment.stat().st_size if segment.exists() else 0,
+            'index_bytes': path.stat().st_size,
+        }
+    return days
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description='Query the queue archive store')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    q = sub.add_parser('query', help='fetch archived records')
+    q.add_argument('--kind', choices=KINDS)
+    q.add_argument('--id', dest='record_id', help='command id, task_id, report id or message id')
+    q.add_argument('--cmd', dest='cmd_id', help='parent command id')
+    q.add_argument('--agent')
+    q.add_argument('--date', help='archive date (YYYY-MM-DD)')
+    q.add_argument('--limit', type=int)
+    q.add_argument('--format', choices=('jsonl', 'yaml'), default='jsonl')
+
+    sub.add_parser('stats', help='record counts and sizes per day')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    store_dir = get_store_dir()
+
+    if args.command == 'stats':
+        print(json.dumps(stats(store_dir), ensure_ascii=False, indent=2))
+        return 0
+
+    results = query(store_dir, kind=args.kind, record_id=args.record_id, cmd_id=args.cmd_id,
+                    agent=args.agent, date=args.date, limit=args.limit)
+    if args.format == 'yaml':
+        if results:
+            yaml.dump(results, sys.stdout, allow_unicode=True, sort_keys=False, default_flow_style=False)
+    else:
+        for record in results:
+            print(json.dumps(record, ensure_ascii=False))
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
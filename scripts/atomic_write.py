@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Atomic File Writes
+
+Shared helper for every queue writer (inboxes, shogun_to_karo.yaml, task specs,
+dashboard state). The new content goes to a temp file in the target's directory,
+is fsynced and then renamed over the target, so a crash or a concurrent reader
+only ever sees the old file or the complete new one, never a truncated dump.
+
+  write_atomic(path, content)        str or bytes
+  dump_yaml_atomic(path, data, ...)  yaml.dump keyword arguments pass through
+
+Temp files are named .<name>.<random>.tmp, so they never match *.yaml globs.
+A writer killed before the rename leaves one behind; it holds nothing the
+target needs and can be deleted.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import yaml
+
+# Mode for files that did not exist before (mkstemp would create them 0600)
+NEW_FILE_MODE = 0o644
+
+
+def fsync_directory(directory):
+    """Persist a rename: fsync the directory entry itself."""
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_atomic(path, content, durable=True, fsync_dir=None):
+    """Replace path with content via temp file + fsync + rename.
+
+    durable=False skips the fsyncs (for files that can be rebuilt); the rename
+    still keeps readers from seeing partial content. fsync_dir defaults to durable.
+    The existing file's permission bits are kept.
+    """
+    path = Path(path)
+    if fsync_dir is None:
+        fsync_dir = durable
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = NEW_FILE_MODE
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync_dir:
+        fsync_directory(path.parent)
+
+
+def dump_yaml_atomic(path, data, durable=True, Dumper=yaml.Dumper, **dump_kwargs):
+    """yaml.dump data and write it atomically (serialisation errors leave the target untouched)."""
+    text = yaml.dump(data, Dumper=Dumper, **dump_kwargs)
+    write_atomic(path, text, durable=durable)
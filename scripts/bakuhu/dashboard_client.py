@@ -0,0 +1,70 @@
+"""
+dashboard_client.py — dashboard_daemon.py のクライアント側
+dashboard_read.py / dashboard_write.py が、常駐デーモンが居ればソケット経由で処理を任せるために使う。
+PyYAML 等に依存せず、デーモンが居ない時のコストは socket ファイルの存在確認だけ。
+詳細は dashboard_daemon.py を参照。
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+# クライアントが応答を待つ上限（秒）。超えたら読み出し系は直接処理に切り替える
+CLIENT_TIMEOUT = 10.0
+
+
+def socket_path(project_root: Path) -> Path:
+    return Path(os.environ.get("DASHBOARD_SOCKET") or project_root / "queue" / ".dashboard_daemon.sock")
+
+
+def request(project_root: Path, payload: dict, timeout: float = CLIENT_TIMEOUT) -> dict | None:
+    """デーモンに要求を送って応答を返す。デーモンが居なければ None。
+
+    接続後に失敗した場合は {"error": ...} を返す（書き込みが実行済みの可能性があるため区別する）。
+    """
+    path = socket_path(project_root)
+    if os.environ.get("DASHBOARD_NO_DAEMON") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    try:
+        with sock:
+            sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError) as e:
+        return {"error": str(e) or type(e).__name__}
+
+
+def forward(project_root: Path, tool: str, argv: list[str], stdin: str | None = None) -> bool:
+    """CLIの処理をデーモンに任せる。任せられたら出力・終了コードを再現して True。
+
+    stdin は標準入力を使う要求（dashboard_write.py --batch）の入力。
+    """
+    payload = {"tool": tool, "argv": argv}
+    if stdin is not None:
+        payload["stdin"] = stdin
+    response = request(project_root, payload)
+    if response is None or response.get("fallback"):
+        return False
+    if "error" in response:
+        if tool == "read":
+            return False
+        print(f"エラー: dashboard_daemon との通信に失敗しました（処理済みかは list-action 等で確認）: {response['error']}",
+              file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    if response["exit"]:
+        sys.exit(response["exit"])
+    return True
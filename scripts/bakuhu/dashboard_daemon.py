@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+dashboard_daemon.py — ダッシュボード常駐デーモン
+config / state / tasks / 本日の報告をメモリに保持し、Unixドメインソケット経由で
+dashboard_read.py / dashboard_write.py の処理を引き受ける。
+
+使い方:
+  uv run python scripts/dashboard_daemon.py            # 起動（フォアグラウンド。常駐させるなら nohup ... &）
+  uv run python scripts/dashboard_daemon.py --status   # 稼働確認
+  uv run python scripts/dashboard_daemon.py --stop     # 停止
+
+デーモンが動いている間、以下はソケットに要求を送って結果を表示するだけの薄いクライアントになる。
+  dashboard_read.py  : --section / --stdout / --format summary / 全体生成
+  dashboard_write.py : add-action / remove-action / list-action / add-senka
+デーモンが居なければ（またはソケットに繋がらなければ）従来どおり直接処理する。
+DASHBOARD_NO_DAEMON=1 で常に直接処理。dashboard_read.py の --no-cache / --reindex も常に直接処理。
+
+ソケット: queue/.dashboard_daemon.sock（環境変数 DASHBOARD_SOCKET で変更可）
+
+変更監視:
+  要求ごとに config / state / tasks の stat を前回と比べ、変わった入力だけを読み直す
+  （報告は報告索引が自前で鮮度を確かめるので、毎回索引から引き直す）。
+  inotifywait（inotify-tools）があれば、同じディレクトリの変更イベントも併せて使う
+  （stat が同じまま書き換えられた入力も拾う）。イベントは非同期に届くので、それだけには頼らない。
+  書き込み系の要求は dashboard_write のトランザクションで処理する
+  （ディスク上の索引・ログを使い、直接モードの書き手とも flock で直列化される）。
+
+プロトコル:
+  1接続1要求。クライアントは JSON 1行 {"tool": "read" | "write", "argv": [...]} を送り
+  （dashboard_write.py --batch の標準入力は "stdin" に入れる）、
+  デーモンは {"stdout", "stderr", "exit"}（自分で処理しない要求には {"fallback": true}）を返して切断する。
+  "tool" には "ping" / "shutdown" も使える。
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+import dashboard_read
+import dashboard_write
+from dashboard_client import request, socket_path
+
+WATCH_EVENTS = "close_write,moved_to,moved_from,create,delete"
+
+# 要求の受信・応答の送信を待つ上限（秒）。要求は1本ずつ処理するので、
+# 送ってこない・読まないクライアントが他の要求を待たせるのはこの時間まで
+REQUEST_READ_TIMEOUT = 1.0
+
+
+def read_request(conn: socket.socket) -> bytes:
+    """クライアントが書き込みを閉じるまで読む。REQUEST_READ_TIMEOUT を超えたら socket.timeout。"""
+    deadline = time.monotonic() + REQUEST_READ_TIMEOUT
+    chunks = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("要求の受信がタイムアウトしました")
+        conn.settimeout(remaining)
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+class LiveSource(dashboard_read.DashboardSource):
+    """メモリに保持する入力。invalidate() されたものだけ次の参照時に読み直す。"""
+
+    # 監視イベントより先に要求が来ると stat と中身が食い違うので、stat キーのキャッシュには載せない
+    stat_cacheable = False
+
+    def __init__(self, project_root: Path, config: dict):
+        super().__init__(project_root, config)
+        self._day = None
+
+    def invalidate(self, *names: str) -> None:
+        for name in names:
+            setattr(self, f"_{name}", None)
+
+    def reports(self) -> list[dict]:
+        # 日付が変われば「本日」も変わる
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self._day != today:
+            self._day = today
+            self._reports = None
+        return super().reports()
+
+
+class DashboardDaemon:
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.config_path = project_root / "config" / "dashboard_config.yaml"
+        self.settings_path = dashboard_read.settings_path(project_root)
+        self.running = True
+        self._changes = set()
+        self._changes_lock = threading.Lock()
+        self._watcher = None
+        self._signatures = {}
+        self.load_config()
+
+    # --- 入力の保持 ---
+
+    def load_config(self) -> None:
+        self.config = dashboard_read.load_config(self.project_root)
+        self.source = LiveSource(self.project_root, self.config)
+        self.read_cache = {"sections": {}, "written": None}
+        self.state_path = self.project_root / self.config["state_path"]
+        self.oplog_path = dashboard_write.oplog_path(self.state_path)
+        self.tasks_dir = self.project_root / self.config["tasks_dir"]
+        self.reports_dir = self.project_root / self.config["reports_dir"]
+
+    def classify(self, path: Path) -> str | None:
+        """変更のあったパスが、どの入力に当たるか。"""
+        if path == self.config_path:
+            return "config"
+        if path in (self.state_path, self.oplog_path):
+            return "state"
+        # 足軽の人数（settings.yaml の ashigaru_count）が変わればスナップショットの対象も変わる
+        if path == self.settings_path or (path.parent == self.tasks_dir and path.suffix == ".yaml"):
+            return "agents"
+        if path.parent == self.reports_dir and path.suffix == ".yaml":
+            return "reports"
+        return None
+
+    def poll_signatures(self) -> dict:
+        """変更検出用の stat シグネチャ。reports は報告索引が自前で鮮度を確かめる。
+
+        直近 RACY_WINDOW_NS 内に更新された入力は None（同じ mtime のまま再び書かれ得るので、毎回読み直す）。
+        """
+        now_ns = time.time_ns()
+        return {
+            "config": dashboard_read.stat_signature([self.config_path], now_ns),
+            "state": dashboard_read.stat_signature([self.state_path, self.oplog_path], now_ns),
+            "agents": dashboard_read.stat_signature([self.settings_path, *sorted(self.tasks_dir.glob("*.yaml"))], now_ns),
+        }
+
+    def refresh(self) -> None:
+        """前回の要求以降に変わった入力を無効化する。
+
+        書いた直後に要求が来ると、監視イベントがまだ読まれていないことがあるので、
+        inotifywait があっても stat の比較を必ず行う。
+        """
+        signatures = self.poll_signatures()
+        changed = {name for name, sig in signatures.items()
+                   if sig is None or self._signatures.get(name) != sig}
+        changed.add("reports")
+        self._signatures = signatures
+        if self._watcher is not None:
+            with self._changes_lock:
+                changed |= self._changes
+                self._changes = set()
+        if "config" in changed:
+            self.load_config()
+        elif changed:
+            self.source.invalidate(*changed)
+
+    def start_watcher(self) -> None:
+        self._signatures = self.poll_signatures()
+        if shutil.which("inotifywait") is None:
+            print("inotifywait が無いため、要求ごとの stat だけで変更を確認します", file=sys.stderr)
+            return
+        dirs = sorted({str(d) for d in (self.config_path.parent, self.state_path.parent, self.tasks_dir,
+                                        self.reports_dir) if d.is_dir()})
+        self._watcher = subprocess.Popen(
+            ["inotifywait", "-m", "-q", "-e", WATCH_EVENTS, "--format", "%w%f", *dirs],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        threading.Thread(target=self._read_events, daemon=True).start()
+
+    def _read_events(self) -> None:
+        for line in self._watcher.stdout:
+            kind = self.classify(Path(line.rstrip("\n")))
+            if kind is not None:
+                with self._changes_lock:
+                    self._changes.add(kind)
+
+    # --- 要求の処理 ---
+
+    def handle(self, payload: dict) -> dict:
+        tool = payload.get("tool")
+        argv = payload.get("argv") or []
+        if tool == "ping":
+            return {"stdout": f"dashboard_daemon 稼働中 (pid {os.getpid()})\n", "stderr": "", "exit": 0}
+        if tool == "shutdown":
+            self.running = False
+            return {"stdout": "dashboard_daemon を停止します\n", "stderr": "", "exit": 0}
+        if tool not in ("read", "write"):
+            return {"stdout": "", "stderr": f"不明な要求: {tool}\n", "exit": 2}
+
+        out, err = io.StringIO(), io.StringIO()
+        code = 0
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                if tool == "read":
+                    args = dashboard_read.build_parser(prog="dashboard_read.py").parse_args(argv)
+                    if args.no_cache or args.reindex:
+                        return {"fallback": True}
+                    self.refresh()
+                    dashboard_read.run(args, self.source, self.read_cache)
+                else:
+                    args = dashboard_write.build_parser(prog="dashboard_write.py").parse_args(argv)
+                    self.refresh()
+                    try:
+                        dashboard_write.run(args, self.project_root, self.config, self.state_path,
+                                            payload.get("stdin"))
+                    finally:
+                        if args.command != "list-action":
+                            self.source.invalidate("state")
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                    code = 1
+                else:
+                    code = e.code or 0
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        return {"stdout": out.getvalue(), "stderr": err.getvalue(), "exit": code}
+
+    def serve(self) -> None:
+        path = socket_path(self.project_root)
+        if path.exists():
+            response = request(self.project_root, {"tool": "ping"}, timeout=2.0)
+            if response is not None and "error" not in response:
+                print(f"エラー: 既に起動しています: {response['stdout'].strip()}", file=sys.stderr)
+                sys.exit(1)
+            path.unlink()  # 前回の異常終了で残ったソケット
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        os.chmod(path, 0o600)
+        server.listen(64)
+
+        def stop(*_):
+            # 処理中の要求は最後まで応答し、次の accept で抜ける（例外にすると handle() が要求の終了コードにしてしまう）
+            self.running = False
+            server.close()
+
+        signal.signal(signal.SIGTERM, stop)
+        self.start_watcher()
+        print(f"dashboard_daemon 起動: {path} (pid {os.getpid()})", file=sys.stderr)
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    if not self.running:
+                        break
+                    raise
+                with conn:
+                    try:
+                        payload = json.loads(read_request(conn).decode("utf-8"))
+                        response = self.handle(payload)
+                        conn.settimeout(REQUEST_READ_TIMEOUT)
+                        conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+                    except (OSError, ValueError) as e:
+                        print(f"要求の処理に失敗: {e}", file=sys.stderr)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            path.unlink(missing_ok=True)
+            if self._watcher is not None:
+                self._watcher.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ダッシュボード常駐デーモン")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--status", action="store_true", help="稼働確認")
+    group.add_argument("--stop", action="store_true", help="停止")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    if args.status or args.stop:
+        response = request(project_root, {"tool": "shutdown" if args.stop else "ping"}, timeout=5.0)
+        if response is None or "error" in response:
+            print("dashboard_daemon は起動していません", file=sys.stderr)
+            sys.exit(1)
+        print(response["stdout"], end="")
+        return
+
+    DashboardDaemon(project_root).serve()
+
+
+if __name__ == "__main__":
+    main()
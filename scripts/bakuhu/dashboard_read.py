@@ -10,18 +10,99 @@ YAMLデータソースからMarkdownダッシュボードを生成する。
   uv run python scripts/dashboard_read.py --section progress      # 📋進行中のみ
   uv run python scripts/dashboard_read.py --section senka         # ✅戦果のみ
   uv run python scripts/dashboard_read.py --section agents        # エージェント状態（tmux不要版）
+  uv run python scripts/dashboard_read.py --format json           # 要対応・進行中・戦果・エージェント状態をJSONで
+  uv run python scripts/dashboard_read.py --format json --section action   # JSONの該当キーのみ
+  uv run python scripts/dashboard_read.py --no-cache              # セクションキャッシュを使わず全再生成
+  uv run python scripts/dashboard_read.py --reindex               # 報告索引を作り直してから生成（過去日の報告の書き換えはこれでのみ反映）
+
+output_path へ書き込む前に、生成内容を dashboard_validate.py のルールで検証する。
+ERROR（必須セクション欠落など）があれば書き込まずに終了コード1で終わる。WARNING は表示のみ。
+
+dashboard_daemon.py が起動していれば、--no-cache / --reindex 以外はデーモンに処理を任せる
+（DASHBOARD_NO_DAEMON=1 で常に直接処理）。
+
+JSON出力（--format json）:
+  Markdown と同じデータを build_model() の辞書として1行のJSONで出力する（文字列は組み立てない）。
+    generated_at / counts {action, in_progress, senka} / actions / action_types /
+    in_progress / senka（新しい順）/ agents [{agent, path, status}]
+  値の無いフィールドは null。Markdown の表示用の省略（"—"、80文字切り詰め等）はしない。
+
+エージェント状態:
+  足軽は config/settings.yaml の ashigaru_count 人分（無ければ8人）と軍師のタスクYAMLを
+  1回ずつ読んだスナップショット（load_agent_snapshot）を、進行中セクション・要約・JSONで共有する。
+
+セクションキャッシュ:
+  action / progress / 関連ファイル の各セクションは、入力ファイルの
+  (mtime, size) をキーに queue/.dashboard_read_cache.json（config の cache_path）へ
+  保存し、入力が変わったセクションだけ再計算する。入力YAMLの読み込みも必要な分だけ行う。
+  senka は下記の報告索引から毎回組み立てる（索引の参照は本日分のみ）。
+  生成内容が前回書き込み時と同一で、出力ファイルも書き込み後に変更されていなければ
+  書き込み自体を省略する（最終更新時刻は内容が変わった時だけ進む）。
+
+報告索引:
+  reports_dir/.report_index/ に、報告YAMLの senka 表示用フィールドを日付別に保存する。
+    meta.json         索引形式と、最後に走査した時の reports_dir の mtime
+    files.json        ファイル名 → timestamp に含まれる日付の一覧
+    <YYYY-MM-DD>.json その日付の報告（stat と表示用フィールド）
+  reports_dir の mtime が変わった時（報告の追加・削除）だけ一覧を取り直し、
+  新しいファイルだけを解析する。本日分のファイルは毎回 stat し、書き換えも拾う。
+  過去日の報告を後から書き換えた場合は --reindex で作り直す。
 """
 
+import sys
+from pathlib import Path
+
+# 常駐デーモン（dashboard_daemon.py）が動いていればそちらに任せる。CLI の応答を縮めるため、
+# PyYAML 等の重い import より前に確かめる（--no-cache / --reindex はデーモンが断り、直接処理になる）
+if __name__ == "__main__":
+    try:
+        import dashboard_client
+    except ImportError:
+        pass
+    else:
+        if dashboard_client.forward(Path(__file__).parent.parent, "read", sys.argv[1:]):
+            sys.exit(0)
+
 import argparse
+import fcntl
 import glob
+import hashlib
+import json
 import os
-import sys
+import re
+import time
 from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from pathlib import Path
 
 import yaml
 
+import dashboard_validate
+import dashboard_write
+# atomic_write.py は scripts/ 直下（scripts/bakuhu/ の一つ上）にある
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from atomic_write import write_atomic  # noqa: E402
+
+# キャッシュ形式を変えたら上げる（古いキャッシュは丸ごと破棄）
+CACHE_VERSION = 1
+
+# この時間内に更新されたファイルは mtime が粗い FS で同一値になり得るため、
+# そのファイルを入力とするセクションはキャッシュに載せない
+RACY_WINDOW_NS = 2_000_000_000
+
+CACHED_SECTIONS = ("action", "progress", "senka", "related")
+
+# 報告索引（形式を変えたら上げる。古い索引は作り直す）
+REPORT_INDEX_VERSION = 1
+REPORT_INDEX_DIR = ".report_index"
+# senka の表示に使う報告フィールド（索引にはこれだけ保存する）
+REPORT_INDEX_FIELDS = ("timestamp", "completed_at", "cmd_id", "task_id", "project", "summary", "content", "title")
+DATE_IN_TEXT = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# config/settings.yaml に ashigaru_count が無い・読めない時の足軽数（従来の表示範囲）
+DEFAULT_ASHIGARU_COUNT = 8
+ASHIGARU_COUNT_LINE = re.compile(r"^ashigaru_count:\s*(\d+)", re.MULTILINE)
+
 
 def load_config(project_root: Path) -> dict:
     config_path = project_root / "config" / "dashboard_config.yaml"
@@ -30,28 +111,73 @@ def load_config(project_root: Path) -> dict:
 
 
 def load_state(project_root: Path, config: dict) -> dict:
-    state_path = project_root / config["state_path"]
-    if not state_path.exists():
-        return {"action_required": [], "projects": [], "archives": []}
-    with open(state_path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    """スナップショットに操作ログを再生した state（dashboard_write.load_state）。"""
+    return dashboard_write.load_state(project_root / config["state_path"])
+
+
+def settings_path(project_root: Path) -> Path:
+    return project_root / "config" / "settings.yaml"
 
 
-def load_task_yamls(project_root: Path, config: dict) -> list[dict]:
+def ashigaru_count(project_root: Path) -> int:
+    """config/settings.yaml の ashigaru_count（シェル側のスクリプトと同じく行単位で読む）。"""
+    try:
+        text = settings_path(project_root).read_text(encoding="utf-8")
+    except OSError:
+        return DEFAULT_ASHIGARU_COUNT
+    m = ASHIGARU_COUNT_LINE.search(text)
+    return int(m.group(1)) if m and int(m.group(1)) > 0 else DEFAULT_ASHIGARU_COUNT
+
+
+def agent_task_paths(project_root: Path, config: dict) -> list[tuple[str, Path]]:
+    """(エージェント名, タスクYAML) の一覧。足軽は settings の人数分、最後に軍師。"""
     tasks_dir = project_root / config["tasks_dir"]
-    tasks = []
-    for path in sorted(tasks_dir.glob("ashigaru*.yaml")):
+    agents = [f"ashigaru{i}" for i in range(1, ashigaru_count(project_root) + 1)] + ["gunshi"]
+    return [(agent, tasks_dir / f"{agent}.yaml") for agent in agents]
+
+
+def load_agent_snapshot(project_root: Path, config: dict) -> list[dict]:
+    """各エージェントのタスクYAMLを1回ずつ読んだスナップショット。
+
+    [{"agent", "path", "status", "task"}]。ファイルの無いエージェントは含めない。
+    task は YAML の中身（空・読めなければ None）、status はその status（無ければ idle、読めなければ unknown）。
+    進行中セクションも戦況要約もこれを使う。
+    """
+    snapshot = []
+    for agent, path in agent_task_paths(project_root, config):
         try:
             with open(path, encoding="utf-8") as f:
                 data = yaml.safe_load(f)
-                if data:
-                    tasks.append(data)
+        except FileNotFoundError:
+            continue
         except Exception:
-            pass
-    return tasks
+            data = []  # 読めないファイルは unknown 扱い
+        if data is not None and not isinstance(data, dict):
+            snapshot.append({"agent": agent, "path": path, "status": "unknown", "task": None})
+            continue
+        snapshot.append({
+            "agent": agent,
+            "path": path,
+            "status": data.get("status", "idle") if data else "idle",
+            "task": data or None,
+        })
+    return snapshot
+
+
+def snapshot_tasks(agents: list[dict]) -> list[dict]:
+    """スナップショットのうち足軽のタスク（進行中セクションの入力）。"""
+    return [a["task"] for a in agents if a["agent"].startswith("ashigaru") and a["task"]]
 
 
 def load_today_reports(project_root: Path, config: dict) -> list[dict]:
+    """本日の報告（senka 表示用フィールドのみ）を報告索引から返す。"""
+    reports_dir = project_root / config["reports_dir"]
+    today = datetime.now().strftime("%Y-%m-%d")
+    return load_indexed_reports(reports_dir, today)
+
+
+def scan_today_reports(project_root: Path, config: dict) -> list[dict]:
+    """索引を使わず、全報告YAMLを解析して本日の報告を返す（比較・検証用）。"""
     reports_dir = project_root / config["reports_dir"]
     today = datetime.now().strftime("%Y-%m-%d")
     reports = []
@@ -70,6 +196,207 @@ def load_today_reports(project_root: Path, config: dict) -> list[dict]:
     return reports
 
 
+def read_json(path: Path, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: Path, data) -> None:
+    """一時ファイル経由で置き換える（読み手に書きかけを見せない。作り直せるので fsync はしない）。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(data, ensure_ascii=False, default=str), durable=False)
+
+
+def index_report(path: Path) -> dict:
+    """報告YAMLを解析し、索引エントリ {"stat", "dates", "report"} を返す。
+
+    読めない・辞書でない報告は report=None で登録し、次回から解析し直さない。
+    """
+    entry = {"stat": None, "dates": [], "report": None}
+    try:
+        st = path.stat()
+        entry["stat"] = [st.st_mtime_ns, st.st_size]
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        ts = str(data.get("timestamp", data.get("completed_at", "")))
+    except Exception:
+        return entry
+    if not data:
+        return entry
+    entry["dates"] = sorted(set(DATE_IN_TEXT.findall(ts)))
+    # datetime 等は write_json が str() にする（build_senka_section も str() で扱う）
+    entry["report"] = {key: data[key] for key in REPORT_INDEX_FIELDS if key in data}
+    return entry
+
+
+def update_report_index(index_dir: Path, files: dict, updates: dict) -> None:
+    """updates = {ファイル名: エントリ or None（削除）} を日付別ファイルと files に反映する。"""
+    partitions = {}
+    for name, entry in updates.items():
+        old_dates = files.pop(name, [])
+        new_dates = entry["dates"] if entry is not None else []
+        if entry is not None:
+            files[name] = new_dates
+        for date in set(old_dates) | set(new_dates):
+            if date not in partitions:
+                partitions[date] = read_json(index_dir / f"{date}.json", {})
+            if date in new_dates:
+                partitions[date][name] = entry
+            else:
+                partitions[date].pop(name, None)
+    for date, partition in partitions.items():
+        write_json(index_dir / f"{date}.json", partition)
+
+
+def rescan_report_index(reports_dir: Path, index_dir: Path, dir_mtime_ns: int) -> None:
+    """reports_dir の一覧を取り直し、増えた報告を解析・消えた報告を索引から外す。"""
+    meta = read_json(index_dir / "meta.json", {})
+    files = read_json(index_dir / "files.json", {}) if meta.get("version") == REPORT_INDEX_VERSION else {}
+    if meta.get("version") != REPORT_INDEX_VERSION:
+        for path in index_dir.glob("*.json"):
+            path.unlink()
+
+    names = {entry.name for entry in os.scandir(reports_dir) if entry.name.endswith(".yaml")}
+    updates = {name: index_report(reports_dir / name) for name in sorted(names - files.keys())}
+    updates.update({name: None for name in files.keys() - names})
+    if updates:
+        update_report_index(index_dir, files, updates)
+        write_json(index_dir / "files.json", files)
+
+    # 走査中に変更が続いている可能性がある間は mtime を記録せず、次回も走査する
+    recorded = dir_mtime_ns if time.time_ns() - dir_mtime_ns >= RACY_WINDOW_NS else None
+    write_json(index_dir / "meta.json", {"version": REPORT_INDEX_VERSION, "dir_mtime_ns": recorded})
+
+
+@contextmanager
+def report_index_lock(index_dir: Path):
+    """索引の更新を直列化する（同時に走った dashboard_read 同士で更新を失わないため）。"""
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with open(index_dir / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def clear_report_index(index_dir: Path) -> None:
+    """索引を空にする（--reindex）。同時に走る dashboard_read の更新と混ざらないようロックの中で消し、.lock は残す。"""
+    if not index_dir.is_dir():
+        return
+    with report_index_lock(index_dir):
+        for path in index_dir.glob("*.json"):
+            path.unlink()
+
+
+def stale_today_entries(reports_dir: Path, partition: dict) -> list[str]:
+    """当日分のうち書き換え・削除されたもの（直近に更新されたものは stat が同じでも含める）。"""
+    now_ns = time.time_ns()
+    stale = []
+    for name, entry in partition.items():
+        try:
+            st = (reports_dir / name).stat()
+        except OSError:
+            stale.append(name)
+            continue
+        if entry["stat"] != [st.st_mtime_ns, st.st_size] or now_ns - st.st_mtime_ns < RACY_WINDOW_NS:
+            stale.append(name)
+    return stale
+
+
+def load_indexed_reports(reports_dir: Path, day: str) -> list[dict]:
+    """timestamp に day を含む報告を、ファイル名順に索引から返す。"""
+    try:
+        dir_mtime_ns = reports_dir.stat().st_mtime_ns
+    except OSError:
+        return []
+    index_dir = reports_dir / REPORT_INDEX_DIR
+    meta = read_json(index_dir / "meta.json", {})
+    partition = None
+    if meta.get("version") == REPORT_INDEX_VERSION and meta.get("dir_mtime_ns") == dir_mtime_ns:
+        partition = read_json(index_dir / f"{day}.json", {})
+        if stale_today_entries(reports_dir, partition):
+            partition = None
+
+    if partition is None:
+        with report_index_lock(index_dir):
+            meta = read_json(index_dir / "meta.json", {})
+            if meta.get("version") != REPORT_INDEX_VERSION or meta.get("dir_mtime_ns") != dir_mtime_ns:
+                rescan_report_index(reports_dir, index_dir, dir_mtime_ns)
+            partition = read_json(index_dir / f"{day}.json", {})
+            stale = stale_today_entries(reports_dir, partition)
+            if stale:
+                files = read_json(index_dir / "files.json", {})
+                updates = {}
+                for name in stale:
+                    path = reports_dir / name
+                    updates[name] = index_report(path) if path.exists() else None
+                update_report_index(index_dir, files, updates)
+                write_json(index_dir / "files.json", files)
+                partition = read_json(index_dir / f"{day}.json", {})
+
+    reports = []
+    for name in sorted(partition):
+        report = partition[name]["report"]
+        ts = str(report.get("timestamp", report.get("completed_at", "")))
+        if day in ts:
+            reports.append(report)
+    return reports
+
+
+ACTIVE_TASK_STATUSES = ("assigned", "in_progress")
+# --format json --section X で出力するキー
+JSON_SECTION_KEYS = {"action": "actions", "progress": "in_progress", "senka": "senka", "agents": "agents"}
+
+
+def active_tasks(tasks: list[dict]) -> list[dict]:
+    return [t for t in tasks if t.get("status") in ACTIVE_TASK_STATUSES]
+
+
+def report_timestamp(report: dict) -> str:
+    return str(report.get("timestamp", report.get("completed_at", "")))
+
+
+def senka_reports(reports: list[dict]) -> list[dict]:
+    """本日の報告を新しい順に。"""
+    return sorted(reports, key=report_timestamp, reverse=True)
+
+
+def build_model(source) -> dict:
+    """Markdown と同じデータの構造化版（--format json）。"""
+    state = source.state()
+    items = state.get("action_required", [])
+    active = active_tasks(source.tasks())
+    reports = senka_reports(source.reports())
+    type_counts = Counter(item.get("type", "不明") for item in items)
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "counts": {"action": len(items), "in_progress": len(active), "senka": len(reports)},
+        "actions": [
+            {key: item.get(key) for key in ("id", "cmd_id", "project", "type", "content", "added")}
+            for item in items
+        ],
+        "action_types": [{"type": t, "count": c} for t, c in type_counts.most_common()],
+        "in_progress": [
+            {key: t.get(key) for key in ("cmd_id", "project", "assigned_to", "task_id", "title", "status")}
+            for t in active
+        ],
+        "senka": [
+            {
+                "timestamp": report_timestamp(r) or None,
+                "cmd_id": r.get("cmd_id", r.get("task_id")),
+                "project": r.get("project"),
+                "content": r.get("summary", r.get("content", r.get("title"))),
+            }
+            for r in reports
+        ],
+        "agents": [
+            {"agent": a["agent"], "path": os.path.relpath(a["path"], source.project_root), "status": a["status"]}
+            for a in source.agents()
+        ],
+    }
+
+
 def build_action_section(state: dict) -> str:
     items = state.get("action_required", [])
     if not items:
@@ -89,10 +416,7 @@ def build_action_section(state: dict) -> str:
 
 
 def build_progress_section(tasks: list[dict]) -> str:
-    active = [
-        t for t in tasks
-        if t.get("status") in ("assigned", "in_progress")
-    ]
+    active = active_tasks(tasks)
     lines = ["## 📋 進行中", ""]
     if not active:
         lines.append("（なし）")
@@ -123,8 +447,8 @@ def build_senka_section(reports: list[dict]) -> str:
 
     lines.append("| 時刻 | cmd_id | PJ | 内容 |")
     lines.append("|------|--------|-----|------|")
-    for r in sorted(reports, key=lambda x: str(x.get("timestamp", x.get("completed_at", ""))), reverse=True):
-        ts = str(r.get("timestamp", r.get("completed_at", "")))
+    for r in senka_reports(reports):
+        ts = report_timestamp(r)
         time_str = ts[11:16] if len(ts) >= 16 else ts
         cmd_id = r.get("cmd_id", r.get("task_id", "—"))
         project = r.get("project", "—")
@@ -155,7 +479,8 @@ def build_related_files_section(state: dict) -> str:
     return "\n".join(lines)
 
 
-def build_summary(tasks: list[dict], reports: list[dict], state: dict, project_root: Path, config: dict) -> str:
+def build_summary(agents: list[dict], reports: list[dict], state: dict) -> str:
+    """戦況要約。agents は load_agent_snapshot() の結果（タスクYAMLを読み直さない）。"""
     lines = ["=== 戦況要約 ==="]
 
     # 要対応
@@ -166,7 +491,7 @@ def build_summary(tasks: list[dict], reports: list[dict], state: dict, project_r
     lines.append(f"🚨 要対応: {action_count}件" + (f"（{type_summary}）" if type_summary else ""))
 
     # 進行中
-    active = [t for t in tasks if t.get("status") in ("assigned", "in_progress")]
+    active = active_tasks(snapshot_tasks(agents))
     if active:
         parts = [f"{t.get('assigned_to','?')}={t.get('task_id','?')}({t.get('project','?')})" for t in active]
         lines.append(f"📋 進行中: {', '.join(parts)}")
@@ -190,32 +515,12 @@ def build_summary(tasks: list[dict], reports: list[dict], state: dict, project_r
         lines.append("---")
 
     # 足軽状態
-    tasks_dir = project_root / config["tasks_dir"]
-    agent_statuses = []
-    for i in range(1, 9):
-        path = tasks_dir / f"ashigaru{i}.yaml"
-        if path.exists():
-            try:
-                with open(path, encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                status = data.get("status", "idle") if data else "idle"
-                agent_statuses.append(f"ashigaru{i}={status}")
-            except Exception:
-                agent_statuses.append(f"ashigaru{i}=unknown")
+    agent_statuses = [f"{a['agent']}={a['status']}" for a in agents if a["agent"] != "gunshi"]
     if agent_statuses:
         lines.append(f"足軽状態: {', '.join(agent_statuses)}")
 
     # 軍師状態
-    extra = []
-    gunshi_path = tasks_dir / "gunshi.yaml"
-    if gunshi_path.exists():
-        try:
-            with open(gunshi_path, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-            status = data.get("status", "idle") if data else "idle"
-            extra.append(f"軍師: {status}")
-        except Exception:
-            extra.append("軍師: unknown")
+    extra = [f"軍師: {a['status']}" for a in agents if a["agent"] == "gunshi"]
     if extra:
         lines.append(" | ".join(extra))
 
@@ -223,6 +528,15 @@ def build_summary(tasks: list[dict], reports: list[dict], state: dict, project_r
 
 
 def build_full_dashboard(tasks: list[dict], reports: list[dict], state: dict) -> str:
+    return assemble_dashboard({
+        "action": build_action_section(state),
+        "progress": build_progress_section(tasks),
+        "senka": build_senka_section(reports),
+        "related": build_related_files_section(state),
+    })
+
+
+def assemble_dashboard(sections: dict[str, str]) -> str:
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     header = f"""# 戦況報告書（Dashboard）
 
@@ -233,18 +547,145 @@ def build_full_dashboard(tasks: list[dict], reports: list[dict], state: dict) ->
 ---
 
 """
-    sections = [
+    parts = [
         header,
-        build_action_section(state) + "\n---\n\n",
-        build_progress_section(tasks) + "\n---\n\n",
-        build_senka_section(reports) + "\n---\n\n",
-        build_related_files_section(state),
+        sections["action"] + "\n---\n\n",
+        sections["progress"] + "\n---\n\n",
+        sections["senka"] + "\n---\n\n",
+        sections["related"],
     ]
-    return "".join(sections)
+    return "".join(parts)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="ダッシュボード生成スクリプト")
+def stat_signature(paths: list[Path], now_ns: int) -> list | None:
+    """[[path, mtime_ns, size], ...]。直近 RACY_WINDOW_NS 内に更新されたファイルがあれば None。"""
+    sig = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append([str(path), None, None])
+            continue
+        if now_ns - st.st_mtime_ns < RACY_WINDOW_NS:
+            return None
+        sig.append([str(path), st.st_mtime_ns, st.st_size])
+    return sig
+
+
+def section_signatures(project_root: Path, config: dict) -> dict[str, list | None]:
+    """各セクションの入力ファイルのシグネチャ。Noneのセクションはキャッシュ不可。"""
+    now_ns = time.time_ns()
+    state_path = project_root / config["state_path"]
+    state_sig = stat_signature([state_path, dashboard_write.oplog_path(state_path)], now_ns)
+    # 足軽の人数は settings で決まるので、settings.yaml も入力に含める
+    task_paths = [path for agent, path in agent_task_paths(project_root, config) if agent != "gunshi"]
+    task_sig = stat_signature([settings_path(project_root)] + task_paths, now_ns)
+    return {
+        "action": state_sig,
+        "progress": task_sig,
+        # senka は報告索引が本日分だけを返すので、毎回組み立てる
+        "senka": None,
+        "related": state_sig,
+    }
+
+
+def default_cache_path(project_root: Path, config: dict) -> Path:
+    return project_root / config.get("cache_path", "queue/.dashboard_read_cache.json")
+
+
+def load_section_cache(cache_path: Path, config_sig: list) -> dict:
+    """キャッシュを読む。形式やconfigが変わっていれば空のキャッシュを返す。"""
+    empty = {"version": CACHE_VERSION, "config": config_sig, "sections": {}, "written": None}
+    cache = read_json(cache_path, None)
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION or cache.get("config") != config_sig:
+        return empty
+    return cache
+
+
+def save_section_cache(cache_path: Path, cache: dict) -> None:
+    write_json(cache_path, cache)
+
+
+class DashboardSource:
+    """ダッシュボードの入力（state / エージェントのスナップショット / 本日の報告）。初回参照時に読み込む。
+
+    dashboard_daemon.LiveSource はこれを継承し、変更監視で無効化しながらメモリに保持する。
+    """
+
+    # False のソースはファイルの stat と内容が食い違い得るので、セクションキャッシュに載せない
+    stat_cacheable = True
+
+    def __init__(self, project_root: Path, config: dict):
+        self.project_root = project_root
+        self.config = config
+        self._state = None
+        self._agents = None
+        self._reports = None
+
+    def state(self) -> dict:
+        if self._state is None:
+            self._state = load_state(self.project_root, self.config)
+        return self._state
+
+    def agents(self) -> list[dict]:
+        if self._agents is None:
+            self._agents = load_agent_snapshot(self.project_root, self.config)
+        return self._agents
+
+    def tasks(self) -> list[dict]:
+        return snapshot_tasks(self.agents())
+
+    def reports(self) -> list[dict]:
+        if self._reports is None:
+            self._reports = load_today_reports(self.project_root, self.config)
+        return self._reports
+
+
+def build_sections(source: DashboardSource, names: tuple[str, ...], cache: dict | None) -> dict[str, dict]:
+    """指定セクションを {name: {"text", "count"}} で返す。
+
+    cache が渡されれば入力シグネチャが一致するセクションは再利用し、
+    再計算したセクションでキャッシュを更新する。入力YAMLは再計算に必要な分だけ読む。
+    """
+    use_cache = cache is not None and source.stat_cacheable
+    signatures = section_signatures(source.project_root, source.config) if use_cache else {}
+    cached = cache["sections"] if use_cache else {}
+    result = {}
+    for name in names:
+        entry = cached.get(name)
+        sig = signatures.get(name)
+        if entry is not None and sig is not None and entry["sig"] == sig:
+            result[name] = entry
+            continue
+
+        if name == "action":
+            state = source.state()
+            entry = {"text": build_action_section(state), "count": len(state.get("action_required", []))}
+        elif name == "progress":
+            tasks = source.tasks()
+            entry = {"text": build_progress_section(tasks), "count": len(active_tasks(tasks))}
+        elif name == "senka":
+            reports = source.reports()
+            entry = {"text": build_senka_section(reports), "count": len(reports)}
+        else:
+            state = source.state()
+            entry = {"text": build_related_files_section(state), "count": len(state.get("projects", []))}
+        result[name] = entry
+        if use_cache:
+            if sig is not None:
+                cached[name] = dict(entry, sig=sig)
+            else:
+                cached.pop(name, None)
+    return result
+
+
+def content_digest(sections: dict[str, dict]) -> str:
+    body = "\0".join(sections[name]["text"] for name in CACHED_SECTIONS)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def build_parser(prog: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog, description="ダッシュボード生成スクリプト")
     parser.add_argument(
         "--section",
         choices=["action", "progress", "senka", "agents"],
@@ -257,48 +698,112 @@ def main():
     )
     parser.add_argument(
         "--format",
-        choices=["summary"],
+        choices=["summary", "json"],
         dest="format",
-        help="出力フォーマット（summary: 要約モード 15-20行）",
+        help="出力フォーマット（summary: 要約モード 15-20行 / json: 構造化データ）",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="セクションキャッシュを使わず全セクションを再生成する",
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="報告索引（reports_dir/.report_index）を作り直す。過去日の報告を後から書き換えた場合は、これを付けた時だけ反映される",
+    )
+    return parser
 
-    # プロジェクトルートを特定（このスクリプトの親ディレクトリ）
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
 
-    config = load_config(project_root)
-    state = load_state(project_root, config)
-    tasks = load_task_yamls(project_root, config)
-    reports = load_today_reports(project_root, config)
+def run(args, source: DashboardSource, cache: dict | None) -> None:
+    """引数に応じて出力する。cache は変更されるので、呼び出し側が必要なら保存する。"""
+    project_root = source.project_root
+    config = source.config
 
     if args.format == "summary":
-        output = build_summary(tasks, reports, state, project_root, config)
+        output = build_summary(source.agents(), source.reports(), source.state())
         print(output)
         return
 
-    if args.section == "action":
-        output = build_action_section(state)
-    elif args.section == "progress":
-        output = build_progress_section(tasks)
-    elif args.section == "senka":
-        output = build_senka_section(reports)
-    elif args.section == "agents":
-        output = "## エージェント状態\n\n（tmuxコマンドで確認: tmux list-panes -a -F '#{session_name}:#{window_index}.#{pane_index} #{@agent_id}'）\n"
-    else:
-        output = build_full_dashboard(tasks, reports, state)
+    if args.format == "json":
+        model = build_model(source)
+        if args.section:
+            model = {JSON_SECTION_KEYS[args.section]: model[JSON_SECTION_KEYS[args.section]]}
+        print(json.dumps(model, ensure_ascii=False, default=str))
+        return
 
-    if args.stdout or args.section:
-        print(output)
+    if args.section == "agents":
+        print("## エージェント状態\n\n（tmuxコマンドで確認: tmux list-panes -a -F '#{session_name}:#{window_index}.#{pane_index} #{@agent_id}'）\n")
+        return
+
+    names = (args.section,) if args.section else CACHED_SECTIONS
+    sections = build_sections(source, names, cache)
+
+    if args.section:
+        print(sections[args.section]["text"])
+        return
+
+    output_path = project_root / config["output_path"]
+    digest = content_digest(sections)
+    written = cache.get("written") if cache is not None else None
+    unchanged = False
+    if written and written.get("digest") == digest and not args.stdout:
+        try:
+            st = output_path.stat()
+            unchanged = [st.st_mtime_ns, st.st_size] == written["stat"]
+        except OSError:
+            pass
+
+    if args.stdout:
+        print(assemble_dashboard({name: sections[name]["text"] for name in CACHED_SECTIONS}))
+    elif unchanged:
+        print(f"変更なし（書き込み省略）: {output_path}", file=sys.stderr)
     else:
-        output_path = project_root / config["output_path"]
+        output = assemble_dashboard({name: sections[name]["text"] for name in CACHED_SECTIONS})
+        # 書き込み前に生成内容を検証し、ERROR があれば書き込まない
+        result = dashboard_validate.validate(output, config)
+        for issue in result["issues"]:
+            print(dashboard_validate.format_issue(issue), file=sys.stderr)
+        if not result["ok"]:
+            print(f"検証エラーのため書き込みません: {output_path}", file=sys.stderr)
+            sys.exit(1)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(output)
+        write_atomic(output_path, output)
+        if cache is not None:
+            st = output_path.stat()
+            cache["written"] = {"digest": digest, "stat": [st.st_mtime_ns, st.st_size]}
         print(f"生成完了: {output_path}", file=sys.stderr)
-        print(f"  要対応: {len(state.get('action_required', []))}件", file=sys.stderr)
-        print(f"  進行中: {len([t for t in tasks if t.get('status') in ('assigned', 'in_progress')])}件", file=sys.stderr)
-        print(f"  本日の戦果: {len(reports)}件", file=sys.stderr)
+    if not args.stdout:
+        print(f"  要対応: {sections['action']['count']}件", file=sys.stderr)
+        print(f"  進行中: {sections['progress']['count']}件", file=sys.stderr)
+        print(f"  本日の戦果: {sections['senka']['count']}件", file=sys.stderr)
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    # プロジェクトルートを特定（このスクリプトの親ディレクトリ）
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    config = load_config(project_root)
+
+    if args.reindex:
+        clear_report_index(project_root / config["reports_dir"] / REPORT_INDEX_DIR)
+
+    cache = None
+    cache_path = default_cache_path(project_root, config)
+    if not args.no_cache:
+        config_sig = stat_signature([project_root / "config" / "dashboard_config.yaml"], time.time_ns())
+        # 直近に書き換えられた config は同じ stat のまま再び変わり得るので、今回はキャッシュを使わない
+        if config_sig is not None:
+            cache = load_section_cache(cache_path, config_sig)
+
+    run(args, DashboardSource(project_root, config), cache)
+
+    if cache is not None and args.format is None and args.section != "agents":
+        save_section_cache(cache_path, cache)
 
 
 if __name__ == "__main__":
@@ -6,25 +6,52 @@ config/dashboard_config.yaml の output_path を検証対象とする。
 使い方:
   uv run python scripts/dashboard_validate.py             # output_pathを検証
   uv run python scripts/dashboard_validate.py dashboard.md  # 指定ファイルを検証
+  uv run python scripts/dashboard_validate.py --format json # 結果をJSONで（所要時間つき）
 
 終了コード:
   0: 問題なし
   1: Warning以上の問題あり
+
+検証ルール（config/dashboard_config.yaml の validation、省略時は下記の既定値）:
+  validation:
+    required_sections: ["🚨 要対応", "📋 進行中", "📁 関連ファイル"]  # 無ければ ERROR
+    forbidden_markers: {"🚨 要対応": ["✅"]}  # 見出し → そのセクションの表の行に出てはならない文字列
+    max_lines: 200               # 行数の上限
+    max_bytes: null              # バイト数の上限（UTF-8）
+    max_rows: {}                 # 見出し → そのセクションの表のデータ行数の上限
+    stale_days: {}               # 見出し → この日数より古い日付（YYYY-MM-DD）を含む行を警告
+    max_update_age_hours: null   # 「最終更新」の時刻がこれより古ければ警告
+  見出しは "## " 行に含まれる文字列で指定し、次の "## " 行までをそのセクションとする。
+  必須セクション以外の問題は WARNING。
+
+ファイルは1行ずつ読み、全ルールを1回の走査で検査する（ファイル全体を読み込まない）。
+dashboard_read.py も書き込み前に生成内容をこのルールで検査し、ERROR があれば書き込まない。
 """
 
+import argparse
+import io
+import json
 import re
 import sys
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import yaml
 
-REQUIRED_SECTIONS = [
-    "🚨 要対応",
-    "📋 進行中",
-    "📁 関連ファイル",
-]
+DEFAULT_RULES = {
+    "required_sections": ["🚨 要対応", "📋 進行中", "📁 関連ファイル"],
+    "forbidden_markers": {"🚨 要対応": ["✅"]},
+    "max_lines": 200,
+    "max_bytes": None,
+    "max_rows": {},
+    "stale_days": {},
+    "max_update_age_hours": None,
+}
 
-LINE_LIMIT = 200
+DATE_IN_LINE = re.compile(r"\d{4}-\d{2}-\d{2}")
+UPDATED_AT = re.compile(r"最終更新.*?(\d{4}-\d{2}-\d{2} \d{2}:\d{2})")
+TABLE_SEPARATOR = re.compile(r"^\|[\s:|-]+\|$")
 
 
 def load_config(project_root: Path) -> dict:
@@ -33,43 +60,247 @@ def load_config(project_root: Path) -> dict:
         return yaml.safe_load(f)
 
 
-def validate(content: str, filepath: str) -> list[tuple[str, str]]:
-    """検証を実行し、[(level, message), ...] を返す。levelは ERROR/WARNING/OK"""
-    issues = []
-    lines = content.splitlines()
+class Line:
+    """走査中の1行と、それが属するセクション・表の位置。"""
+
+    __slots__ = ("number", "text", "section", "table_row")
+
+    def __init__(self):
+        self.number = 0
+        self.text = ""
+        self.section = ""       # 直近の "## " 見出し行（最初の見出しより前は空）
+        self.table_row = None   # 表のデータ行ならセクション内の通し番号、それ以外は None
+
+
+class Rule:
+    """検証ルール。check() を各行で、finish() を走査の最後に呼ぶ。問題は issue() で記録する。"""
+
+    name = ""
+    level = "WARNING"
+
+    def __init__(self):
+        self.issues = []
+
+    def issue(self, message: str, line: int | None = None, level: str | None = None) -> None:
+        self.issues.append({"level": level or self.level, "rule": self.name, "line": line, "message": message})
+
+    def check(self, line: Line) -> None:
+        pass
+
+    def finish(self, line_count: int, byte_count: int) -> None:
+        pass
+
+
+def section_rules(mapping: dict, line: Line):
+    """見出しが line のセクションに当たる (見出し, 値) を返す。"""
+    return [(heading, value) for heading, value in mapping.items() if heading in line.section]
+
+
+class RequiredSections(Rule):
+    name = "required_sections"
+    level = "ERROR"
+
+    def __init__(self, sections: list[str]):
+        super().__init__()
+        self.missing = list(sections)
+
+    def check(self, line: Line) -> None:
+        if self.missing:
+            self.missing = [s for s in self.missing if s not in line.text]
+
+    def finish(self, line_count: int, byte_count: int) -> None:
+        for section in self.missing:
+            self.issue(f"必須セクション「{section}」が存在しません")
+
+
+class ForbiddenMarkers(Rule):
+    name = "forbidden_markers"
+
+    def __init__(self, markers: dict[str, list[str]]):
+        super().__init__()
+        self.markers = markers
+
+    def check(self, line: Line) -> None:
+        if line.table_row is None:
+            return
+        for heading, markers in section_rules(self.markers, line):
+            for marker in markers:
+                if marker in line.text:
+                    self.issue(f"{heading}セクションに禁止マーカー({marker})が残存しています: {line.text.strip()[:80]}",
+                               line.number)
+
+
+class LineLimit(Rule):
+    name = "max_lines"
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def finish(self, line_count: int, byte_count: int) -> None:
+        if line_count > self.limit:
+            self.issue(f"行数が上限を超えています: {line_count}行 (上限: {self.limit}行)")
 
-    # 1. 必須セクション存在チェック
-    for section in REQUIRED_SECTIONS:
-        if not any(section in line for line in lines):
-            issues.append(("ERROR", f"必須セクション「{section}」が存在しません"))
 
-    # 2. 🚨要対応に「✅完了」行が残っていないか
-    in_action_section = False
-    for line in lines:
-        if "🚨" in line and "要対応" in line:
-            in_action_section = True
-        elif line.startswith("## ") and "🚨" not in line:
-            in_action_section = False
-        if in_action_section and "✅" in line and "|" in line:
-            # テーブル行に✅がある = 完了行が残存している
-            issues.append(("WARNING", f"🚨要対応セクションに完了行(✅)が残存しています: {line.strip()[:80]}"))
+class SizeLimit(Rule):
+    name = "max_bytes"
 
-    # 3. 200行超え警告
-    line_count = len(lines)
-    if line_count > LINE_LIMIT:
-        issues.append(("WARNING", f"行数が上限を超えています: {line_count}行 (上限: {LINE_LIMIT}行)"))
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
 
-    return issues
+    def finish(self, line_count: int, byte_count: int) -> None:
+        if byte_count > self.limit:
+            self.issue(f"サイズが上限を超えています: {byte_count}バイト (上限: {self.limit}バイト)")
+
+
+class RowLimit(Rule):
+    name = "max_rows"
+
+    def __init__(self, limits: dict[str, int]):
+        super().__init__()
+        self.limits = limits
+
+    def check(self, line: Line) -> None:
+        if line.table_row is None:
+            return
+        for heading, limit in section_rules(self.limits, line):
+            # 上限を超えた最初の行でだけ報告する
+            if line.table_row == limit + 1:
+                self.issue(f"{heading}セクションの表の行数が上限を超えています (上限: {limit}行)", line.number)
+
+
+class StaleDates(Rule):
+    name = "stale_dates"
+
+    def __init__(self, days: dict[str, int], max_update_age_hours: float | None, now: datetime):
+        super().__init__()
+        self.cutoffs = {heading: (now - timedelta(days=d)).strftime("%Y-%m-%d") for heading, d in days.items()}
+        self.max_update_age_hours = max_update_age_hours
+        self.now = now
+
+    def check(self, line: Line) -> None:
+        if self.max_update_age_hours is not None and "最終更新" in line.text:
+            m = UPDATED_AT.search(line.text)
+            if m:
+                updated = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M")
+                if self.now - updated > timedelta(hours=self.max_update_age_hours):
+                    self.issue(f"最終更新が古すぎます: {m.group(1)} (上限: {self.max_update_age_hours}時間)", line.number)
+        if not self.cutoffs or not line.section or line.text.startswith("#"):
+            return
+        for heading, cutoff in section_rules(self.cutoffs, line):
+            # YYYY-MM-DD は文字列の比較で日付順になる
+            stale = [d for d in DATE_IN_LINE.findall(line.text) if d < cutoff]
+            if stale:
+                self.issue(f"{heading}セクションに{cutoff}より古い日付({stale[0]})があります: {line.text.strip()[:80]}",
+                           line.number)
+
+
+def build_rules(config: dict | None, now: datetime | None = None) -> list[Rule]:
+    """config の validation（無い項目は DEFAULT_RULES）からルールを作る。null の項目は検査しない。"""
+    settings = dict(DEFAULT_RULES)
+    settings.update((config or {}).get("validation") or {})
+    now = now or datetime.now()
+    rules = []
+    if settings["required_sections"]:
+        rules.append(RequiredSections(settings["required_sections"]))
+    if settings["forbidden_markers"]:
+        rules.append(ForbiddenMarkers(settings["forbidden_markers"]))
+    if settings["max_lines"] is not None:
+        rules.append(LineLimit(settings["max_lines"]))
+    if settings["max_bytes"] is not None:
+        rules.append(SizeLimit(settings["max_bytes"]))
+    if settings["max_rows"]:
+        rules.append(RowLimit(settings["max_rows"]))
+    if settings["stale_days"] or settings["max_update_age_hours"] is not None:
+        rules.append(StaleDates(settings["stale_days"] or {}, settings["max_update_age_hours"], now))
+    return rules
+
+
+def validate_lines(lines, rules: list[Rule]) -> dict:
+    """行のイテレータ（改行つき可）を1回走査して全ルールを検査する。
+
+    {"lines", "bytes", "elapsed_ms", "ok", "issues": [{level, rule, line, message}]} を返す。
+    ok は ERROR が無いこと。
+    """
+    start = time.perf_counter()
+    line = Line()
+    byte_count = 0
+    in_table = False
+    for raw in lines:
+        byte_count += len(raw.encode("utf-8"))
+        text = raw.rstrip("\r\n")
+        line.number += 1
+        line.text = text
+        if text.startswith("## "):
+            line.section = text
+            line.table_row = None
+        if text.startswith("|"):
+            # 表の先頭行は見出し行、区切り行はデータ行に数えない
+            if not in_table:
+                in_table = True
+                row_count = 0
+                line.table_row = None
+            elif TABLE_SEPARATOR.match(text):
+                line.table_row = None
+            else:
+                row_count += 1
+                line.table_row = row_count
+        else:
+            in_table = False
+            line.table_row = None
+        for rule in rules:
+            rule.check(line)
+    for rule in rules:
+        rule.finish(line.number, byte_count)
+
+    issues = [issue for rule in rules for issue in rule.issues]
+    return {
+        "lines": line.number,
+        "bytes": byte_count,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "ok": not any(issue["level"] == "ERROR" for issue in issues),
+        "issues": issues,
+    }
+
+
+def validate(content: str, config: dict | None = None) -> dict:
+    """メモリ上のダッシュボード（書き込み前の生成内容など）を検証する。"""
+    return validate_lines(io.StringIO(content), build_rules(config))
+
+
+def validate_file(path: Path, config: dict | None = None) -> dict:
+    with open(path, encoding="utf-8", newline="") as f:
+        return validate_lines(f, build_rules(config))
+
+
+def format_issue(issue: dict) -> str:
+    icon = "❌" if issue["level"] == "ERROR" else "⚠️"
+    where = f" (L{issue['line']})" if issue["line"] else ""
+    return f"{icon} [{issue['level']}] {issue['message']}{where}"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="ダッシュボード検証")
+    parser.add_argument("target", nargs="?", help="検証するファイル（省略時は output_path）")
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="出力フォーマット（json: 件数・問題・所要時間の構造化データ）",
+    )
+    return parser
 
 
 def main():
+    args = build_parser().parse_args()
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
 
     config = load_config(project_root)
 
-    if len(sys.argv) > 1:
-        target = Path(sys.argv[1])
+    if args.target:
+        target = Path(args.target)
         if not target.is_absolute():
             target = project_root / target
     else:
@@ -79,25 +310,23 @@ def main():
         print(f"ERROR: ファイルが存在しません: {target}", file=sys.stderr)
         sys.exit(1)
 
-    content = target.read_text(encoding="utf-8")
-    issues = validate(content, str(target))
+    result = validate_file(target, config)
+
+    if args.format == "json":
+        print(json.dumps({"target": str(target), **result}, ensure_ascii=False))
+        sys.exit(1 if result["issues"] else 0)
 
     print(f"検証対象: {target}")
-    print(f"行数: {len(content.splitlines())}")
+    print(f"行数: {result['lines']}")
+    print(f"検証時間: {result['elapsed_ms']}ms")
 
-    if not issues:
+    if not result["issues"]:
         print("✅ 問題なし")
         sys.exit(0)
 
-    has_error = False
-    for level, msg in issues:
-        icon = "❌" if level == "ERROR" else "⚠️"
-        print(f"{icon} [{level}] {msg}")
-        if level == "ERROR":
-            has_error = True
-
-    if has_error or issues:
-        sys.exit(1)
+    for issue in result["issues"]:
+        print(format_issue(issue))
+    sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -6,17 +6,78 @@ queue/dashboard_state.yaml を操作するCLI。dashboard.mdは直接触らな
 使い方:
   uv run python scripts/dashboard_write.py add-action --cmd cmd_123 --pj bakuhu --type "殿判断待ち" --content "push許可待ち"
   uv run python scripts/dashboard_write.py remove-action --cmd cmd_123
+  uv run python scripts/dashboard_write.py add-action --batch < items.jsonl      # 1行1件 {"cmd","pj","type","content"}
+  uv run python scripts/dashboard_write.py remove-action --batch < cmds.jsonl    # 1行1件 {"cmd"}
   uv run python scripts/dashboard_write.py list-action
   uv run python scripts/dashboard_write.py add-senka --cmd cmd_123 --pj bakuhu --content "HTMLファイル表示実装完了"
+  uv run python scripts/dashboard_write.py compact    # 操作ログをスナップショットへ畳み込む
+
+dashboard_daemon.py が起動していれば、デーモンに処理を任せる（DASHBOARD_NO_DAEMON=1 で常に直接処理）。
+
+保存形式:
+  dashboard_state.yaml         スナップショット（先頭行 oplog_generation: 畳み込み済みの世代）
+  dashboard_state.oplog.jsonl  スナップショット以降の操作（add-action / remove-action / add-senka）
+  state はスナップショットに操作ログを再生したもの（load_state）。書き込みは操作ログへの
+  1行追記だけで、state 全体は書き直さない。ログが OPLOG_COMPACT_BYTES を超えたら
+  （または compact 実行時に）スナップショットへ畳み込み、次の世代の空ログに切り替える。
+  dashboard_state.yaml 単体は最新ではないので、直接読まずに load_state / read_state を使うこと。
+  YAML をそのまま外へ渡す時は、先に compact で畳み込む。
+
+--pj 省略時の cmd_id → project 解決:
+  以下の解決元（優先順）から作った cmd_id → project 表を queue/.cmd_project_index.json
+  （config の project_index_path）に保存し、解決は表の1回の参照で済ませる。
+    commands_dir/{cmd_id}.yaml、tasks_dir/ashigaru*.yaml、queue/shogun_to_karo.yaml、
+    queue/archive/shogun_to_karo_*.yaml、queue/archive/tasks/*.yaml（旧形式の退避先）、
+    queue/archive/store/*.index.jsonl（slim_yaml・yaml_archive_done の退避先 archive_store の索引）
+  ディレクトリの mtime が変わった時だけ一覧を取り直し、新しい・変わったファイルだけを解析する。
+  アーカイブは書き換えられない前提で、一覧が変わらなければ stat もしない。
+
+要対応の索引:
+  dashboard_state.index.json に、要対応の次の id 番号と cmd_id → id 一覧を保存する。
+  add-action / remove-action は state 全体を読まず、索引だけで id の採番と削除件数を決める。
+  索引は作成時の state の版（スナップショットとログの stat）を持ち、索引を通さずに state が
+  変わっていれば（手編集・旧版の書き手）作り直す。要対応を変えない add-senka と畳み込みは、
+  同じロック下で索引の版を付け替える（keeping_action_index）。id 番号は削除しても再利用しない。
+
+書き込みはトランザクションで行う:
+  dashboard_state.yaml.lock の flock 下で索引を読み、操作をログに追記・fsync して索引を更新する
+  （update_actions）。state を参照しない add-senka は読まずにロック下で追記する。
+  スナップショットと新しいログは一時ファイル → fsync → rename で置き換えるので、
+  読み手は書きかけを見ない。
 """
 
-import argparse
 import sys
-from datetime import datetime
 from pathlib import Path
 
+# 常駐デーモン（dashboard_daemon.py）が動いていればそちらに任せる。CLI の応答を縮めるため、
+# PyYAML 等の重い import より前に確かめる。--batch（省略形を含む）は標準入力ごと渡す
+CLI_STDIN = None
+if __name__ == "__main__":
+    if any(arg.startswith("--b") and "--batch".startswith(arg) for arg in sys.argv[1:]):
+        CLI_STDIN = sys.stdin.read()
+    try:
+        import dashboard_client
+    except ImportError:
+        pass
+    else:
+        if dashboard_client.forward(Path(__file__).parent.parent, "write", sys.argv[1:], CLI_STDIN):
+            sys.exit(0)
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
 import yaml
 
+# atomic_write.py は scripts/ 直下（scripts/bakuhu/ の一つ上）にある
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from atomic_write import write_atomic  # noqa: E402
+
 
 def load_config(project_root: Path) -> dict:
     config_path = project_root / "config" / "dashboard_config.yaml"
@@ -24,91 +85,463 @@ def load_config(project_root: Path) -> dict:
         return yaml.safe_load(f)
 
 
-def load_state(state_path: Path) -> dict:
-    if not state_path.exists():
-        return {"action_required": [], "projects": [], "archives": []}
-    with open(state_path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+# 読み手がロックを持たずに読み直す回数（畳み込みと重なった時）。超えたらロック下で読む
+MAX_READ_ATTEMPTS = 5
 
+# 操作ログがこの大きさを超えたら、書き手がスナップショットへ畳み込む
+OPLOG_COMPACT_BYTES = 256 * 1024
 
-def save_state(state_path: Path, state: dict) -> None:
-    with open(state_path, "w", encoding="utf-8") as f:
-        yaml.dump(state, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+# スナップショットの先頭行に書く、畳み込み済みの操作ログの世代
+SNAPSHOT_GENERATION_KEY = "oplog_generation"
+SNAPSHOT_GENERATION_LINE = re.compile(r"^oplog_generation: (\d+)$")
 
+# スナップショットの読み書き（state が大きくなると効くので、あれば libyaml 版を使う。出力は同一）
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+# 要対応の索引（形式を変えたら上げる。古い索引は作り直す）
+ACTION_INDEX_VERSION = 1
+
+# cmd_id → project 表（形式を変えたら上げる。古い表は作り直す）
+PROJECT_INDEX_VERSION = 1
+# この時間内に更新されたファイル・ディレクトリは mtime が粗い FS で同一値になり得るため、表に stat を記録しない
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def oplog_path(state_path: Path) -> Path:
+    return state_path.with_name(state_path.stem + ".oplog.jsonl")
 
-def resolve_project(project_root: Path, config: dict, cmd_id: str) -> str | None:
-    """cmd_idからプロジェクト名を自動解決する。見つからなければNoneを返す。"""
-    # 1. queue/commands/{cmd_id}.yaml の project フィールド
-    commands_dir = project_root / config.get("commands_dir", "queue/commands")
-    cmd_file = commands_dir / f"{cmd_id}.yaml"
-    if cmd_file.exists():
-        try:
-            with open(cmd_file, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-            if data and data.get("project"):
-                return data["project"]
-        except Exception:
-            pass
 
-    # 2. queue/tasks/ashigaru*.yaml の cmd_id マッチ → project フィールド
-    tasks_dir = project_root / config.get("tasks_dir", "queue/tasks")
-    for path in sorted(tasks_dir.glob("ashigaru*.yaml")):
+def empty_state() -> dict:
+    return {"action_required": [], "projects": [], "archives": []}
+
+
+def load_state(state_path: Path) -> dict:
+    return read_state(state_path)[0]
+
+
+def read_snapshot(state_path: Path) -> tuple[dict, int]:
+    """スナップショット（dashboard_state.yaml）と、その世代を返す。"""
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state = yaml.load(f, Loader=YAML_LOADER) or {}
+    except FileNotFoundError:
+        return empty_state(), 0
+    return state, state.pop(SNAPSHOT_GENERATION_KEY, 0)
+
+
+def snapshot_generation(state_path: Path) -> int:
+    """スナップショットの世代。save_state が先頭行に書くので、通常は1行だけ読めば済む。"""
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            m = SNAPSHOT_GENERATION_LINE.match(f.readline().rstrip("\n"))
+    except FileNotFoundError:
+        return 0
+    if m:
+        return int(m.group(1))
+    return read_snapshot(state_path)[1]
+
+
+def read_oplog(state_path: Path) -> tuple[int | None, list[dict]]:
+    """操作ログの (世代, 操作一覧)。ログが無い・ヘッダが読めなければ (None, [])。"""
+    try:
+        with open(oplog_path(state_path), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None, []
+    try:
+        generation = json.loads(lines[0])["generation"]
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None, []
+    ops = []
+    for line in lines[1:]:
+        try:
+            ops.append(json.loads(line))
+        except ValueError:
+            # 追記中に落ちた書きかけの行。次の追記は改行を補ってから書くので、後続の行は無事
+            print(f"警告: 操作ログの壊れた行を無視します: {line[:80]}", file=sys.stderr)
+    return generation, ops
+
+
+def apply_op(state: dict, op: dict) -> None:
+    kind = op.get("op")
+    if kind == "add-action":
+        state.setdefault("action_required", []).append(op["item"])
+    elif kind == "remove-action":
+        state["action_required"] = [
+            item for item in state.get("action_required", [])
+            if item.get("cmd_id") != op["cmd_id"]
+        ]
+    elif kind == "add-senka":
+        state.setdefault("senka", []).append(op["item"])
+    else:
+        print(f"警告: 不明な操作を無視します: {kind}", file=sys.stderr)
+
+
+def state_version(state_path: Path) -> tuple:
+    """競合検出用の版。追記でログの大きさが、畳み込みでスナップショットの inode が変わる。"""
+    version = []
+    for path in (state_path, oplog_path(state_path)):
         try:
-            with open(path, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-            if data and data.get("cmd_id") == cmd_id and data.get("project"):
-                return data["project"]
-        except Exception:
+            st = path.stat()
+        except FileNotFoundError:
+            version.append(None)
+            continue
+        version.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+def _read_state_once(state_path: Path) -> tuple[dict, tuple] | None:
+    version = state_version(state_path)
+    state, generation = read_snapshot(state_path)
+    log_generation, ops = read_oplog(state_path)
+    if log_generation is not None and log_generation > generation:
+        # 読んでいる間に畳み込まれた（古いスナップショットと新しいログ）
+        return None
+    # ログの世代がスナップショットより古ければ、その操作は畳み込み済み
+    if log_generation == generation:
+        for op in ops:
+            apply_op(state, op)
+    return state, version
+
+
+def read_state(state_path: Path) -> tuple[dict, tuple]:
+    """スナップショットに操作ログを再生した state と、その版を返す。"""
+    for _ in range(MAX_READ_ATTEMPTS):
+        result = _read_state_once(state_path)
+        if result is not None:
+            return result
+    with state_lock(state_path):
+        return _read_state_once(state_path)
+
+
+@contextmanager
+def state_lock(state_path: Path):
+    """書き手同士を直列化する排他ロック（<state>.lock に flock）。"""
+    lock_path = state_path.with_name(state_path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def save_state(state_path: Path, state: dict, generation: int) -> None:
+    snapshot = {SNAPSHOT_GENERATION_KEY: generation, **state}
+    text = yaml.dump(snapshot, Dumper=YAML_DUMPER, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    write_atomic(state_path, text)
+
+
+def compact_state(state_path: Path) -> None:
+    """操作ログをスナップショットへ畳み込み、次の世代の空ログを作る。ロック下で呼ぶこと。
+
+    スナップショット → ログの順に置き換えるので、途中で落ちても
+    「新しいスナップショット + 古い世代のログ（再生されない）」になるだけで操作は失われない。
+    """
+    state, generation = read_snapshot(state_path)
+    log_generation, ops = read_oplog(state_path)
+    if log_generation == generation:
+        for op in ops:
+            apply_op(state, op)
+    save_state(state_path, state, generation + 1)
+    write_atomic(oplog_path(state_path), json.dumps({"generation": generation + 1}) + "\n")
+
+
+def append_ops(state_path: Path, ops: list[dict]) -> None:
+    """操作をログに追記する（state 全体は書き直さない）。ロック下で呼ぶこと。"""
+    log_path = oplog_path(state_path)
+    log_generation = None
+    try:
+        with open(log_path, encoding="utf-8") as f:
+            log_generation = json.loads(f.readline())["generation"]
+    except (FileNotFoundError, KeyError, TypeError, ValueError):
+        pass
+    if log_generation != snapshot_generation(state_path):
+        # ログが無い（初回・旧形式の state）か、畳み込みの途中で落ちた古いログ
+        compact_state(state_path)
+
+    data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops).encode("utf-8")
+    fd = os.open(log_path, os.O_RDWR | os.O_APPEND)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data  # 書きかけの行の後ろに続けない
+        os.write(fd, data)
+        os.fsync(fd)
+        size += len(data)
+    finally:
+        os.close(fd)
+    if size > OPLOG_COMPACT_BYTES:
+        compact_state(state_path)
+
+
+def action_index_path(state_path: Path) -> Path:
+    return state_path.with_name(state_path.stem + ".index.json")
+
+
+def action_number(item: dict) -> int:
+    """要対応 id（ar_NNN）の番号。形式外は 0。"""
+    id_ = item.get("id", "")
+    if isinstance(id_, str) and id_.startswith("ar_"):
+        try:
+            return int(id_[3:])
+        except ValueError:
             pass
+    return 0
 
-    return None
 
+def load_action_index(state_path: Path) -> dict:
+    """要対応の索引 {version, state, next_id, by_cmd}。ロック下で呼ぶこと。
 
-def generate_id(state: dict) -> str:
+    state が索引の作成時から変わっていれば（索引を通さない書き込み）、state から作り直す。
+    """
+    try:
+        with open(action_index_path(state_path), encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    version = json.loads(json.dumps(state_version(state_path)))
+    if isinstance(index, dict) and index.get("version") == ACTION_INDEX_VERSION and index.get("state") == version:
+        return index
+
+    state, _ = _read_state_once(state_path)
     items = state.get("action_required", [])
-    if not items:
-        return "ar_001"
-    existing_nums = []
+    by_cmd = {}
     for item in items:
-        id_ = item.get("id", "")
-        if id_.startswith("ar_"):
+        # cmd_id が文字列でない項目は remove-action --cmd で一致しないので索引に載せない
+        if isinstance(item.get("cmd_id"), str):
+            by_cmd.setdefault(item["cmd_id"], []).append(item.get("id"))
+    next_id = max((action_number(item) for item in items), default=0) + 1
+    if isinstance(index, dict) and isinstance(index.get("next_id"), int):
+        next_id = max(next_id, index["next_id"])  # 作り直しても採番済みの番号は再利用しない
+    return {"version": ACTION_INDEX_VERSION, "state": None, "next_id": next_id, "by_cmd": by_cmd}
+
+
+def save_action_index(state_path: Path, index: dict) -> None:
+    index["state"] = json.loads(json.dumps(state_version(state_path)))
+    write_atomic(action_index_path(state_path), json.dumps(index, ensure_ascii=False), durable=False)
+
+
+@contextmanager
+def keeping_action_index(state_path: Path):
+    """要対応を変えない書き込み（add-senka・畳み込み）の前後で索引の版を付け替える。ロック下で使うこと。
+
+    付け替えないと次の add-action / remove-action が版の不一致で索引を作り直し、
+    戦果の追記が挟まるたびに state 全体の再生が走る。
+    """
+    before = json.loads(json.dumps(state_version(state_path)))
+    yield
+    try:
+        with open(action_index_path(state_path), encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return
+    if isinstance(index, dict) and index.get("version") == ACTION_INDEX_VERSION and index.get("state") == before:
+        save_action_index(state_path, index)
+
+
+def update_actions(state_path: Path, plan):
+    """要対応の索引を使うトランザクション。plan(index) の戻り値を返す。
+
+    plan は (戻り値, 操作のリスト) を返し、操作に合わせて index（next_id / by_cmd）を更新する。
+    操作はログに追記され、索引は追記後の state の版とともに保存される。
+    """
+    with state_lock(state_path):
+        index = load_action_index(state_path)
+        rebuilt = index["state"] is None
+        result, ops = plan(index)
+        if ops:
+            append_ops(state_path, ops)
+        if ops or rebuilt:
+            save_action_index(state_path, index)
+    return result
+
+
+def project_sources(project_root: Path, config: dict) -> list[tuple[str, Path, str, bool]]:
+    """cmd_id → project の解決元（優先順）。(種類, ディレクトリ, glob, 書き換えられ得るか)。"""
+    archive_dir = project_root / config.get("archive_dir", "queue/archive")
+    queue_path = project_root / config.get("command_queue_path", "queue/shogun_to_karo.yaml")
+    return [
+        ("command", project_root / config.get("commands_dir", "queue/commands"), "*.yaml", True),
+        ("task", project_root / config.get("tasks_dir", "queue/tasks"), "ashigaru*.yaml", True),
+        ("queue", queue_path.parent, queue_path.name, True),
+        ("queue", archive_dir, "shogun_to_karo_*.yaml", False),
+        ("task", archive_dir / "tasks", "*.yaml", False),
+        # 当日の索引は追記されるので書き換えられ得る扱い
+        ("store", archive_dir / "store", "*.index.jsonl", True),
+    ]
+
+
+def extract_projects(kind: str, path: Path) -> dict[str, str]:
+    """YAML 1ファイル（store は archive_store の索引）から cmd_id → project を取り出す。読めなければ空。"""
+    if kind == "store":
+        return extract_store_projects(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=YAML_LOADER)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    pairs = {}
+    if kind == "command":
+        # commands_dir/{cmd_id}.yaml の project フィールド
+        if data.get("project"):
+            pairs[path.stem] = data["project"]
+    elif kind == "task":
+        # 足軽タスクの cmd_id / project（task: 配下の parent_cmd も見る）
+        for entry in (data, data.get("task")):
+            if not isinstance(entry, dict) or not entry.get("project"):
+                continue
+            cmd_id = entry.get("cmd_id") or entry.get("parent_cmd")
+            if isinstance(cmd_id, str):
+                pairs.setdefault(cmd_id, entry["project"])
+    else:
+        # shogun_to_karo の commands（旧形式は queue）の id / project
+        for key in ("commands", "queue"):
+            for cmd in data.get(key) or []:
+                if isinstance(cmd, dict) and isinstance(cmd.get("id"), str) and cmd.get("project"):
+                    pairs.setdefault(cmd["id"], cmd["project"])
+    return pairs
+
+
+def extract_store_projects(path: Path) -> dict[str, str]:
+    """archive_store の索引（1行1レコードのJSON）から cmd_id → project を取り出す。"""
+    pairs = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 追記途中の行
+                if isinstance(entry, dict) and isinstance(entry.get("cmd_id"), str) and isinstance(entry.get("project"), str):
+                    pairs.setdefault(entry["cmd_id"], entry["project"])
+    except OSError:
+        return {}
+    return pairs
+
+
+def refresh_project_index(index: dict, sources: list, now_ns: int) -> bool:
+    """表の各解決元を最新にする。何か変わったら True。"""
+    changed = False
+    entries = {}
+    for kind, directory, pattern, live in sources:
+        key = f"{kind}:{directory / pattern}"
+        entry = index["sources"].get(key) or {"dir_mtime_ns": None, "files": {}}
+        try:
+            dir_mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            dir_mtime_ns = None
+        if not any(c in pattern for c in "*?["):
+            # 単一ファイル（queue/ 自体の mtime は他のファイルの書き込みで頻繁に変わるので見ない）
+            dir_mtime_ns = None
+        files = entry["files"]
+        relist = dir_mtime_ns is None or dir_mtime_ns != entry["dir_mtime_ns"]
+        if relist:
+            names = sorted(path.name for path in directory.glob(pattern))
+            files = {name: files.get(name) for name in names}
+            changed = changed or list(files) != list(entry["files"])
+
+        for name, known in files.items():
+            if not relist and not live and known is not None and known["stat"] is not None:
+                continue  # アーカイブは書き換えられない
+            path = directory / name
             try:
-                existing_nums.append(int(id_[3:]))
-            except ValueError:
-                pass
-    next_num = max(existing_nums, default=0) + 1
-    return f"ar_{next_num:03d}"
+                st = path.stat()
+            except OSError:
+                continue
+            sig = [st.st_mtime_ns, st.st_size]
+            if known is not None and known["stat"] == sig:
+                continue
+            recorded = sig if now_ns - st.st_mtime_ns >= RACY_WINDOW_NS else None
+            files[name] = {"stat": recorded, "pairs": extract_projects(kind, path)}
+            changed = True
+
+        recorded_dir = dir_mtime_ns if dir_mtime_ns is not None and now_ns - dir_mtime_ns >= RACY_WINDOW_NS else None
+        changed = changed or recorded_dir != entry["dir_mtime_ns"]
+        entries[key] = {"dir_mtime_ns": recorded_dir, "files": files}
+
+    changed = changed or list(entries) != list(index["sources"])
+    index["sources"] = entries
+    if changed:
+        # 優先順の早い解決元（同じ解決元ならファイル名順で早いもの）を残す
+        table = {}
+        for entry in entries.values():
+            for known in entry["files"].values():
+                for cmd_id, project in (known or {}).get("pairs", {}).items():
+                    table.setdefault(cmd_id, project)
+        index["table"] = table
+    return changed
 
 
-def cmd_add_action(state_path: Path, state: dict, args) -> None:
-    today = datetime.now().strftime("%Y-%m-%d")
-    new_id = generate_id(state)
-    new_item = {
-        "id": new_id,
-        "cmd_id": args.cmd,
-        "project": args.pj,
-        "type": args.type,
-        "content": args.content,
-        "added": today,
-    }
-    state.setdefault("action_required", []).append(new_item)
-    save_state(state_path, state)
-    print(f"追加完了: {new_id} ({args.cmd} / {args.pj})")
+def resolve_project(project_root: Path, config: dict, cmd_id: str) -> str | None:
+    """cmd_idからプロジェクト名を自動解決する。見つからなければNoneを返す。"""
+    index_path = project_root / config.get("project_index_path", "queue/.cmd_project_index.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    if not isinstance(index, dict) or index.get("version") != PROJECT_INDEX_VERSION:
+        index = {"version": PROJECT_INDEX_VERSION, "sources": {}, "table": {}}
+
+    if refresh_project_index(index, project_sources(project_root, config), time.time_ns()):
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(index_path, json.dumps(index, ensure_ascii=False), durable=False)
+        except OSError as e:
+            print(f"警告: cmd_id → project 表を保存できません: {e}", file=sys.stderr)
+    return index["table"].get(cmd_id)
 
 
-def cmd_remove_action(state_path: Path, state: dict, args) -> None:
-    items = state.get("action_required", [])
-    before = len(items)
-    state["action_required"] = [
-        item for item in items
-        if item.get("cmd_id") != args.cmd
-    ]
-    after = len(state["action_required"])
-    if before == after:
-        print(f"警告: cmd_id={args.cmd} の要対応が見つかりませんでした", file=sys.stderr)
+def cmd_add_action(state_path: Path, entries: list[dict]) -> None:
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    def plan(index: dict) -> tuple[list[str], list[dict]]:
+        ids, ops = [], []
+        for entry in entries:
+            new_id = f"ar_{index['next_id']:03d}"
+            index["next_id"] += 1
+            index["by_cmd"].setdefault(entry["cmd"], []).append(new_id)
+            ids.append(new_id)
+            ops.append({"op": "add-action", "item": {
+                "id": new_id,
+                "cmd_id": entry["cmd"],
+                "project": entry["pj"],
+                "type": entry["type"],
+                "content": entry["content"],
+                "added": today,
+            }})
+        return ids, ops
+
+    new_ids = update_actions(state_path, plan)
+    for new_id, entry in zip(new_ids, entries):
+        print(f"追加完了: {new_id} ({entry['cmd']} / {entry['pj']})")
+
+
+def cmd_remove_action(state_path: Path, cmd_ids: list[str]) -> None:
+    def plan(index: dict) -> tuple[list[int], list[dict]]:
+        counts, ops = [], []
+        for cmd_id in cmd_ids:
+            removed = len(index["by_cmd"].pop(cmd_id, []))
+            counts.append(removed)
+            if removed:
+                ops.append({"op": "remove-action", "cmd_id": cmd_id})
+        return counts, ops
+
+    counts = update_actions(state_path, plan)
+    missing = False
+    for cmd_id, removed in zip(cmd_ids, counts):
+        if removed:
+            print(f"削除完了: cmd_id={cmd_id} ({removed}件削除)")
+        else:
+            print(f"警告: cmd_id={cmd_id} の要対応が見つかりませんでした", file=sys.stderr)
+            missing = True
+    if missing:
         sys.exit(1)
-    save_state(state_path, state)
-    print(f"削除完了: cmd_id={args.cmd} ({before - after}件削除)")
 
 
 def cmd_list_action(state: dict) -> None:
@@ -128,76 +561,147 @@ def cmd_list_action(state: dict) -> None:
         print(f"{i:<4} {id_:<8} {cmd_id:<15} {project:<25} {type_:<25} {content}")
 
 
-def cmd_add_senka(state_path: Path, state: dict, args) -> None:
+def cmd_add_senka(state_path: Path, args) -> None:
     today = datetime.now().strftime("%Y-%m-%d")
     now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-    senka_list = state.setdefault("senka", [])
-    senka_list.append({
+
+    op = {"op": "add-senka", "item": {
         "cmd_id": args.cmd,
         "project": args.pj,
         "content": args.content,
         "date": today,
         "timestamp": now,
-    })
-    save_state(state_path, state)
+    }}
+    # 戦果は既存の state に依らないので、読まずにログへ追記するだけ
+    with state_lock(state_path), keeping_action_index(state_path):
+        append_ops(state_path, [op])
     print(f"戦果追記完了: cmd_id={args.cmd} ({args.pj}): {args.content[:50]}")
 
 
-def main():
-    parser = argparse.ArgumentParser(description="ダッシュボード書き込みスクリプト")
+def read_batch(text: str, fields: tuple[str, ...]) -> list[dict]:
+    """JSONL のバッチ（1行1件のオブジェクト）を読む。fields は各行に必須のキー（pj は省略可）。"""
+    entries = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            print(f"エラー: --batch {lineno}行目をJSONとして読めません: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not isinstance(entry, dict) or any(not isinstance(entry.get(k), str) for k in fields):
+            print(f"エラー: --batch {lineno}行目に文字列の {', '.join(fields)} が必要です", file=sys.stderr)
+            sys.exit(1)
+        entries.append({k: entry.get(k) for k in (*fields, "pj")})
+    return entries
+
+
+def resolve_pj(project_root: Path, config: dict, cmd_id: str, pj: str | None) -> str:
+    """--pj が省略されていれば cmd_id から解決する。解決できなければ sys.exit(1)。"""
+    if pj is not None:
+        return pj
+    resolved = resolve_project(project_root, config, cmd_id)
+    if resolved:
+        print(f"--pj 自動解決: {resolved} (cmd_id={cmd_id})", file=sys.stderr)
+        return resolved
+    print(
+        f"エラー: --pj が指定されておらず、cmd_id={cmd_id} からプロジェクトを自動解決できませんでした。"
+        " --pj を明示的に指定してください。",
+        file=sys.stderr,
+    )
+    sys.exit(1)
+
+
+def build_parser(prog: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog, description="ダッシュボード書き込みスクリプト")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # add-action
     p_add = subparsers.add_parser("add-action", help="🚨要対応に追加")
-    p_add.add_argument("--cmd", required=True, help="cmd_id (例: cmd_123)")
+    p_add.add_argument("--cmd", help="cmd_id (例: cmd_123)")
     p_add.add_argument("--pj", default=None, help="プロジェクト名（省略時はcmd/task YAMLから自動解決）")
-    p_add.add_argument("--type", required=True, dest="type", help="種別 (例: 殿判断待ち)")
-    p_add.add_argument("--content", required=True, help="内容")
+    p_add.add_argument("--type", dest="type", help="種別 (例: 殿判断待ち)")
+    p_add.add_argument("--content", help="内容")
+    p_add.add_argument("--batch", action="store_true",
+                       help='標準入力のJSONL（1行1件 {"cmd", "pj", "type", "content"}）をまとめて追加')
 
     # remove-action
     p_rm = subparsers.add_parser("remove-action", help="🚨要対応から削除（完了時）")
-    p_rm.add_argument("--cmd", required=True, help="cmd_id")
+    p_rm.add_argument("--cmd", help="cmd_id")
+    p_rm.add_argument("--batch", action="store_true", help='標準入力のJSONL（1行1件 {"cmd"}）をまとめて削除')
 
     # list-action
     subparsers.add_parser("list-action", help="🚨要対応一覧表示")
 
+    # compact
+    subparsers.add_parser("compact", help="操作ログをスナップショットへ畳み込む")
+
     # add-senka
     p_senka = subparsers.add_parser("add-senka", help="戦果を記録")
     p_senka.add_argument("--cmd", required=True, help="cmd_id")
     p_senka.add_argument("--pj", default=None, help="プロジェクト名（省略時はcmd/task YAMLから自動解決）")
     p_senka.add_argument("--content", required=True, help="内容")
 
-    args = parser.parse_args()
+    return parser
 
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
 
-    config = load_config(project_root)
-    state_path = project_root / config["state_path"]
-    state = load_state(state_path)
+# サブコマンドごとの、--batch を使わない時に必須の引数
+SINGLE_FIELDS = {
+    "add-action": ("cmd", "type", "content"),
+    "remove-action": ("cmd",),
+}
 
-    if args.command in ("add-action", "add-senka") and args.pj is None:
-        resolved = resolve_project(project_root, config, args.cmd)
-        if resolved:
-            print(f"--pj 自動解決: {resolved} (cmd_id={args.cmd})", file=sys.stderr)
-            args.pj = resolved
-        else:
-            print(
-                f"エラー: --pj が指定されておらず、cmd_id={args.cmd} からプロジェクトを自動解決できませんでした。"
-                " --pj を明示的に指定してください。",
-                file=sys.stderr,
-            )
+
+def run(args, project_root: Path, config: dict, state_path: Path, batch_text: str | None = None) -> None:
+    """サブコマンドを実行する。batch_text は --batch 時の標準入力。失敗時は sys.exit(1)。"""
+    fields = SINGLE_FIELDS.get(args.command, ())
+    if getattr(args, "batch", False):
+        given = [f"--{name}" for name in fields if getattr(args, name) is not None]
+        if given:
+            print(f"エラー: --batch と {' '.join(given)} は同時に指定できません", file=sys.stderr)
+            sys.exit(1)
+        entries = read_batch(batch_text or "", fields)
+        for entry in entries:
+            # --pj は、行に pj が無い時の既定値
+            entry["pj"] = entry["pj"] or getattr(args, "pj", None)
+    elif fields:
+        missing = [f"--{name}" for name in fields if getattr(args, name) is None]
+        if missing:
+            print(f"エラー: {' '.join(missing)} を指定してください（または --batch）", file=sys.stderr)
             sys.exit(1)
+        entries = [{name: getattr(args, name, None) for name in (*fields, "pj")}]
 
     if args.command == "add-action":
-        cmd_add_action(state_path, state, args)
+        for entry in entries:
+            entry["pj"] = resolve_pj(project_root, config, entry["cmd"], entry["pj"])
+        cmd_add_action(state_path, entries)
     elif args.command == "remove-action":
-        cmd_remove_action(state_path, state, args)
+        cmd_remove_action(state_path, [entry["cmd"] for entry in entries])
     elif args.command == "list-action":
-        cmd_list_action(state)
+        cmd_list_action(load_state(state_path))
     elif args.command == "add-senka":
-        cmd_add_senka(state_path, state, args)
+        args.pj = resolve_pj(project_root, config, args.cmd, args.pj)
+        cmd_add_senka(state_path, args)
+    elif args.command == "compact":
+        with state_lock(state_path), keeping_action_index(state_path):
+            compact_state(state_path)
+        print(f"畳み込み完了: {state_path}")
+
+
+def main(batch_text: str | None = None):
+    parser = build_parser()
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    if getattr(args, "batch", False) and batch_text is None:
+        batch_text = sys.stdin.read()
+
+    config = load_config(project_root)
+    state_path = project_root / config["state_path"]
+    run(args, project_root, config, state_path, batch_text)
 
 
 if __name__ == "__main__":
-    main()
+    main(CLI_STDIN)
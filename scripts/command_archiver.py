@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Command Archiver
+
+Moves finished commands out of queue/shogun_to_karo.yaml into the archive store
+(see archive_store.py). This is the single archiver behind both
+`slim_yaml.sh karo` and yaml_archive_done.py, so both archive the same status
+set, resolve the queue from this file's location and take the same lock.
+
+One pass: the queue is parsed once, commands are appended to the store in
+batches (one compressed member per batch) and the queue is rewritten once,
+atomically. The store is written before the queue, so an interrupted run can
+only archive a command twice, never lose it.
+
+Usage:
+  python3 scripts/command_archiver.py [--statuses done,completed,cancelled]
+                                      [--min-age-hours H] [--batch-size N]
+                                      [--lock-timeout S] [--dry-run]
+
+  --statuses        statuses that count as finished (case-insensitive)
+  --min-age-hours   keep finished commands for H hours after completed_at
+                    (falling back to timestamp); undated ones are kept when H > 0
+  --batch-size      commands per archive store append
+  --lock-timeout    seconds to wait for queue/.slim_yaml.lock (shared with slim_yaml.py)
+
+Exit status: 0 on success (also when nothing was archived), 1 on error.
+"""
+
+import argparse
+import fcntl
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import yaml
+
+import archive_store
+from atomic_write import dump_yaml_atomic
+
+DEFAULT_STATUSES = ('done', 'completed', 'cancelled')
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_LOCK_TIMEOUT = 10
+AGE_FIELDS = ('completed_at', 'timestamp')
+
+# libyaml bindings when available (same documents, much faster on large queues)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def get_queue_dir():
+    return Path(__file__).resolve().parent.parent / 'queue'
+
+
+@contextmanager
+def queue_lock(queue_dir=None, timeout=DEFAULT_LOCK_TIMEOUT):
+    """Hold queue/.slim_yaml.lock, the lock slim_yaml.py takes. Raises TimeoutError."""
+    queue_dir = Path(queue_dir) if queue_dir is not None else get_queue_dir()
+    with open(queue_dir / '.slim_yaml.lock', 'w') as lock:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f'Failed to acquire lock within {timeout} seconds')
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_queue_snapshot(queue_file=None):
+    """Parse shogun_to_karo.yaml once.
+
+    Returns {'path', 'exists', 'data', 'key'}; archive_commands updates 'data' in
+    place after archiving so later readers of the snapshot see the slimmed queue.
+    """
+    queue_file = Path(queue_file) if queue_file is not None else get_queue_dir() / 'shogun_to_karo.yaml'
+    exists = queue_file.exists()
+    data = {}
+    if exists:
+        try:
+            with open(queue_file, encoding='utf-8') as f:
+                data = yaml.load(f, Loader=YAML_LOADER) or {}
+        except yaml.YAMLError as e:
+            print(f"Error parsing {queue_file}: {e}", file=sys.stderr)
+    # Support both 'commands' and 'queue' keys for backwards compatibility
+    key = 'commands' if isinstance(data, dict) and 'commands' in data else 'queue'
+    return {'path': queue_file, 'exists': exists, 'data': data, 'key': key}
+
+
+def is_finished(cmd, statuses=DEFAULT_STATUSES):
+    return isinstance(cmd, dict) and str(cmd.get('status') or '').lower() in statuses
+
+
+def command_time(cmd):
+    """completed_at (or timestamp) as a naive local datetime, or None."""
+    for field in AGE_FIELDS:
+        value = cmd.get(field)
+        if isinstance(value, datetime):
+            parsed = value
+        elif isinstance(value, date):
+            parsed = datetime(value.year, value.month, value.day)
+        elif isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value.strip())
+            except ValueError:
+                continue
+        else:
+            continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed
+    return None
+
+
+def old_enough(cmd, min_age_hours, now):
+    if not min_age_hours:
+        return True
+    finished_at = command_time(cmd)
+    return finished_at is not None and (now - finished_at).total_seconds() >= min_age_hours * 3600
+
+
+def command_record(cmd, source):
+    return archive_store.make_record('command', cmd, record_id=cmd.get('id'), cmd_id=cmd.get('id'),
+                                     source=source)
+
+
+def archive_commands(snapshot=None, statuses=DEFAULT_STATUSES, min_age_hours=0,
+                     batch_size=DEFAULT_BATCH_SIZE, dry_run=False, now=None):
+    """Archive finished commands in one pass over the queue snapshot.
+
+    The caller holds the queue lock. Returns a report:
+    {'ok', 'scanned', 'archived', 'kept', 'batches', 'segment', 'elapsed_s', 'dry_run'}.
+    """
+    start = time.perf_counter()
+    if snapshot is None:
+        snapshot = load_queue_snapshot()
+    now = now or datetime.now()
+    statuses = {status.lower() for status in statuses}
+    report = {'ok': True, 'scanned': 0, 'archived': 0, 'kept': 0, 'batches': 0,
+              'segment': None, 'elapsed_s': 0.0, 'dry_run': dry_run}
+
+    def finish(ok=True):
+        report['ok'] = ok
+        report['elapsed_s'] = time.perf_counter() - start
+        return report
+
+    data = snapshot['data']
+    key = snapshot['key']
+    if not snapshot['exists'] or not isinstance(data, dict) or key not in data:
+        return finish()
+    commands = data.get(key) or []
+    if not isinstance(commands, list):
+        print("Error: queue is not a list", file=sys.stderr)
+        return finish(False)
+
+    source = snapshot['path'].name
+    store_dir = archive_store.get_store_dir(snapshot['path'].parent)
+    kept = []
+    batch = []
+
+    def flush():
+        if not batch:
+            return True
+        if not dry_run:
+            try:
+                report['segment'] = archive_store.append_records(batch, store_dir, now)
+            except OSError as e:
+                print(f"Error writing archive store: {e}", file=sys.stderr)
+                return False
+        report['archived'] += len(batch)
+        report['batches'] += 1
+        batch.clear()
+        return True
+
+    for cmd in commands:
+        report['scanned'] += 1
+        if is_finished(cmd, statuses) and old_enough(cmd, min_age_hours, now):
+            batch.append(command_record(cmd, source))
+            if len(batch) >= batch_size and not flush():
+                return finish(False)
+        else:
+            kept.append(cmd)
+    if not flush():
+        return finish(False)
+    report['kept'] = len(kept)
+
+    if report['archived'] and not dry_run:
+        data[key] = kept
+        try:
+            dump_yaml_atomic(snapshot['path'], data, Dumper=YAML_DUMPER,
+                             allow_unicode=True, sort_keys=False, default_flow_style=False)
+        except (OSError, yaml.YAMLError) as e:
+            print(f"Error: Failed to update {snapshot['path']}, but archive was created: {e}", file=sys.stderr)
+            return finish(False)
+    return finish()
+
+
+def format_report(report):
+    """Summary lines: what was archived and how fast."""
+    prefix = '[DRY-RUN] would archive' if report['dry_run'] else 'archived'
+    target = f" → {report['segment']}" if report['segment'] else ''
+    rate = report['scanned'] / report['elapsed_s'] if report['elapsed_s'] else 0.0
+    return [
+        f"{prefix}: {report['archived']} commands{target}",
+        f"remaining: {report['kept']} commands",
+        f"throughput: {report['scanned']} commands scanned in {report['elapsed_s']:.3f}s "
+        f"({rate:.0f} commands/s, {report['batches']} batches)",
+    ]
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description='Archive finished commands from shogun_to_karo.yaml')
+    parser.add_argument('--statuses', default=','.join(DEFAULT_STATUSES),
+                        help='comma-separated statuses that count as finished')
+    parser.add_argument('--min-age-hours', type=float, default=0,
+                        help='keep finished commands this long after completed_at')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='commands per archive store append')
+    parser.add_argument('--lock-timeout', type=float, default=DEFAULT_LOCK_TIMEOUT)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+    args.statuses = tuple(s.strip() for s in args.statuses.split(',') if s.strip())
+    return args
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    queue_dir = get_queue_dir()
+    if not (queue_dir / 'shogun_to_karo.yaml').exists():
+        print(f"Error: {queue_dir / 'shogun_to_karo.yaml'} not found", file=sys.stderr)
+        return 1
+    try:
+        with queue_lock(queue_dir, args.lock_timeout):
+            report = archive_commands(statuses=args.statuses, min_age_hours=args.min_age_hours,
+                                      batch_size=args.batch_size, dry_run=args.dry_run)
+    except TimeoutError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for line in format_report(report):
+        print(line)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -95,6 +95,9 @@ while [ $attempt -lt $max_attempts ]; do
     if _acquire_lock; then
         "$SCRIPT_DIR/.venv/bin/python3" -c "
 import yaml, sys
+sys.path.insert(0, '$SCRIPT_DIR/scripts')
+from atomic_write import dump_yaml_atomic
+from slim_yaml import compact_inbox
 
 try:
     # Load existing inbox
@@ -118,24 +121,12 @@ try:
     }
     data['messages'].append(new_msg)
 
-    # Overflow protection: keep max 50 messages
-    if len(data['messages']) > 50:
-        msgs = data['messages']
-        unread = [m for m in msgs if not m.get('read', False)]
-        read = [m for m in msgs if m.get('read', False)]
-        # Keep all unread + newest 30 read messages
-        data['messages'] = unread + read[-30:]
-
-    # Atomic write: tmp file + rename (prevents partial reads)
-    import tempfile, os
-    tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname('$INBOX'), suffix='.tmp')
-    try:
-        with os.fdopen(tmp_fd, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, indent=2)
-        os.replace(tmp_path, '$INBOX')
-    except:
-        os.unlink(tmp_path)
-        raise
+    # Auto-compaction: over 50 messages, read messages beyond the newest 30 move to
+    # the archive store; over 64KB, all read messages do. Unread messages are always kept
+    compact_inbox('$TARGET', '$INBOX', data)
+
+    # Atomic write: tmp file + fsync + rename (prevents partial reads, survives crashes)
+    dump_yaml_atomic('$INBOX', data, default_flow_style=False, allow_unicode=True, indent=2)
 
 except Exception as e:
     print(f'ERROR: {e}', file=sys.stderr)
@@ -2,40 +2,211 @@
 """SEO Article Quality Check Script (seo_qc.py)
 
 Usage:
-    python3 scripts/seo_qc.py <site> [--base-dir /path/to/seo-affiliate] [--output yaml|json|summary]
+    python3 scripts/seo_qc.py <site> [--base-dir /path/to/seo-affiliate] [--output yaml|json|summary] [--jobs N]
     python3 scripts/seo_qc.py all    # Run all 9 sites
 
 Examples:
     python3 scripts/seo_qc.py gaichuu
     python3 scripts/seo_qc.py all --output summary
+    python3 scripts/seo_qc.py all --jobs 16   # Parallel run (0 = all CPU cores)
+    python3 scripts/seo_qc.py gaichuu --no-cache   # Force a full re-check
+    python3 scripts/seo_qc.py gaichuu --no-cache --profile   # Per-check timing
+    python3 scripts/seo_qc.py gaichuu --plugin site_checks/gaichuu.py
+    python3 scripts/seo_qc.py gaichuu --output jsonl   # Stream per-article results
+    python3 scripts/seo_qc.py gaichuu --watch   # Re-check articles as they change
+    python3 scripts/seo_qc.py trend gaichuu --check check_008 --days 30
+
+Notes:
+    --output jsonl   streams one record per article to qc_result_<site>.jsonl (line-buffered).
+    --watch          re-checks touched articles via inotifywait (polls without it) and rewrites the report.
+    --plugin FILE    loads extra checks registered with @register_check (see register_check).
+    --forbidden-words  extra check_009 words, default config/seo_qc_forbidden_words.yaml
+                     (common: [...], sites: {<site>: [...]}).
+    History          full runs append pass/fail counts to queue/.seo_qc_history.db; read with "trend".
+    Frontmatter      flat YAML uses a fast parser identical to yaml.safe_load (--no-fast-frontmatter to disable).
+    Cache            per-article results in queue/.seo_qc_cache/<site>.json, keyed on content hash and check suite.
 """
 
 import argparse
 import glob
+import hashlib
+import heapq
+import importlib.util
+import json
 import os
 import re
+import select
+import shutil
+import sqlite3
+import subprocess
 import sys
+import time
 import yaml
-from collections import defaultdict
-from datetime import datetime
+from collections import defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 
 DEFAULT_BASE_DIR = "/home/yohei/seo-affiliate"
 ALL_SITES = ["yane", "kagi", "kyutoki", "ohaka", "gaichuu", "kekkon", "ihin", "fuyouhin", "zeirishi"]
 
-# Forbidden words (check_009)
+# Forbidden words (check_009), matched with WordMatcher
 FORBIDDEN_WORDS = ["必ず", "絶対", "間違いなく", "最高", "No.1", "ナンバーワン", "一番"]
-FORBIDDEN_PATTERN = re.compile("|".join(re.escape(w) for w in FORBIDDEN_WORDS))
 
-# Writing style patterns (check_012) - detect 常体 endings
-JOTAI_PATTERN = re.compile(r"である。|であろう。|[^い]だ。")
-
-# Date pattern for publishedAt
-DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Extra forbidden words from --forbidden-words: {"common": [...], "sites": {site: [...]}}
+FORBIDDEN_CONFIG = {"common": [], "sites": {}}
+
+# site -> WordMatcher over FORBIDDEN_WORDS + common + site words (built on first use)
+_FORBIDDEN_MATCHERS = {}
+
+# Precompiled patterns used by the parser and checks
+PATTERNS = {
+    # strip_html_tags
+    "html_tag": re.compile(r"<[^>]+>"),
+    # count_plain_chars: markdown links -> link text, then drop markup and whitespace
+    "md_link": re.compile(r"\[([^\]]*)\]\([^)]*\)"),
+    "md_noise": re.compile(r"[#*_`|>\s-]+"),
+    # <!-- CTA: --> comments (rehype-affiliate-cta pattern) and rendered CTA boxes
+    "cta_comment": re.compile(r"<!--\s*CTA:"),
+    "cta_block": re.compile(r'<div class="cta-box">.*?</div>\s*</div>', re.DOTALL),
+    # FAQ question headings (check_007) and table separator rows (check_011)
+    "question": re.compile(r"#{3,4} ."),
+    "table_separator": re.compile(r"-{2,}"),
+    # Writing style (check_012) - detect 常体 endings
+    "jotai": re.compile(r"である。|であろう。|[^い]だ。"),
+    # publishedAt (check_002)
+    "date": re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+}
 
 # Required frontmatter fields
 REQUIRED_FIELDS = ["title", "description", "publishedAt", "category", "area", "keyword", "keywords"]
 
+# Frontmatter loading: libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+FAST_FRONTMATTER = True
+
+# Fast frontmatter parser: `key: value`, `key:` + block list, `- item`
+_FM_KEY_LINE = re.compile(r"([^\s#:'\"\-?,\[\]{}&*!|>%@`][^:]*?):(?:[ ]+(.*))?$")
+_FM_LIST_ITEM = re.compile(r"([ ]*)-(?:[ ]+(.*))?$")
+_FM_RESOLVER = yaml.resolver.Resolver()
+_FM_CONSTRUCTOR = yaml.constructor.SafeConstructor()
+# Characters that may not start a plain scalar (PyYAML Scanner.check_plain)
+_PLAIN_INDICATORS = "-?:,[]{}#&*!|>'\"%@`"
+# Line breaks other than \n that YAML and str.split disagree on
+_FM_ODD_BREAKS = re.compile("[\r\x85\u2028\u2029\t]")
+
+# Numeric pass criteria used by the checks
+THRESHOLDS = {
+    "pr_scan_lines": 50,         # check_003
+    "cta_count": 3,              # check_004
+    "h2_count": 5,               # check_006
+    "faq_min_questions": 5,      # check_007
+    "min_chars": 2500,           # check_008
+    "cost_table_min_lines": 4,   # check_010
+    "area_min_count": 3,         # check_013
+}
+
+# Bump when check logic changes in a way the constants above do not capture.
+# Any change here, in the word/field lists or in THRESHOLDS invalidates the cache.
+CHECK_SUITE_VERSION = 1
+
+# Sample size of failing filenames kept per check in the YAML summary
+FAIL_FILES_LIMIT = 20
+
+IMAGE_SUFFIXES = ("-ogp.png", "-thumb.png")
+
+# site_dir -> filenames in public/images/articles (one listing per process)
+_IMAGE_INDEX: dict[str, frozenset[str]] = {}
+
+# Check registry: check_id -> {"name", "func", "args", "sites"}
+# "args" names the run_checks inputs passed to the function, in order:
+#   fm, article, slug, site_dir, site, filepath, images
+CHECKS: dict[str, dict] = {}
+
+# Inputs the result cache is keyed on: the file's content hash (fm, article), its name
+# (slug) and the site (one cache file per site). Checks taking any other input are
+# re-run on every cache hit.
+CACHE_KEY_ARGS = frozenset({"fm", "article", "slug", "site"})
+# Inputs available without reading the article
+ARTICLE_FREE_ARGS = frozenset({"slug", "site_dir", "site", "filepath", "images"})
+
+
+def register_check(check_id: str, name: str, args: tuple[str, ...] = ("article",),
+                   sites: list[str] | None = None):
+    """Decorator registering a check function that returns (passed, detail).
+
+    sites limits the check to the listed sites (None = every site).
+    """
+    def decorator(func):
+        CHECKS[check_id] = {"name": name, "func": func, "args": tuple(args),
+                            "sites": None if sites is None else set(sites)}
+        return func
+    return decorator
+
+
+def checks_for_site(site: str) -> list[str]:
+    """Registered check IDs that apply to a site, in ID order."""
+    return [cid for cid in sorted(CHECKS)
+            if CHECKS[cid]["sites"] is None or site in CHECKS[cid]["sites"]]
+
+
+def init_worker(plugin_paths: list[str], fast_frontmatter: bool,
+                forbidden_config: dict | None = None) -> None:
+    """ProcessPoolExecutor initializer: mirror the parent's CLI-dependent state."""
+    global FAST_FRONTMATTER, FORBIDDEN_CONFIG
+    FAST_FRONTMATTER = fast_frontmatter
+    if forbidden_config is not None:
+        FORBIDDEN_CONFIG = forbidden_config
+        _FORBIDDEN_MATCHERS.clear()
+    load_plugins(plugin_paths)
+
+
+def load_forbidden_config(path: str) -> dict:
+    """Read extra forbidden words: {"common": [...], "sites": {site: [...]}}."""
+    with open(path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping with 'common' and/or 'sites'")
+    sites = data.get("sites") or {}
+    return {
+        "common": [str(w) for w in data.get("common") or []],
+        "sites": {str(site): [str(w) for w in words or []] for site, words in sites.items()},
+    }
+
+
+def forbidden_words(site: str) -> list[str]:
+    """Built-in forbidden words plus the configured common and per-site ones."""
+    words = FORBIDDEN_WORDS + FORBIDDEN_CONFIG["common"] + FORBIDDEN_CONFIG["sites"].get(site, [])
+    return list(dict.fromkeys(words))
+
+
+def forbidden_matcher(site: str) -> "WordMatcher":
+    matcher = _FORBIDDEN_MATCHERS.get(site)
+    if matcher is None:
+        matcher = _FORBIDDEN_MATCHERS[site] = WordMatcher(forbidden_words(site))
+    return matcher
+
+
+def load_plugins(paths: list[str]) -> None:
+    """Import plugin files so their @register_check decorators run.
+
+    Also run by init_worker so that pool workers started with the spawn
+    method see the same registry as the parent.
+    """
+    # Plugins do `from seo_qc import register_check`; make that resolve to
+    # this module even when it runs as __main__.
+    sys.modules.setdefault("seo_qc", sys.modules[__name__])
+    for path in paths:
+        module_name = f"seo_qc_plugin_{Path(path).stem}"
+        if module_name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse YAML frontmatter from markdown content. Returns (frontmatter_dict, body)."""
@@ -49,56 +220,306 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     fm_str = content[3:end].strip()
     body = content[end + 3:].strip()
 
-    try:
-        fm = yaml.safe_load(fm_str)
-        if not isinstance(fm, dict):
+    fm = fast_frontmatter(fm_str) if FAST_FRONTMATTER else None
+    if fm is None:
+        try:
+            fm = yaml.load(fm_str, Loader=YAML_LOADER)
+        except yaml.YAMLError:
             fm = {}
-    except yaml.YAMLError:
+    if not isinstance(fm, dict):
         fm = {}
 
     return fm, body
 
 
+def _fm_scalar(text: str):
+    """Construct a single-line scalar exactly as yaml.safe_load would, or raise ValueError."""
+    if text[0] == '"':
+        if len(text) < 2 or text[-1] != '"' or '"' in text[1:-1] or "\\" in text:
+            raise ValueError(text)
+        return text[1:-1]
+    if text[0] == "'":
+        if len(text) < 2 or text[-1] != "'" or "'" in text[1:-1]:
+            raise ValueError(text)
+        return text[1:-1]
+    if text[0] in _PLAIN_INDICATORS and not (
+        text[0] in "-?:" and len(text) > 1 and text[1] != " "
+    ):
+        raise ValueError(text)
+    if ": " in text or " #" in text or text.endswith(":"):
+        raise ValueError(text)
+    tag = _FM_RESOLVER.resolve(yaml.ScalarNode, text, (True, False))
+    if tag == "tag:yaml.org,2002:str":
+        return text
+    # construct_document (not construct_object) clears the constructor's per-node
+    # caches, so the shared constructor keeps nothing between calls
+    return _FM_CONSTRUCTOR.construct_document(yaml.ScalarNode(tag, text))
+
+
+def fast_frontmatter(fm_str: str) -> dict | None:
+    """Parse flat key/value/list frontmatter without the YAML scanner.
+
+    Returns None whenever the text uses anything beyond `key: scalar`,
+    `key:` followed by `- scalar` items, blank lines and comments; the
+    caller then falls back to full YAML.
+    """
+    text = fm_str.replace("\r\n", "\n")
+    if _FM_ODD_BREAKS.search(text) or yaml.reader.Reader.NON_PRINTABLE.search(text):
+        return None
+
+    fm = {}
+    open_key = None     # last key with an empty value; may become a block list
+    list_indent = None  # indentation of that list's items
+    try:
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+
+            item = _FM_LIST_ITEM.match(line)
+            if item is not None:
+                if open_key is None:
+                    return None
+                indent = len(item.group(1))
+                if list_indent is None:
+                    list_indent = indent
+                    fm[open_key] = []
+                elif indent != list_indent:
+                    return None
+                value = (item.group(2) or "").rstrip()
+                if not value:
+                    return None  # nested or null item
+                fm[open_key].append(_fm_scalar(value))
+                continue
+
+            if line[0] == " ":
+                return None  # continuation line or nested mapping
+
+            m = _FM_KEY_LINE.match(line)
+            if m is None:
+                return None
+            key = m.group(1)
+            if key != key.rstrip() or _fm_scalar(key) != key:
+                return None  # key resolves to a non-string (true, null, 1, ...)
+            value = (m.group(2) or "").rstrip()
+            if value:
+                fm[key] = _fm_scalar(value)
+                open_key = None
+            else:
+                fm[key] = None
+                open_key = key
+            list_indent = None
+    except (ValueError, yaml.YAMLError):
+        return None
+
+    return fm
+
+
 def strip_html_tags(text: str) -> str:
     """Remove HTML tags from text."""
-    return re.sub(r"<[^>]+>", "", text)
+    return PATTERNS["html_tag"].sub("", text)
 
 
-def count_japanese_chars(text: str) -> int:
-    """Count meaningful characters (Japanese + alphanumeric, excluding whitespace and markdown)."""
-    # Remove HTML tags
-    text = strip_html_tags(text)
+def count_plain_chars(text: str) -> int:
+    """Count meaningful characters in HTML-stripped text (excluding whitespace and markdown)."""
     # Remove markdown link syntax
-    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)
-    # Remove markdown formatting
-    text = re.sub(r"[#*_`|>-]", "", text)
-    # Remove whitespace and newlines
-    text = re.sub(r"\s+", "", text)
-    return len(text)
+    text = PATTERNS["md_link"].sub(r"\1", text)
+    # Remove markdown formatting, whitespace and newlines
+    return len(PATTERNS["md_noise"].sub("", text))
 
 
-def find_h2_sections(body: str) -> list[tuple[str, str]]:
-    """Find H2 sections and their content. Returns list of (heading, section_content)."""
+def count_japanese_chars(text: str) -> int:
+    """Count meaningful characters (Japanese + alphanumeric, excluding whitespace and markdown)."""
+    return count_plain_chars(strip_html_tags(text))
+
+
+class WordMatcher:
+    """Multi-word matcher: leftmost-longest, non-overlapping occurrences.
+
+    Small word lists are matched with one alternation regex (longer words
+    first), which the C regex engine scans fastest. Above REGEX_MAX_WORDS an
+    Aho-Corasick automaton takes over: its single pass does not slow down as
+    words are added, while the alternation is retried word by word at every
+    position (see tests/seo_qc_forbidden_bench.sh). Both give identical results.
+    """
+
+    REGEX_MAX_WORDS = 300
+
+    def __init__(self, words: list[str], engine: str = "auto"):
+        self.words = list(dict.fromkeys(w for w in words if w))
+        if engine == "auto":
+            engine = "regex" if len(self.words) <= self.REGEX_MAX_WORDS else "automaton"
+        self.engine = engine
+        self._pattern = None
+        if engine == "regex":
+            if self.words:
+                longest_first = sorted(self.words, key=len, reverse=True)
+                self._pattern = re.compile("|".join(re.escape(w) for w in longest_first))
+            self._start = None
+            return
+
+        goto = [{}]
+        fail = [0]
+        out = [()]  # lengths of the words ending in each state, longest first
+        for word in self.words:
+            state = 0
+            for ch in word:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                state = nxt
+            out[state] = (len(word),)
+
+        # Breadth-first, so a state's fail target is complete before the state
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0) if state else 0
+                fail[nxt] = target
+                out[nxt] = out[nxt] + out[target]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        # From the root state, jump straight to the next possible first character
+        first = "".join(sorted(goto[0]))
+        self._start = re.compile("[" + re.escape(first) + "]") if first else None
+
+    def findall(self, text: str) -> list[str]:
+        if self._pattern is not None:
+            return self._pattern.findall(text)
+        if self._start is None:
+            return []
+        goto, fail, out, start = self._goto, self._fail, self._out, self._start
+        spans = []
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if not state:
+                m = start.search(text, i)
+                if m is None:
+                    break
+                i = m.start()
+            ch = text[i]
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            i += 1
+            for length in out[state]:
+                spans.append((i - length, i))
+
+        # Resolve overlaps: leftmost first, longest at the same start
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        matches = []
+        pos = 0
+        for begin, end in spans:
+            if begin >= pos:
+                matches.append(text[begin:end])
+                pos = end
+        return matches
+
+
+@dataclass
+class H2Section:
+    """One H2 heading and the lines up to the next H2."""
+    heading: str
+    lines: list[str] = field(default_factory=list)
+    question_count: int = 0  # ### / #### headings
+    table_lines: int = 0     # lines starting with "|"
+
+    @property
+    def content(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass
+class Article:
+    """Article body tokenized once; every body check reads from this."""
+    body: str
+    lines: list[str]
+    sections: list[H2Section]
+    h2_count: int
+    table_issues: list[str]
+    cta_div_count: int
+    cta_comment_count: int
+    cta_blocks: list[str]
+    text: str  # HTML-stripped body
+    char_count: int
+
+
+def parse_article(body: str) -> Article:
+    """Scan the body once, collecting H2 sections, table syntax issues and CTA blocks."""
     lines = body.split("\n")
     sections = []
-    current_heading = None
-    current_lines = []
-
-    for line in lines:
-        if line.startswith("## "):
-            if current_heading is not None:
-                sections.append((current_heading, "\n".join(current_lines)))
-            current_heading = line
-            current_lines = []
-        elif current_heading is not None:
-            current_lines.append(line)
+    current = None
+    h2_count = 0
+    table_issues = []
+    in_table = False
+    has_separator = False
 
-    if current_heading is not None:
-        sections.append((current_heading, "\n".join(current_lines)))
+    for i, line in enumerate(lines):
+        is_table_row = line.strip().startswith("|")
 
-    return sections
+        if line.startswith("## "):
+            if len(line) > 3:
+                h2_count += 1
+            current = H2Section(line)
+            sections.append(current)
+        elif current is not None:
+            current.lines.append(line)
+            if PATTERNS["question"].match(line):
+                current.question_count += 1
+            if is_table_row:
+                current.table_lines += 1
+
+        # Markdown table syntax: header -> separator -> data rows
+        if is_table_row:
+            if not in_table:
+                # Start of a new table - this should be the header row
+                in_table = True
+                has_separator = False
+                # Next line must be separator (|---|---|)
+                if i + 1 < len(lines):
+                    next_line = lines[i + 1].strip()
+                    if next_line.startswith("|") and PATTERNS["table_separator"].search(next_line):
+                        has_separator = True
+                    else:
+                        table_issues.append(f"line {i+1}: table header not followed by separator")
+            # else: continuation of table (data rows) - OK
+        elif in_table:
+            in_table = False
+            if not has_separator:
+                table_issues.append(f"table ending at line {i}: no separator row found")
+
+    text = strip_html_tags(body)
+
+    return Article(
+        body=body,
+        lines=lines,
+        sections=sections,
+        h2_count=h2_count,
+        table_issues=table_issues,
+        cta_div_count=body.count('<div class="cta-box">'),
+        cta_comment_count=len(PATTERNS["cta_comment"].findall(body)),
+        cta_blocks=PATTERNS["cta_block"].findall(body),
+        text=text,
+        char_count=count_plain_chars(text),
+    )
 
 
+@register_check("check_001", "frontmatter存在", args=("fm",))
 def check_001_frontmatter_fields(fm: dict) -> tuple[bool, str]:
     """Check that all 7 required frontmatter fields exist."""
     missing = [f for f in REQUIRED_FIELDS if f not in fm]
@@ -107,6 +528,7 @@ def check_001_frontmatter_fields(fm: dict) -> tuple[bool, str]:
     return True, ""
 
 
+@register_check("check_002", "frontmatter型", args=("fm",))
 def check_002_frontmatter_types(fm: dict) -> tuple[bool, str]:
     """Check frontmatter field types and values."""
     issues = []
@@ -119,7 +541,7 @@ def check_002_frontmatter_types(fm: dict) -> tuple[bool, str]:
 
     if "publishedAt" in fm:
         val = str(fm["publishedAt"])
-        if not DATE_PATTERN.match(val):
+        if not PATTERNS["date"].match(val):
             issues.append(f"publishedAt format: {val}")
 
     if "category" in fm and fm["category"] != "area":
@@ -144,43 +566,36 @@ def check_002_frontmatter_types(fm: dict) -> tuple[bool, str]:
     return True, ""
 
 
-def check_003_pr_notation(body: str) -> tuple[bool, str]:
+@register_check("check_003", "PR表記")
+def check_003_pr_notation(article: Article) -> tuple[bool, str]:
     """Check for PR/affiliate disclosure within first 50 lines."""
-    lines = body.split("\n")[:50]
-    text = "\n".join(lines)
-    if "アフィリエイト広告" in text or "PR" in text:
-        return True, ""
-    return False, "PR notation not found in first 50 lines"
+    limit = THRESHOLDS["pr_scan_lines"]
+    for line in article.lines[:limit]:
+        if "アフィリエイト広告" in line or "PR" in line:
+            return True, ""
+    return False, f"PR notation not found in first {limit} lines"
 
 
-def check_004_cta_count(body: str) -> tuple[bool, str]:
+@register_check("check_004", "CTA×3")
+def check_004_cta_count(article: Article) -> tuple[bool, str]:
     """Check that exactly 3 CTA boxes exist."""
-    count = body.count('<div class="cta-box">')
-    # Also check for <!-- CTA: --> comments (rehype-affiliate-cta pattern)
-    cta_comments = len(re.findall(r"<!--\s*CTA:", body))
+    count = article.cta_div_count
+    cta_comments = article.cta_comment_count
     total = count + cta_comments
-    if total == 3:
+    if total == THRESHOLDS["cta_count"]:
         return True, ""
     return False, f"CTA count: {total} (div: {count}, comment: {cta_comments})"
 
 
-def check_005_cta_structure(body: str) -> tuple[bool, str]:
+@register_check("check_005", "CTA構造")
+def check_005_cta_structure(article: Article) -> tuple[bool, str]:
     """Check CTA box HTML structure."""
-    # Find all cta-box divs
-    cta_blocks = re.findall(
-        r'<div class="cta-box">.*?</div>\s*</div>',
-        body,
-        re.DOTALL
-    )
-
-    # Also count CTA comments (these are valid - replaced at build time)
-    cta_comments = len(re.findall(r"<!--\s*CTA:", body))
-
-    if not cta_blocks and cta_comments == 0:
+    # CTA comments are valid - replaced at build time
+    if not article.cta_blocks and article.cta_comment_count == 0:
         return False, "no CTA found"
 
     issues = []
-    for i, block in enumerate(cta_blocks):
+    for i, block in enumerate(article.cta_blocks):
         if 'cta-badge' not in block and 'cta-button' not in block:
             issues.append(f"CTA#{i+1}: missing badge or button")
         if 'nofollow' not in block or 'sponsored' not in block:
@@ -191,51 +606,53 @@ def check_005_cta_structure(body: str) -> tuple[bool, str]:
     return True, ""
 
 
-def check_006_h2_count(body: str) -> tuple[bool, str]:
+@register_check("check_006", "H2×5")
+def check_006_h2_count(article: Article) -> tuple[bool, str]:
     """Check that there are exactly 5 H2 headings."""
-    h2s = re.findall(r"^## .+", body, re.MULTILINE)
-    count = len(h2s)
-    if count == 5:
+    count = article.h2_count
+    if count == THRESHOLDS["h2_count"]:
         return True, ""
     return False, f"H2 count: {count}"
 
 
-def check_007_faq_questions(body: str) -> tuple[bool, str]:
+@register_check("check_007", "FAQ 5問")
+def check_007_faq_questions(article: Article) -> tuple[bool, str]:
     """Check that FAQ section has 5 Q&A items."""
-    sections = find_h2_sections(body)
+    sections = article.sections
     # FAQ is typically the 4th H2 section
-    faq_content = ""
-    for heading, content in sections:
-        if "FAQ" in heading or "よくある質問" in heading:
-            faq_content = content
+    faq = None
+    for section in sections:
+        if "FAQ" in section.heading or "よくある質問" in section.heading:
+            faq = section
             break
 
-    # If no explicit FAQ heading, use 4th section
-    if not faq_content and len(sections) >= 4:
-        faq_content = sections[3][1]
+    # If no explicit FAQ heading (or it is empty), use 4th section
+    if (faq is None or not faq.content) and len(sections) >= 4:
+        faq = sections[3]
 
-    if not faq_content:
+    if faq is None or not faq.content:
         return False, "FAQ section not found"
 
     # Count ### or #### headings in FAQ section
-    questions = re.findall(r"^#{3,4} .+", faq_content, re.MULTILINE)
-    count = len(questions)
-    if count >= 5:
+    count = faq.question_count
+    if count >= THRESHOLDS["faq_min_questions"]:
         return True, ""
     return False, f"FAQ questions: {count}"
 
 
-def check_008_char_count(body: str) -> tuple[bool, str]:
+@register_check("check_008", "2500文字↑")
+def check_008_char_count(article: Article) -> tuple[bool, str]:
     """Check that body has >= 2500 Japanese characters."""
-    char_count = count_japanese_chars(body)
-    if char_count >= 2500:
+    char_count = article.char_count
+    if char_count >= THRESHOLDS["min_chars"]:
         return True, ""
     return False, f"chars: {char_count}"
 
 
-def check_009_forbidden_words(body: str) -> tuple[bool, list]:
-    """Check for forbidden words."""
-    matches = FORBIDDEN_PATTERN.findall(body)
+@register_check("check_009", "禁止語なし", args=("article", "site"))
+def check_009_forbidden_words(article: Article, site: str) -> tuple[bool, list]:
+    """Check for forbidden words (built-in plus the site's configured terms)."""
+    matches = forbidden_matcher(site).findall(article.body)
     if not matches:
         return True, []
     # Count occurrences
@@ -246,86 +663,89 @@ def check_009_forbidden_words(body: str) -> tuple[bool, list]:
     return False, details
 
 
-def check_010_cost_table(body: str) -> tuple[bool, str]:
+@register_check("check_010", "費用テーブル")
+def check_010_cost_table(article: Article) -> tuple[bool, str]:
     """Check that first H2 section contains a markdown table (>= 4 lines)."""
-    sections = find_h2_sections(body)
-    if not sections:
+    if not article.sections:
         return False, "no H2 sections"
 
-    first_section = sections[0][1]
-    table_lines = [l for l in first_section.split("\n") if l.strip().startswith("|")]
-    if len(table_lines) >= 4:
+    table_lines = article.sections[0].table_lines
+    if table_lines >= THRESHOLDS["cost_table_min_lines"]:
         return True, ""
-    return False, f"table lines in H2-1: {len(table_lines)}"
+    return False, f"table lines in H2-1: {table_lines}"
 
 
-def check_011_markdown_table_syntax(body: str) -> tuple[bool, str]:
+@register_check("check_011", "md構文")
+def check_011_markdown_table_syntax(article: Article) -> tuple[bool, str]:
     """Check markdown table syntax: header -> separator -> data rows."""
-    lines = body.split("\n")
-    issues = []
-    i = 0
-    in_table = False
-    has_separator = False
-
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.startswith("|"):
-            if not in_table:
-                # Start of a new table - this should be the header row
-                in_table = True
-                has_separator = False
-                # Next line must be separator (|---|---|)
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    if next_line.startswith("|") and re.search(r"-{2,}", next_line):
-                        has_separator = True
-                    else:
-                        issues.append(f"line {i+1}: table header not followed by separator")
-            # else: continuation of table (data rows) - OK
-        else:
-            if in_table:
-                in_table = False
-                if not has_separator:
-                    issues.append(f"table ending at line {i}: no separator row found")
-        i += 1
-
-    if issues:
-        return False, "; ".join(issues[:3])
+    if article.table_issues:
+        return False, "; ".join(article.table_issues[:3])
     return True, ""
 
 
-def check_012_writing_style(body: str) -> tuple[bool, str]:
+@register_check("check_012", "です・ます")
+def check_012_writing_style(article: Article) -> tuple[bool, str]:
     """Check for consistent です・ます style (no 常体 endings)."""
-    # Exclude HTML tags and frontmatter
-    clean = strip_html_tags(body)
-    matches = JOTAI_PATTERN.findall(clean)
+    # HTML tags are already stripped from article.text
+    matches = PATTERNS["jotai"].findall(article.text)
     if not matches:
         return True, ""
     return False, f"常体 found: {matches[:5]}"
 
 
-def check_013_area_frequency(fm: dict, body: str) -> tuple[bool, str]:
+@register_check("check_013", "地域名出現", args=("fm", "article"))
+def check_013_area_frequency(fm: dict, article: Article) -> tuple[bool, str]:
     """Check that area name appears >= 3 times in body."""
     area = fm.get("area", "")
     if not area:
         return False, "no area in frontmatter"
 
-    count = body.count(area)
-    if count >= 3:
+    count = article.body.count(area)
+    if count >= THRESHOLDS["area_min_count"]:
         return True, ""
     return False, f"area '{area}' count: {count}"
 
 
-def check_014_image_exists(slug: str, site_dir: str) -> tuple[bool, str]:
-    """Check that OGP and thumbnail images exist for the article."""
-    images_dir = os.path.join(site_dir, "public", "images", "articles")
-    ogp_path = os.path.join(images_dir, f"{slug}-ogp.png")
-    thumb_path = os.path.join(images_dir, f"{slug}-thumb.png")
+def images_dir(site_dir: str) -> str:
+    return os.path.join(site_dir, "public", "images", "articles")
+
+
+def image_index(site_dir: str, refresh: bool = False) -> frozenset[str]:
+    """Filenames in the site's images directory, listed once with os.scandir."""
+    if refresh or site_dir not in _IMAGE_INDEX:
+        try:
+            with os.scandir(images_dir(site_dir)) as it:
+                _IMAGE_INDEX[site_dir] = frozenset(e.name for e in it if e.is_file())
+        except OSError:
+            _IMAGE_INDEX[site_dir] = frozenset()
+    return _IMAGE_INDEX[site_dir]
+
+
+def find_orphaned_images(site_dir: str, images: frozenset[str], slugs: set[str]) -> dict:
+    """Images that no article slug references, with their total size."""
+    used = {f"{slug}{suffix}" for slug in slugs for suffix in IMAGE_SUFFIXES}
+    orphans = sorted(images - used)
+    total_bytes = 0
+    for name in orphans:
+        try:
+            total_bytes += os.stat(os.path.join(images_dir(site_dir), name)).st_size
+        except OSError:
+            pass
+    return {
+        "total_images": len(images),
+        "orphaned": len(orphans),
+        "orphaned_bytes": total_bytes,
+        "orphaned_files": orphans[:FAIL_FILES_LIMIT],  # Limited to FAIL_FILES_LIMIT samples
+    }
 
+
+@register_check("check_014", "画像存在", args=("slug", "images"))
+def check_014_image_exists(slug: str, images: frozenset[str]) -> tuple[bool, str]:
+    """Check that OGP and thumbnail images exist for the article."""
     missing = []
-    if not os.path.exists(ogp_path):
+    if f"{slug}-ogp.png" not in images:
         missing.append("ogp")
-    if not os.path.exists(thumb_path):
+    if f"{slug}-thumb.png" not in images:
         missing.append("thumb")
 
     if not missing:
@@ -333,143 +753,349 @@ def check_014_image_exists(slug: str, site_dir: str) -> tuple[bool, str]:
     return False, f"missing: {', '.join(missing)}"
 
 
-def run_checks(filepath: str, site_dir: str) -> dict:
-    """Run all 14 checks on a single article file."""
+def run_checks(filepath: str, site_dir: str, profile: dict | None = None) -> dict:
+    """Run every registered check that applies to the article's site.
+
+    If profile is given, per-check [calls, seconds] are accumulated into it.
+    """
+    timer = time.perf_counter
+
+    t0 = timer()
     with open(filepath, "r", encoding="utf-8") as f:
         content = f.read()
-
     fm, body = parse_frontmatter(content)
-    slug = Path(filepath).stem  # filename without extension
-    filename = Path(filepath).name
+    t1 = timer()
+    article = parse_article(body)
+    t2 = timer()
+    if profile is not None:
+        _record(profile, "read+frontmatter", t1 - t0)
+        _record(profile, "parse_article", t2 - t1)
+
+    site = os.path.basename(os.path.normpath(site_dir))
+    inputs = {
+        "fm": fm,
+        "article": article,
+        "slug": Path(filepath).stem,  # filename without extension
+        "site_dir": site_dir,
+        "site": site,
+        "filepath": filepath,
+        "images": image_index(site_dir),
+    }
 
     results = {}
+    for cid in checks_for_site(site):
+        check = CHECKS[cid]
+        start = timer()
+        passed, detail = check["func"](*(inputs[name] for name in check["args"]))
+        if profile is not None:
+            _record(profile, cid, timer() - start)
+        results[cid] = {"pass": passed, "detail": detail if not passed else ""}
 
-    # Check 001: Frontmatter fields
-    passed, detail = check_001_frontmatter_fields(fm)
-    results["check_001"] = {"pass": passed, "detail": detail}
+    return results
 
-    # Check 002: Frontmatter types
-    passed, detail = check_002_frontmatter_types(fm)
-    results["check_002"] = {"pass": passed, "detail": detail}
 
-    # Check 003: PR notation
-    passed, detail = check_003_pr_notation(body)
-    results["check_003"] = {"pass": passed, "detail": detail}
+def _record(profile: dict, key: str, seconds: float, calls: int = 1) -> None:
+    stat = profile.setdefault(key, [0, 0.0])
+    stat[0] += calls
+    stat[1] += seconds
 
-    # Check 004: CTA count
-    passed, detail = check_004_cta_count(body)
-    results["check_004"] = {"pass": passed, "detail": detail}
 
-    # Check 005: CTA structure
-    passed, detail = check_005_cta_structure(body)
-    results["check_005"] = {"pass": passed, "detail": detail}
+def merge_profile(total: dict, part: dict) -> None:
+    for key, (calls, seconds) in part.items():
+        _record(total, key, seconds, calls)
 
-    # Check 006: H2 count
-    passed, detail = check_006_h2_count(body)
-    results["check_006"] = {"pass": passed, "detail": detail}
 
-    # Check 007: FAQ questions
-    passed, detail = check_007_faq_questions(body)
-    results["check_007"] = {"pass": passed, "detail": detail}
+def format_profile(profile: dict) -> dict:
+    """Profile as {key: {calls, total_ms, avg_us}}, slowest first."""
+    ordered = sorted(profile.items(), key=lambda kv: kv[1][1], reverse=True)
+    return {
+        key: {
+            "calls": calls,
+            "total_ms": round(seconds * 1000, 3),
+            "avg_us": round(seconds / calls * 1e6, 1) if calls else 0.0,
+        }
+        for key, (calls, seconds) in ordered
+    }
 
-    # Check 008: Character count
-    passed, detail = check_008_char_count(body)
-    results["check_008"] = {"pass": passed, "detail": detail}
 
-    # Check 009: Forbidden words
-    passed, detail = check_009_forbidden_words(body)
-    results["check_009"] = {"pass": passed, "detail": detail if not passed else ""}
+def new_summary(check_ids: list[str]) -> dict:
+    """Empty running totals for add_to_summary / finalize_summary."""
+    return {cid: {"pass": 0, "fail": 0, "fail_files": [], "fail_files_total": 0} for cid in check_ids}
 
-    # Check 010: Cost table
-    passed, detail = check_010_cost_table(body)
-    results["check_010"] = {"pass": passed, "detail": detail}
 
-    # Check 011: Markdown table syntax
-    passed, detail = check_011_markdown_table_syntax(body)
-    results["check_011"] = {"pass": passed, "detail": detail}
+def add_to_summary(summary: dict, filename: str, checks: dict) -> None:
+    """Fold one file's results into running totals without retaining them."""
+    for cid, acc in summary.items():
+        if cid not in checks:
+            continue
+        if checks[cid]["pass"]:
+            acc["pass"] += 1
+        else:
+            acc["fail"] += 1
+            acc["fail_files_total"] += 1
+            if len(acc["fail_files"]) < FAIL_FILES_LIMIT:
+                acc["fail_files"].append(filename)
+
+
+def finalize_summary(summary: dict) -> dict:
+    """Turn running totals into the per-check report section."""
+    final = {}
+    for cid, acc in summary.items():
+        total = acc["pass"] + acc["fail"]
+        rate = f"{acc['pass'] / total * 100:.0f}%" if total > 0 else "N/A"
+        final[cid] = {
+            "pass": acc["pass"],
+            "fail": acc["fail"],
+            "pass_rate": rate,
+            "fail_files": acc["fail_files"],  # Limited to FAIL_FILES_LIMIT samples
+            "fail_files_total": acc["fail_files_total"],
+        }
+    return final
+
 
-    # Check 012: Writing style
-    passed, detail = check_012_writing_style(body)
-    results["check_012"] = {"pass": passed, "detail": detail}
+def aggregate_results(all_results: dict[str, dict], check_ids: list[str] | None = None) -> dict:
+    """Aggregate per-file results into site-level summary."""
+    if check_ids is None:
+        check_ids = sorted(CHECKS)
+    summary = new_summary(check_ids)
+    for filename, checks in all_results.items():
+        add_to_summary(summary, filename, checks)
+    return finalize_summary(summary)
 
-    # Check 013: Area frequency
-    passed, detail = check_013_area_frequency(fm, body)
-    results["check_013"] = {"pass": passed, "detail": detail}
 
-    # Check 014: Image exists
-    passed, detail = check_014_image_exists(slug, site_dir)
-    results["check_014"] = {"pass": passed, "detail": detail}
+def source_digest(func) -> str:
+    """Hash of the file defining func, so editing a check (or a plugin's helpers) invalidates the cache."""
+    try:
+        return file_digest(func.__code__.co_filename)
+    except (AttributeError, OSError):
+        # No readable source (builtins, callables without __code__): fall back to the bytecode
+        code = getattr(func, "__code__", None)
+        return hashlib.blake2b(code.co_code if code else repr(func).encode(), digest_size=16).hexdigest()
+
+
+def suite_fingerprint() -> str:
+    """Hash of everything that affects check results apart from the article itself."""
+    suite = {
+        "version": CHECK_SUITE_VERSION,
+        "forbidden_words": FORBIDDEN_WORDS,
+        "forbidden_config": FORBIDDEN_CONFIG,
+        "required_fields": REQUIRED_FIELDS,
+        "thresholds": THRESHOLDS,
+        "checks": {cid: [c["func"].__module__, c["func"].__qualname__, source_digest(c["func"]),
+                         list(c["args"]), sorted(c["sites"] or [])]
+                   for cid, c in sorted(CHECKS.items())},
+    }
+    return hashlib.sha256(json.dumps(suite, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
 
-    return results
 
+def file_digest(filepath: str) -> str:
+    with open(filepath, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
 
-def aggregate_results(all_results: dict[str, dict]) -> dict:
-    """Aggregate per-file results into site-level summary."""
-    check_ids = [f"check_{i:03d}" for i in range(1, 15)]
-    summary = {}
 
+def load_cache(cache_path: str | None) -> dict:
+    """Load a site's result cache, discarding it if the check suite has changed."""
+    empty = {"suite": suite_fingerprint(), "files": {}}
+    if cache_path is None or not os.path.exists(cache_path):
+        return empty
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(cache, dict) or cache.get("suite") != empty["suite"]:
+        return empty
+    if not isinstance(cache.get("files"), dict):
+        return empty
+    return cache
+
+
+def save_cache(cache_path: str, cache: dict) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+
+
+def uncached_checks(site: str) -> list[str]:
+    """IDs of the site's checks with inputs outside the cache key (see CACHE_KEY_ARGS)."""
+    return [cid for cid in checks_for_site(site) if not CACHE_KEY_ARGS.issuperset(CHECKS[cid]["args"])]
+
+
+def rerun_checks(filepath: str, site_dir: str, results: dict, check_ids: list[str],
+                 images: frozenset[str], profile: dict | None = None) -> dict | None:
+    """Re-answer check_ids on top of an article's cached results, without reading it.
+
+    Returns None if one of the checks also needs the article itself (the
+    caller then re-checks the whole file).
+    """
+    inputs = {
+        "slug": Path(filepath).stem,
+        "site_dir": site_dir,
+        "site": os.path.basename(os.path.normpath(site_dir)),
+        "filepath": filepath,
+        "images": images,
+    }
+    results = dict(results)
     for cid in check_ids:
-        pass_count = 0
-        fail_count = 0
-        fail_files = []
-
-        for filename, checks in all_results.items():
-            if cid in checks:
-                if checks[cid]["pass"]:
-                    pass_count += 1
-                else:
-                    fail_count += 1
-                    fail_files.append(filename)
+        check = CHECKS[cid]
+        if not ARTICLE_FREE_ARGS.issuperset(check["args"]):
+            return None
+        start = time.perf_counter()
+        passed, detail = check["func"](*(inputs[name] for name in check["args"]))
+        if profile is not None:
+            _record(profile, cid, time.perf_counter() - start)
+        results[cid] = {"pass": passed, "detail": detail if not passed else ""}
+    return results
 
-        total = pass_count + fail_count
-        rate = f"{pass_count / total * 100:.0f}%" if total > 0 else "N/A"
 
-        summary[cid] = {
-            "pass": pass_count,
-            "fail": fail_count,
-            "pass_rate": rate,
-            "fail_files": fail_files[:20],  # Limit to 20 samples
-            "fail_files_total": len(fail_files),
-        }
+def check_article(filepath: str, site_dir: str,
+                  profile: bool = False) -> tuple[str, dict, str | None, dict | None]:
+    """Run checks on one article. Returns (filename, results, error_message, profile).
 
-    return summary
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    Errors are returned instead of printed so that the parent process reports
+    them in file order regardless of worker scheduling.
+    """
+    filename = Path(filepath).name
+    stats = {} if profile else None
+    try:
+        return filename, run_checks(filepath, site_dir, stats), None, stats
+    except Exception as e:
+        return filename, {"error": str(e)}, str(e), stats
 
 
-def run_site(site: str, base_dir: str, output_format: str = "yaml") -> dict:
-    """Run QC checks on all articles for a site."""
+def find_articles(area_dir: str) -> list[str]:
+    """Return all .md files followed by all .mdx files, each sorted by path."""
+    md_files = sorted(glob.glob(os.path.join(area_dir, "*.md")))
+    mdx_files = sorted(glob.glob(os.path.join(area_dir, "*.mdx")))
+    return md_files + mdx_files
+
+
+def start_site(site: str, base_dir: str, executor: Executor | None = None, jobs: int = 1,
+               cache_dir: str | None = None, profile: bool = False):
+    """Locate a site's articles and schedule checks for those not in the cache.
+
+    With an executor, every uncached article is submitted immediately and
+    results are yielded in file order, so several sites can be started
+    before any of them is finished. Returns None if nothing to check.
+    """
     site_dir = os.path.join(base_dir, site)
     area_dir = os.path.join(site_dir, "src", "content", "area")
 
     if not os.path.isdir(area_dir):
         print(f"ERROR: {area_dir} not found", file=sys.stderr)
-        return {}
+        return None
 
-    # Find all .md and .mdx files
-    md_files = sorted(glob.glob(os.path.join(area_dir, "*.md")))
-    mdx_files = sorted(glob.glob(os.path.join(area_dir, "*.mdx")))
-    all_files = md_files + mdx_files
+    all_files = find_articles(area_dir)
 
     if not all_files:
         print(f"WARNING: No articles found in {area_dir}", file=sys.stderr)
-        return {}
+        return None
 
-    print(f"Checking {site}: {len(all_files)} articles...", file=sys.stderr)
+    cache_path = os.path.join(cache_dir, f"{site}.json") if cache_dir else None
+    cache = load_cache(cache_path)
+    images = image_index(site_dir, refresh=True)
 
-    all_results = {}
+    digests = {}
+    cached = {}
+    stale = []
+    parent_profile = {}
+    rerun = uncached_checks(site)
     for filepath in all_files:
         filename = Path(filepath).name
         try:
-            results = run_checks(filepath, site_dir)
-            all_results[filename] = results
-        except Exception as e:
-            print(f"  ERROR: {filename}: {e}", file=sys.stderr)
-            all_results[filename] = {"error": str(e)}
+            digests[filename] = file_digest(filepath)
+        except OSError:
+            stale.append(filepath)
+            continue
+        entry = cache["files"].get(filename)
+        results = None
+        if entry is not None and entry.get("hash") == digests[filename]:
+            # e.g. image presence (check_014) is not part of the content hash
+            results = rerun_checks(filepath, site_dir, entry["results"], rerun, images,
+                                   parent_profile if profile else None)
+        if results is not None:
+            cached[filename] = results
+        else:
+            stale.append(filepath)
+
+    print(f"Checking {site}: {len(all_files)} articles ({len(cached)} cached)...", file=sys.stderr)
+
+    if executor is None:
+        fresh = map(check_article, stale, repeat(site_dir), repeat(profile))
+    else:
+        # Large chunks amortize IPC; keep ~4 chunks per worker for load balance
+        chunksize = max(1, len(stale) // (max(jobs, 1) * 4))
+        fresh = executor.map(check_article, stale, repeat(site_dir), repeat(profile), chunksize=chunksize)
+
+    def outcomes():
+        for filepath in all_files:
+            filename = Path(filepath).name
+            if filename in cached:
+                yield filename, cached[filename], None, None
+            else:
+                yield next(fresh)
+
+    return {
+        "site": site,
+        "all_files": all_files,
+        "outcomes": outcomes(),
+        "cache_path": cache_path,
+        "cache": cache,
+        "digests": digests,
+        "orphaned_images": find_orphaned_images(site_dir, images, {Path(f).stem for f in all_files}),
+        "profile": parent_profile if profile else None,
+    }
+
 
-    summary = aggregate_results(all_results)
+def finish_site(pending: dict, record_sink=None) -> dict:
+    """Collect scheduled check results (in file order) into a site report and refresh the cache.
+
+    Results are folded into the summary as they arrive; if record_sink is
+    given it is called with one record dict per article, in file order.
+    """
+    site = pending["site"]
+    summary = new_summary(checks_for_site(site))
+    files_cache = {}
+    profile = pending["profile"]
+    for filename, results, error, stats in pending["outcomes"]:
+        if stats:
+            merge_profile(profile, stats)
+        if error is not None:
+            print(f"  ERROR: {filename}: {error}", file=sys.stderr)
+        elif filename in pending["digests"]:
+            files_cache[filename] = {"hash": pending["digests"][filename], "results": results}
+        add_to_summary(summary, filename, results)
+        if record_sink is not None:
+            record = {"site": site, "file": filename}
+            if error is not None:
+                record["error"] = error
+            else:
+                record["pass"] = all(r["pass"] for r in results.values())
+                record["results"] = results
+            record_sink(record)
+
+    if pending["cache_path"] is not None:
+        cache = pending["cache"]
+        # Rebuilt from this run only, so deleted articles drop out of the cache
+        cache["files"] = files_cache
+        try:
+            save_cache(pending["cache_path"], cache)
+        except OSError as e:
+            print(f"  WARNING: cache not saved: {e}", file=sys.stderr)
 
+    return build_report(site, len(pending["all_files"]), finalize_summary(summary),
+                        pending["orphaned_images"], profile)
+
+
+def build_report(site: str, total_articles: int, summary: dict, images: dict,
+                 profile: dict | None = None) -> dict:
+    """Assemble the site report written to qc_result_<site>.yaml."""
     report = {
         "site": site,
-        "total_articles": len(all_files),
+        "total_articles": total_articles,
         "timestamp": datetime.now().isoformat(),
         "results": summary,
     }
@@ -483,33 +1109,30 @@ def run_site(site: str, base_dir: str, output_format: str = "yaml") -> dict:
         "total_fail": total_fail,
         "pass_rate": f"{total_pass / total_checks * 100:.1f}%" if total_checks > 0 else "N/A",
     }
+    report["images"] = images
+
+    if profile is not None:
+        report["profile"] = format_profile(profile)
 
     return report
 
 
+def run_site(site: str, base_dir: str, output_format: str = "yaml",
+             executor: Executor | None = None, jobs: int = 1, cache_dir: str | None = None,
+             profile: bool = False) -> dict:
+    """Run QC checks on all articles for a site."""
+    pending = start_site(site, base_dir, executor, jobs, cache_dir, profile)
+    if pending is None:
+        return {}
+    return finish_site(pending)
+
+
 def print_summary(report: dict):
     """Print a concise summary table."""
     site = report["site"]
     total = report["total_articles"]
     results = report["results"]
 
-    check_names = {
-        "check_001": "frontmatter存在",
-        "check_002": "frontmatter型",
-        "check_003": "PR表記",
-        "check_004": "CTA×3",
-        "check_005": "CTA構造",
-        "check_006": "H2×5",
-        "check_007": "FAQ 5問",
-        "check_008": "2500文字↑",
-        "check_009": "禁止語なし",
-        "check_010": "費用テーブル",
-        "check_011": "md構文",
-        "check_012": "です・ます",
-        "check_013": "地域名出現",
-        "check_014": "画像存在",
-    }
-
     print(f"\n{'='*60}")
     print(f"  {site} ({total} articles)  —  Overall: {report['overall']['pass_rate']}")
     print(f"{'='*60}")
@@ -518,23 +1141,451 @@ def print_summary(report: dict):
 
     for cid in sorted(results.keys()):
         r = results[cid]
-        name = check_names.get(cid, cid)
+        name = CHECKS[cid]["name"] if cid in CHECKS else cid
         marker = " !!" if r["fail"] > 0 and r["pass"] / max(r["pass"] + r["fail"], 1) < 0.5 else ""
         print(f"  {name:<20} {r['pass']:>6} {r['fail']:>6} {r['pass_rate']:>6}{marker}")
 
+    images = report.get("images")
+    if images and images["orphaned"]:
+        print(f"  {'-'*40}")
+        print(f"  orphaned images: {images['orphaned']}/{images['total_images']}"
+              f" ({images['orphaned_bytes'] / 1024 / 1024:.1f} MB)")
+
+    if "profile" in report:
+        print_profile(report["profile"])
+
+    print()
+
+
+def print_profile(profile: dict):
+    """Print per-check timing, slowest first."""
+    print(f"\n  {'Profile':<28} {'Calls':>8} {'Total ms':>10} {'Avg us':>9}")
+    print(f"  {'-'*58}")
+    for key, p in profile.items():
+        name = f"{key} {CHECKS[key]['name']}" if key in CHECKS else key
+        print(f"  {name:<28} {p['calls']:>8} {p['total_ms']:>10.1f} {p['avg_us']:>9.1f}")
+
+
+def emit_reports(pending_sites: list, output_format: str, report_dir: str) -> list[dict]:
+    """Finish scheduled sites in order, printing summaries and writing YAML/JSONL reports."""
+    all_reports = []
+
+    for pending in pending_sites:
+        if pending is None:
+            continue
+        site = pending["site"]
+
+        if output_format == "jsonl":
+            jsonl_path = os.path.join(report_dir, f"qc_result_{site}.jsonl")
+            os.makedirs(report_dir, exist_ok=True)
+            # Line-buffered so consumers can start reading while the site runs
+            with open(jsonl_path, "w", encoding="utf-8", buffering=1) as stream:
+                report = finish_site(
+                    pending,
+                    lambda record: stream.write(json.dumps(record, ensure_ascii=False) + "\n"),
+                )
+            print(f"  -> {jsonl_path}", file=sys.stderr)
+        else:
+            report = finish_site(pending)
+        all_reports.append(report)
+
+        if output_format in ("summary", "both"):
+            print_summary(report)
+
+        if output_format in ("yaml", "both", "jsonl"):
+            outpath = write_yaml_report(report, report_dir)
+            print(f"  -> {outpath}", file=sys.stderr)
+
+    return all_reports
+
+
+def write_yaml_report(report: dict, report_dir: str) -> str:
+    outpath = os.path.join(report_dir, f"qc_result_{report['site']}.yaml")
+    os.makedirs(report_dir, exist_ok=True)
+    with open(outpath, "w", encoding="utf-8") as f:
+        yaml.dump(report, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    return outpath
+
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_at TEXT NOT NULL,
+    site TEXT NOT NULL,
+    total_articles INTEGER NOT NULL,
+    total_pass INTEGER NOT NULL,
+    total_fail INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_site_run_at ON runs (site, run_at);
+CREATE TABLE IF NOT EXISTS check_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    check_id TEXT NOT NULL,
+    pass INTEGER NOT NULL,
+    fail INTEGER NOT NULL,
+    PRIMARY KEY (run_id, check_id)
+) WITHOUT ROWID;
+"""
+
+
+def open_history(path: str) -> sqlite3.Connection:
+    """Open (creating if needed) the append-only QC history database."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(HISTORY_SCHEMA)
+    return conn
+
+
+def record_history(path: str, reports: list[dict], run_at: str | None = None) -> None:
+    """Append one row per site and one per (site, check) for this invocation.
+
+    All sites of one invocation share run_at so "trend all" can sum them.
+    """
+    if not reports:
+        return
+    run_at = run_at or datetime.now().isoformat()
+    conn = open_history(path)
+    try:
+        with conn:
+            for report in reports:
+                cur = conn.execute(
+                    "INSERT INTO runs (run_at, site, total_articles, total_pass, total_fail)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (run_at, report["site"], report["total_articles"],
+                     report["overall"]["total_pass"], report["overall"]["total_fail"]),
+                )
+                conn.executemany(
+                    "INSERT INTO check_stats (run_id, check_id, pass, fail) VALUES (?, ?, ?, ?)",
+                    [(cur.lastrowid, cid, v["pass"], v["fail"]) for cid, v in report["results"].items()],
+                )
+    finally:
+        conn.close()
+
+
+def query_trend(path: str, site: str, check_id: str | None = None, days: float = 30) -> list[dict]:
+    """Pass/fail counts per run for a site ("all" = summed across sites), oldest first.
+
+    Without check_id the site's overall totals are returned.
+    """
+    if not os.path.exists(path):
+        return []
+    since = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+    if check_id is None:
+        sql = ("SELECT r.run_at, COUNT(*), SUM(r.total_articles), SUM(r.total_pass), SUM(r.total_fail)"
+               " FROM runs r WHERE r.run_at >= ?")
+    else:
+        sql = ("SELECT r.run_at, COUNT(*), SUM(r.total_articles), SUM(c.pass), SUM(c.fail)"
+               " FROM runs r JOIN check_stats c ON c.run_id = r.id"
+               " WHERE r.run_at >= ? AND c.check_id = ?")
+    params = [since] if check_id is None else [since, check_id]
+    if site != "all":
+        sql += " AND r.site = ?"
+        params.append(site)
+    sql += " GROUP BY r.run_at ORDER BY r.run_at"
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    trend = []
+    for run_at, sites, articles, passed, failed in rows:
+        total = passed + failed
+        trend.append({
+            "run_at": run_at,
+            "sites": sites,
+            "total_articles": articles,
+            "pass": passed,
+            "fail": failed,
+            "pass_rate": round(passed / total * 100, 1) if total > 0 else None,
+        })
+    return trend
+
+
+def print_trend(site: str, check_id: str | None, days: float, trend: list[dict]) -> None:
+    label = check_id or "overall"
+    if check_id in CHECKS:
+        label += f" ({CHECKS[check_id]['name']})"
+    print(f"\n{'='*60}")
+    print(f"  QC trend: {site} / {label} / last {days:g} days")
+    print(f"{'='*60}")
+    if not trend:
+        print("  No history")
+        print()
+        return
+    print(f"  {'run_at':<20} {'articles':>8} {'pass':>6} {'fail':>6} {'rate':>7}")
+    for row in trend:
+        rate = f"{row['pass_rate']:.1f}%" if row["pass_rate"] is not None else "N/A"
+        print(f"  {row['run_at'][:19]:<20} {row['total_articles']:>8} {row['pass']:>6} {row['fail']:>6} {rate:>7}")
+    first, last = trend[0]["pass_rate"], trend[-1]["pass_rate"]
+    if len(trend) > 1 and first is not None and last is not None:
+        print(f"\n  Change: {first:.1f}% -> {last:.1f}% ({last - first:+.1f} pt over {len(trend)} runs)")
     print()
 
 
+def default_history_path() -> str:
+    return str(Path(__file__).resolve().parent.parent / "queue" / ".seo_qc_history.db")
+
+
+def trend_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="seo_qc.py trend", description="SEO QC pass-rate history")
+    parser.add_argument("site", help="Site name (e.g., gaichuu) or 'all' to sum across sites")
+    parser.add_argument("--check", default=None, help="Check ID (e.g., check_008); default: overall")
+    parser.add_argument("--days", type=float, default=30, help="How far back to look (default: 30)")
+    parser.add_argument("--format", choices=["table", "json"], default="table", help="Output format")
+    parser.add_argument("--history", default=None,
+                        help="History database (default: queue/.seo_qc_history.db)")
+    args = parser.parse_args(argv)
+
+    trend = query_trend(args.history or default_history_path(), args.site, args.check, args.days)
+    if args.format == "json":
+        print(json.dumps({"site": args.site, "check": args.check, "days": args.days, "runs": trend},
+                         ensure_ascii=False, indent=2))
+    else:
+        print_trend(args.site, args.check, args.days, trend)
+
+
+def article_sort_key(filename: str) -> tuple[bool, str]:
+    """Order used by find_articles: all .md files, then all .mdx files."""
+    return filename.endswith(".mdx"), filename
+
+
+class LiveSummary:
+    """Per-check totals that can be updated one article at a time (watch mode)."""
+
+    def __init__(self, check_ids: list[str]):
+        self.check_ids = check_ids
+        self.results: dict[str, dict] = {}
+        self.pass_counts = {cid: 0 for cid in check_ids}
+        self.fail_files = {cid: set() for cid in check_ids}
+
+    def discard(self, filename: str) -> None:
+        old = self.results.pop(filename, None)
+        if old is None:
+            return
+        for cid in self.check_ids:
+            if cid in old:
+                if old[cid]["pass"]:
+                    self.pass_counts[cid] -= 1
+                else:
+                    self.fail_files[cid].discard(filename)
+
+    def update(self, filename: str, results: dict) -> None:
+        self.discard(filename)
+        self.results[filename] = results
+        for cid in self.check_ids:
+            if cid in results:
+                if results[cid]["pass"]:
+                    self.pass_counts[cid] += 1
+                else:
+                    self.fail_files[cid].add(filename)
+
+    def summary(self) -> dict:
+        """Same shape and fail_files ordering as finalize_summary after a full run."""
+        totals = {}
+        for cid in self.check_ids:
+            failed = self.fail_files[cid]
+            totals[cid] = {
+                "pass": self.pass_counts[cid],
+                "fail": len(failed),
+                "fail_files": heapq.nsmallest(FAIL_FILES_LIMIT, failed, key=article_sort_key),
+                "fail_files_total": len(failed),
+            }
+        return finalize_summary(totals)
+
+
+def _poll_batches(dirs: list[str], interval: float):
+    """Yield sets of changed paths by diffing (mtime, size) snapshots.
+
+    A batch is yielded once a poll sees no further change, which doubles as
+    the debounce.
+    """
+    def snapshot():
+        entries = {}
+        for d in dirs:
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        entries[e.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        return entries
+
+    previous = snapshot()
+    pending = set()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        changed = {p for p in previous.keys() | current.keys() if previous.get(p) != current.get(p)}
+        previous = current
+        if changed:
+            pending |= changed
+        elif pending:
+            yield pending
+            pending = set()
+
+
+def _inotify_batches(dirs: list[str], debounce: float):
+    """Yield sets of changed paths from `inotifywait -m`, grouped by debounce.
+
+    Returns when inotifywait exits (e.g. watch limit reached).
+    """
+    proc = subprocess.Popen(
+        ["inotifywait", "-m", "-q", "--format", "%w%f",
+         "-e", "close_write", "-e", "moved_to", "-e", "moved_from", "-e", "delete", *dirs],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    fd = proc.stdout.fileno()
+    buf = b""
+    pending = set()
+    try:
+        while True:
+            # Read the raw fd so select() never misses lines sitting in a Python buffer
+            ready, _, _ = select.select([fd], [], [], debounce if pending else None)
+            if not ready:
+                yield pending
+                pending = set()
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            pending.update(line.decode("utf-8", "replace") for line in lines if line)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def watch_changes(dirs: list[str], debounce: float, poll_interval: float):
+    """Yield debounced batches of changed paths under dirs, forever."""
+    dirs = [d for d in dirs if os.path.isdir(d)]
+    if shutil.which("inotifywait"):
+        yield from _inotify_batches(dirs, debounce)
+        print("WARNING: inotifywait exited; falling back to polling", file=sys.stderr)
+    yield from _poll_batches(dirs, poll_interval)
+
+
+def watch_site(site: str, base_dir: str, report_dir: str, executor: Executor | None = None,
+               jobs: int = 1, cache_dir: str | None = None, debounce: float = 1.0,
+               poll_interval: float = 2.0) -> None:
+    """Full run, then re-check only touched articles and rewrite the YAML report."""
+    pending = start_site(site, base_dir, executor, jobs, cache_dir)
+    if pending is None:
+        return
+
+    site_dir = os.path.join(base_dir, site)
+    area_dir = os.path.join(site_dir, "src", "content", "area")
+    live = LiveSummary(checks_for_site(site))
+
+    def collect(record):
+        live.update(record["file"], record.get("results") or {"error": record["error"]})
+
+    report = finish_site(pending, collect)
+    outpath = write_yaml_report(report, report_dir)
+    print(f"[watch] {site}: {report['overall']['pass_rate']} -> {outpath}", file=sys.stderr)
+
+    for batch in watch_changes([area_dir, images_dir(site_dir)], debounce, poll_interval):
+        articles = sorted(
+            p for p in batch
+            if os.path.dirname(p) == area_dir
+            and p.endswith((".md", ".mdx"))
+            and not os.path.basename(p).startswith(".")
+        )
+        images_touched = any(os.path.dirname(p) == images_dir(site_dir) for p in batch)
+        if not articles and not images_touched:
+            continue
+
+        images = image_index(site_dir, refresh=images_touched)
+        if images_touched:
+            image_checks = [cid for cid in checks_for_site(site) if "images" in CHECKS[cid]["args"]]
+            for filename, results in list(live.results.items()):
+                if "error" in results:
+                    continue
+                updated = rerun_checks(os.path.join(area_dir, filename), site_dir, results, image_checks, images)
+                if updated is None:
+                    articles.append(os.path.join(area_dir, filename))
+                elif updated != results:
+                    live.update(filename, updated)
+            articles = sorted(set(articles))
+
+        for path in articles:
+            filename = Path(path).name
+            if not os.path.isfile(path):
+                live.discard(filename)
+                continue
+            _, results, error, _ = check_article(path, site_dir)
+            if error is not None:
+                print(f"  ERROR: {filename}: {error}", file=sys.stderr)
+            live.update(filename, results)
+
+        slugs = {Path(f).stem for f in live.results}
+        report = build_report(site, len(live.results), live.summary(),
+                              find_orphaned_images(site_dir, images, slugs))
+        write_yaml_report(report, report_dir)
+        print(f"[watch] {site}: {len(articles)} re-checked"
+              f"{' (images changed)' if images_touched else ''}, overall {report['overall']['pass_rate']}",
+              file=sys.stderr)
+
+
 def main():
+    if sys.argv[1:2] == ["trend"]:
+        trend_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="SEO Article Quality Check")
     parser.add_argument("site", help="Site name (e.g., gaichuu) or 'all' for all sites")
     parser.add_argument("--base-dir", default=DEFAULT_BASE_DIR, help="Base directory for sites")
-    parser.add_argument("--output", choices=["yaml", "summary", "both"], default="both",
-                        help="Output format")
+    parser.add_argument("--output", choices=["yaml", "summary", "both", "jsonl"], default="both",
+                        help="Output format (jsonl: per-article JSONL stream + YAML summary)")
     parser.add_argument("--report-dir", default=None,
                         help="Directory to write YAML reports (default: queue/reports/)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for article checks (1 = serial, 0 = all CPU cores)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for per-site result caches (default: queue/.seo_qc_cache/)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-check every article and do not read or write the result cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-check wall time and call counts (use with --no-cache for a full picture)")
+    parser.add_argument("--plugin", action="append", default=[], metavar="PATH",
+                        help="Python file registering extra checks via @register_check (repeatable)")
+    parser.add_argument("--no-fast-frontmatter", action="store_true",
+                        help="Always parse frontmatter with full YAML instead of the fast line parser")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-check articles as they change (single site only)")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                        help="Watch mode: seconds of quiet before the report is rewritten")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Watch mode: polling interval when inotifywait is unavailable")
+    parser.add_argument("--history", default=None,
+                        help="Pass-rate history database (default: queue/.seo_qc_history.db)")
+    parser.add_argument("--forbidden-words", default=None, metavar="PATH",
+                        help="YAML of extra forbidden words (default: config/seo_qc_forbidden_words.yaml if present)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Do not append this run to the history database")
     args = parser.parse_args()
 
+    if args.watch and args.site == "all":
+        parser.error("--watch takes a single site")
+
+    forbidden_path = args.forbidden_words
+    if forbidden_path is None:
+        default_path = Path(__file__).resolve().parent.parent / "config" / "seo_qc_forbidden_words.yaml"
+        forbidden_path = str(default_path) if default_path.exists() else None
+    forbidden_config = None
+    if forbidden_path is not None:
+        try:
+            forbidden_config = load_forbidden_config(forbidden_path)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            parser.error(f"--forbidden-words: {e}")
+
+    init_worker(args.plugin, not args.no_fast_frontmatter, forbidden_config)
+
     sites = ALL_SITES if args.site == "all" else [args.site]
 
     report_dir = args.report_dir
@@ -543,23 +1594,39 @@ def main():
         script_dir = Path(__file__).resolve().parent.parent
         report_dir = str(script_dir / "queue" / "reports")
 
-    all_reports = []
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or str(Path(__file__).resolve().parent.parent / "queue" / ".seo_qc_cache")
 
-    for site in sites:
-        report = run_site(site, args.base_dir, args.output)
-        if not report:
-            continue
-        all_reports.append(report)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                       initargs=(args.plugin, not args.no_fast_frontmatter, forbidden_config))
 
-        if args.output in ("summary", "both"):
-            print_summary(report)
+    if args.watch:
+        try:
+            watch_site(args.site, args.base_dir, report_dir, executor, jobs, cache_dir,
+                       args.debounce, args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return
 
-        if args.output in ("yaml", "both"):
-            outpath = os.path.join(report_dir, f"qc_result_{site}.yaml")
-            os.makedirs(report_dir, exist_ok=True)
-            with open(outpath, "w", encoding="utf-8") as f:
-                yaml.dump(report, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-            print(f"  -> {outpath}", file=sys.stderr)
+    try:
+        # Schedule every site up front so the pool stays busy across site
+        # boundaries; results are still consumed site by site, in order.
+        pending_sites = [start_site(site, args.base_dir, executor, jobs, cache_dir, args.profile)
+                         for site in sites]
+        all_reports = emit_reports(pending_sites, args.output, report_dir)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if not args.no_history:
+        record_history(args.history or default_history_path(), all_reports)
 
     # Print grand total if multiple sites
     if len(all_reports) > 1 and args.output in ("summary", "both"):
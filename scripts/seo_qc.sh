@@ -1,10 +1,12 @@
 #!/usr/bin/env bash
 # ═══════════════════════════════════════════════════════════════
 # SEO Article QC Skill - Wrapper Script
-# Usage: bash scripts/seo_qc.sh <site|all> [summary|yaml|both]
+# Usage: bash scripts/seo_qc.sh <site|all> [summary|yaml|both|jsonl] [jobs]
+#   jobs: worker processes (default 1 = serial, 0 = all CPU cores)
 # ═══════════════════════════════════════════════════════════════
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-SITE="${1:?Usage: seo_qc.sh <site|all> [summary|yaml|both]}"
+SITE="${1:?Usage: seo_qc.sh <site|all> [summary|yaml|both|jsonl] [jobs]}"
 OUTPUT="${2:-both}"
+JOBS="${3:-1}"
 
-python3 "$SCRIPT_DIR/seo_qc.py" "$SITE" --output "$OUTPUT" --report-dir "$SCRIPT_DIR/../queue/reports/"
+python3 "$SCRIPT_DIR/seo_qc.py" "$SITE" --output "$OUTPUT" --jobs "$JOBS" --report-dir "$SCRIPT_DIR/../queue/reports/"
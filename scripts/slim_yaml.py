@@ -4,27 +4,53 @@ YAML Slimming Utility
 
 Removes completed/archived items from YAML queue files to maintain performance.
 - For Karo: Archives completed task/report files and finished command queue entries.
+  Archived items are appended to the compressed, date-partitioned archive store
+  (queue/archive/store, see archive_store.py) instead of one YAML file per item.
+  shogun_to_karo.yaml is parsed once into a queue snapshot shared by every karo phase,
+  and reports are only parsed once their mtime shows they are old enough to archive.
+  Finished commands (done/completed/cancelled) are archived by command_archiver.py,
+  the same archiver yaml_archive_done.py runs.
 - For all agents: Archives read: true messages from inbox files.
+  inbox_write.sh also calls compact_inbox() on every write, so an inbox stays
+  bounded without waiting for a slim run: past INBOX_COMPACT_MAX_MESSAGES it is
+  trimmed to its unread messages plus the newest INBOX_KEEP_READ read ones, past
+  INBOX_COMPACT_MAX_BYTES to its unread messages.
+
+Every run holds queue/.slim_yaml.lock (command_archiver.queue_lock, an fcntl
+flock), the lock command_archiver.py and yaml_archive_done.py take, so the slim
+passes and the archiver never rewrite the queue at the same time.
 """
 
 import os
 import sys
 import time
-from datetime import datetime
 from pathlib import Path
 
 import yaml
 
+import archive_store
+import command_archiver
+from atomic_write import dump_yaml_atomic
+
 CANONICAL_TASKS = {f'ashigaru{i}' for i in range(1, 9)} | {'gunshi'}
 CANONICAL_REPORTS = {f'ashigaru{i}_report' for i in range(1, 9)} | {'gunshi_report'}
 IDLE_STUB = {'task': {'status': 'idle'}}
+REPORT_RETENTION_SECONDS = 86400
+
+# Write-path inbox compaction (compact_inbox): thresholds and read messages kept
+INBOX_COMPACT_MAX_MESSAGES = 50
+INBOX_COMPACT_MAX_BYTES = 64 * 1024
+INBOX_KEEP_READ = 30
+
+# libyaml bindings when available (same documents, much faster parsing)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 def load_yaml(filepath):
     """Safely load YAML file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+            return yaml.load(f, Loader=YAML_LOADER) or {}
     except FileNotFoundError:
         return {}
     except yaml.YAMLError as e:
@@ -33,33 +59,31 @@ def load_yaml(filepath):
 
 
 def save_yaml(filepath, data):
-    """Safely save YAML file."""
+    """Safely save YAML file (atomically: readers never see a partial dump)."""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+        dump_yaml_atomic(filepath, data, allow_unicode=True, sort_keys=False, default_flow_style=False)
         return True
     except Exception as e:
         print(f"Error writing {filepath}: {e}", file=sys.stderr)
         return False
 
 
-def get_timestamp():
-    """Generate archive filename timestamp."""
-    return datetime.now().strftime('%Y%m%d%H%M%S')
-
-
 def get_queue_dir():
     return Path(__file__).resolve().parent.parent / 'queue'
 
 
-def get_active_cmd_ids():
-    """Return command IDs in shogun_to_karo that are not done."""
-    queue_dir = get_queue_dir()
-    shogun_file = queue_dir / 'shogun_to_karo.yaml'
-    data = load_yaml(shogun_file)
+def load_queue_snapshot():
+    """Parse shogun_to_karo.yaml once for a karo pass (see command_archiver.load_queue_snapshot)."""
+    return command_archiver.load_queue_snapshot(get_queue_dir() / 'shogun_to_karo.yaml')
+
 
-    key = 'commands' if 'commands' in data else 'queue'
-    commands = data.get(key, []) if isinstance(data, dict) else []
+def get_active_cmd_ids(snapshot=None):
+    """Return command IDs in shogun_to_karo that are not finished (done/completed/cancelled)."""
+    if snapshot is None:
+        snapshot = load_queue_snapshot()
+    data = snapshot['data']
+
+    commands = data.get(snapshot['key'], []) if isinstance(data, dict) else []
     if not isinstance(commands, list):
         return set()
 
@@ -69,41 +93,44 @@ def get_active_cmd_ids():
             continue
         if cmd.get('id') is None:
             continue
-        if cmd.get('status') == 'done':
+        if command_archiver.is_finished(cmd):
             continue
         active.add(cmd.get('id'))
     return active
 
 
-def ensure_parent_dir(path):
-    path.parent.mkdir(parents=True, exist_ok=True)
-
+def archive_records(records):
+    """Append records to the archive store. Returns the segment path, or None on failure."""
+    try:
+        return archive_store.append_records(records, archive_store.get_store_dir(get_queue_dir()))
+    except OSError as e:
+        print(f"Error writing archive store: {e}", file=sys.stderr)
+        return None
 
-def archive_taskspec(filepath, archive_path, data, dry_run=False):
-    if dry_run:
-        print(f"[DRY-RUN] would archive: {filepath}")
-        print(f"[DRY-RUN] would write: {archive_path}")
-        return True
 
-    ensure_parent_dir(archive_path)
-    if not save_yaml(archive_path, data):
-        return False
-
-    if filepath.name in archive_path.name:
-        return True
-    return filepath.rename(archive_path)
+def task_record(filepath, data):
+    task = data.get('task') if isinstance(data.get('task'), dict) else {}
+    return archive_store.make_record(
+        'task', data,
+        record_id=task.get('task_id') or filepath.stem,
+        agent=task.get('assigned_to') or filepath.stem.split('_')[0],
+        cmd_id=task.get('parent_cmd') or task.get('cmd_id'),
+        project=task.get('project'),
+        source=f'tasks/{filepath.name}',
+    )
 
 
 def slim_tasks(dry_run=False):
     queue_dir = get_queue_dir()
     tasks_dir = queue_dir / 'tasks'
-    archive_dir = queue_dir / 'archive' / 'tasks'
 
     if not tasks_dir.exists():
         return True
 
-    timestamp = get_timestamp()
     done_statuses = {'done', 'completed', 'cancelled'}
+    records = []
+    stubs = []     # canonical files: reset to IDLE_STUB once archived
+    removed = []   # other files: deleted once archived
 
     for filepath in sorted(tasks_dir.glob('*.yaml')):
         data = load_yaml(filepath)
@@ -120,80 +147,147 @@ def slim_tasks(dry_run=False):
             if status not in done_statuses:
                 continue
 
-            archive_path = archive_dir / f'{stem}_{timestamp}.yaml'
-            if not archive_taskspec(filepath, archive_path, data, dry_run=dry_run):
-                return False
-
             if dry_run:
+                print(f"[DRY-RUN] would archive: {filepath}")
                 print(f"[DRY-RUN] would overwrite: {filepath} with {IDLE_STUB}")
                 continue
 
-            if not save_yaml(filepath, IDLE_STUB):
-                return False
+            records.append(task_record(filepath, data))
+            stubs.append(filepath)
             continue
 
         if status not in {'done', 'cancelled'}:
             continue
 
-        archive_path = archive_dir / filepath.name
-        if archive_path.exists():
-            archive_path = archive_dir / f'{filepath.stem}_{timestamp}{filepath.suffix}'
-
         if dry_run:
             print(f"[DRY-RUN] would archive: {filepath}")
-            print(f"[DRY-RUN] would move to: {archive_path}")
             continue
 
-        ensure_parent_dir(archive_path)
-        filepath.rename(archive_path)
+        records.append(task_record(filepath, data))
+        removed.append(filepath)
+
+    if not records:
+        return True
+    if archive_records(records) is None:
+        return False
+
+    for filepath in stubs:
+        if not save_yaml(filepath, IDLE_STUB):
+            return False
+    for filepath in removed:
+        filepath.unlink(missing_ok=True)
 
     return True
 
 
-def slim_reports(dry_run=False):
+def slim_reports(dry_run=False, snapshot=None):
     queue_dir = get_queue_dir()
     reports_dir = queue_dir / 'reports'
-    archive_dir = queue_dir / 'archive' / 'reports'
 
     if not reports_dir.exists():
         return True
 
-    active_cmd_ids = get_active_cmd_ids()
-    timestamp = get_timestamp()
+    active_cmd_ids = get_active_cmd_ids(snapshot)
+    cutoff = time.time() - REPORT_RETENTION_SECONDS
+    records = []
+    removed = []
 
     for filepath in sorted(reports_dir.glob('*.yaml')):
         if filepath.stem in CANONICAL_REPORTS:
             continue
 
-        data = load_yaml(filepath)
-        parent_cmd = data.get('parent_cmd') if isinstance(data, dict) else None
-        is_active = parent_cmd in active_cmd_ids
-        is_stale = (time.time() - filepath.stat().st_mtime) >= 86400
-
-        if not is_stale:
-            continue
-        if is_active:
+        # Recent reports are kept whatever their parent_cmd, so only stat them
+        try:
+            if filepath.stat().st_mtime > cutoff:
+                continue
+        except FileNotFoundError:
             continue
 
-        archive_path = archive_dir / filepath.name
-        if archive_path.exists():
-            archive_path = archive_dir / f'{filepath.stem}_{timestamp}{filepath.suffix}'
+        # parent_cmd only matters while some command is still active
+        data = None
+        if active_cmd_ids:
+            data = load_yaml(filepath)
+            parent_cmd = data.get('parent_cmd') if isinstance(data, dict) else None
+            if parent_cmd in active_cmd_ids:
+                continue
 
         if dry_run:
             print(f"[DRY-RUN] would archive: {filepath}")
-            print(f"[DRY-RUN] would move to: {archive_path}")
             continue
 
-        ensure_parent_dir(archive_path)
-        filepath.rename(archive_path)
+        if data is None:
+            data = load_yaml(filepath)
+        fields = data if isinstance(data, dict) else {}
+        records.append(archive_store.make_record(
+            'report', data,
+            record_id=filepath.stem,
+            agent=fields.get('worker_id') or filepath.stem.split('_')[0],
+            cmd_id=fields.get('parent_cmd'),
+            source=f'reports/{filepath.name}',
+        ))
+        removed.append(filepath)
+
+    if not records:
+        return True
+    if archive_records(records) is None:
+        return False
+    for filepath in removed:
+        filepath.unlink(missing_ok=True)
 
     return True
 
 
+def split_inbox_messages(messages, keep_read=0):
+    """Split messages into (kept, archived): unread and the newest keep_read read messages stay."""
+    read_positions = [i for i, msg in enumerate(messages) if msg.get('read', False)]
+    archive_positions = set(read_positions[:max(len(read_positions) - keep_read, 0)])
+    kept = [msg for i, msg in enumerate(messages) if i not in archive_positions]
+    archived = [msg for i, msg in enumerate(messages) if i in archive_positions]
+    return kept, archived
+
+
+def archive_inbox_messages(agent_id, inbox_file, messages):
+    """Append inbox messages to the archive store; returns the segment path (None on failure)."""
+    return archive_records([
+        archive_store.make_record('inbox', msg, record_id=msg.get('id'), agent=agent_id,
+                                  source=f'inbox/{Path(inbox_file).name}')
+        for msg in messages
+    ])
+
+
+def compact_inbox(agent_id, inbox_file, data, size_bytes=None,
+                  max_messages=INBOX_COMPACT_MAX_MESSAGES, max_bytes=INBOX_COMPACT_MAX_BYTES,
+                  keep_read=INBOX_KEEP_READ):
+    """Write-path compaction for an inbox the caller holds locked and is about to save.
+
+    Once the inbox has more than max_messages messages, read messages beyond the
+    newest keep_read are moved to the archive store and dropped from
+    data['messages']. Once its file (size_bytes, default: its current size)
+    exceeds max_bytes, every read message is moved. Unread messages are never
+    touched. If the archive append fails nothing is dropped. Returns the number
+    of messages archived.
+    """
+    messages = data.get('messages') or []
+    if size_bytes is None:
+        try:
+            size_bytes = os.path.getsize(inbox_file)
+        except OSError:
+            size_bytes = 0
+    if size_bytes > max_bytes:
+        keep_read = 0
+    elif len(messages) <= max_messages:
+        return 0
+
+    kept, archived = split_inbox_messages(messages, keep_read)
+    if not archived or archive_inbox_messages(agent_id, inbox_file, archived) is None:
+        return 0
+    data['messages'] = kept
+    return len(archived)
+
+
 def slim_inbox(agent_id, dry_run=False):
     """Archive read: true messages from inbox file."""
     queue_dir = get_queue_dir()
-    archive_dir = queue_dir / 'archive'
     inbox_file = queue_dir / 'inbox' / f'{agent_id}.yaml'
 
     if not inbox_file.exists():
@@ -209,32 +303,19 @@ def slim_inbox(agent_id, dry_run=False):
         print("Error: messages is not a list", file=sys.stderr)
         return False
 
-    # Separate unread and archived messages
-    unread = []
-    archived = []
-
-    for msg in messages:
-        is_read = msg.get('read', False)
-        if is_read:
-            archived.append(msg)
-        else:
-            unread.append(msg)
+    unread, archived = split_inbox_messages(messages)
 
     # If nothing to archive, return success without writing
     if not archived:
         return True
 
-    archive_timestamp = get_timestamp()
-    archive_file = archive_dir / f'inbox_{agent_id}_{archive_timestamp}.yaml'
-
     if dry_run:
-        print(f"[DRY-RUN] would archive: {inbox_file}")
-        print(f"[DRY-RUN] would move to: {archive_file}")
+        print(f"[DRY-RUN] would archive: {len(archived)} messages from {inbox_file}")
         return True
 
-    # Write archived messages to timestamped file
-    archive_data = {'messages': archived}
-    if not save_yaml(archive_file, archive_data):
+    # Append archived messages to the archive store
+    segment = archive_inbox_messages(agent_id, inbox_file, archived)
+    if segment is None:
         return False
 
     # Update main file with unread messages only
@@ -244,62 +325,23 @@ def slim_inbox(agent_id, dry_run=False):
         return False
 
     if archived:
-        print(f"Archived {len(archived)} messages from {agent_id} to {archive_file.name}", file=sys.stderr)
+        print(f"Archived {len(archived)} messages from {agent_id} to {segment.name}", file=sys.stderr)
     return True
 
 
-def slim_shugun_to_karo():
-    """Archive done/cancelled commands from shogun_to_karo.yaml."""
-    queue_dir = get_queue_dir()
-    archive_dir = queue_dir / 'archive'
-    shogun_file = queue_dir / 'shogun_to_karo.yaml'
-
-    if not shogun_file.exists():
-        print(f"Warning: {shogun_file} not found", file=sys.stderr)
-        return True
-
-    data = load_yaml(shogun_file)
-    # Support both 'commands' and 'queue' keys for backwards compatibility
-    key = 'commands' if isinstance(data, dict) and 'commands' in data else 'queue'
-    if not data or key not in data:
-        return True
-
-    queue = data.get(key, [])
-    if not isinstance(queue, list):
-        print("Error: queue is not a list", file=sys.stderr)
-        return False
-
-    # Separate active and archived commands
-    active = []
-    archived = []
-
-    for cmd in queue:
-        status = cmd.get('status', 'unknown')
-        if status in ['done', 'cancelled']:
-            archived.append(cmd)
-        else:
-            active.append(cmd)
-
-    # If nothing to archive, return success without writing
-    if not archived:
+def slim_shugun_to_karo(snapshot=None, dry_run=False):
+    """Archive finished commands from shogun_to_karo.yaml (one command_archiver pass)."""
+    if snapshot is None:
+        snapshot = load_queue_snapshot()
+    if not snapshot['exists']:
+        print(f"Warning: {snapshot['path']} not found", file=sys.stderr)
         return True
 
-    # Write archived commands to timestamped file
-    archive_timestamp = get_timestamp()
-    archive_file = archive_dir / f'shogun_to_karo_{archive_timestamp}.yaml'
-
-    archive_data = {key: archived}
-    if not save_yaml(archive_file, archive_data):
-        return False
-
-    # Update main file with active commands only
-    data[key] = active
-    if not save_yaml(shogun_file, data):
-        print(f"Error: Failed to update {shogun_file}, but archive was created", file=sys.stderr)
-        return False
-
-    print(f"Archived {len(archived)} commands to {archive_file.name}", file=sys.stderr)
-    return True
+    report = command_archiver.archive_commands(snapshot, dry_run=dry_run)
+    if report['archived']:
+        for line in command_archiver.format_report(report):
+            print(line, file=sys.stderr)
+    return report['ok']
 
 
 def slim_all_inboxes(dry_run=False):
@@ -358,6 +400,26 @@ def parse_arguments():
     return args[0], dry_run
 
 
+def slim(agent_id, dry_run=False):
+    """One slim run for agent_id. The caller holds queue/.slim_yaml.lock."""
+    # Process shogun_to_karo if this is Karo
+    if agent_id == 'karo':
+        # One parse of shogun_to_karo.yaml for every karo phase
+        snapshot = load_queue_snapshot()
+        if not slim_shugun_to_karo(snapshot, dry_run):
+            return False
+        migration(dry_run)
+        if not slim_tasks(dry_run):
+            return False
+        if not slim_reports(dry_run, snapshot):
+            return False
+        if not slim_all_inboxes(dry_run):
+            return False
+
+    # Process inbox for all agents
+    return slim_inbox(agent_id, dry_run)
+
+
 def main():
     """Main entry point."""
     agent_id, dry_run = parse_arguments()
@@ -366,23 +428,15 @@ def main():
     archive_dir = get_queue_dir() / 'archive'
     archive_dir.mkdir(parents=True, exist_ok=True)
 
-    # Process shogun_to_karo if this is Karo
-    if agent_id == 'karo':
-        if not slim_shugun_to_karo():
-            sys.exit(1)
-        migration(dry_run)
-        if not slim_tasks(dry_run):
-            sys.exit(1)
-        if not slim_reports(dry_run):
-            sys.exit(1)
-        if not slim_all_inboxes(dry_run):
-            sys.exit(1)
-
-    # Process inbox for all agents
-    if not slim_inbox(agent_id, dry_run):
+    # The same flock command_archiver.py / yaml_archive_done.py take, on every platform
+    try:
+        with command_archiver.queue_lock(get_queue_dir()):
+            ok = slim(agent_id, dry_run)
+    except TimeoutError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    sys.exit(0)
+    sys.exit(0 if ok else 1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,104 @@
+#!/usr/bin/env bats
+# ═══════════════════════════════════════════════════════════════
+# E2E-012: archive store for slimmed queue data
+# ═══════════════════════════════════════════════════════════════
+# Verifies slim_yaml.py appends archived commands, tasks, reports and
+# inbox messages to per-day compressed segments instead of one YAML
+# file per item, and archive_store.py fetches them by id/agent/cmd/date.
+# ═══════════════════════════════════════════════════════════════
+
+# bats file_tags=e2e
+
+load "../test_helper/bats-support/load"
+load "../test_helper/bats-assert/load"
+
+setup_file() {
+    PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export PROJECT_ROOT
+    [ -f "$PROJECT_ROOT/scripts/archive_store.py" ] || skip "archive_store.py not found at $PROJECT_ROOT"
+    command -v python3 &>/dev/null || skip "python3 not available"
+}
+
+setup() {
+    ROOT="$(mktemp -d "/tmp/e2e_archive_store_XXXXXX")"
+    mkdir -p "$ROOT/scripts" "$ROOT/queue"/{inbox,tasks,reports,archive}
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$ROOT/scripts/"
+    STORE="$ROOT/queue/archive/store"
+    TODAY="$(date +%Y-%m-%d)"
+
+    printf 'commands:\n  - id: cmd_done\n    project: pj_a\n    status: done\n  - id: cmd_live\n    status: pending\n' \
+        > "$ROOT/queue/shogun_to_karo.yaml"
+    printf 'task:\n  task_id: subtask_1\n  parent_cmd: cmd_done\n  project: pj_a\n  assigned_to: ashigaru1\n  status: done\n' \
+        > "$ROOT/queue/tasks/ashigaru1.yaml"
+    printf 'worker_id: ashigaru2\nparent_cmd: cmd_done\nstatus: done\n' > "$ROOT/queue/reports/ashigaru2_cmd_done_report.yaml"
+    touch -d "2 days ago" "$ROOT/queue/reports/ashigaru2_cmd_done_report.yaml"
+    printf 'messages:\n  - id: msg_1\n    from: karo\n    read: true\n  - id: msg_2\n    from: karo\n    read: false\n' \
+        > "$ROOT/queue/inbox/ashigaru3.yaml"
+}
+
+teardown() {
+    rm -rf "$ROOT"
+}
+
+query() {
+    python3 "$ROOT/scripts/archive_store.py" query "$@" \
+        | python3 -c 'import json, sys; [print(r["kind"], r["id"], r["agent"], r["cmd_id"], r["project"]) for r in map(json.loads, sys.stdin)]'
+}
+
+@test "E2E-012-A: a karo pass archives every kind into one day segment" {
+    run python3 "$ROOT/scripts/slim_yaml.py" karo
+    assert_success
+
+    # Queue files are slimmed as before
+    ! grep -q cmd_done "$ROOT/queue/shogun_to_karo.yaml"
+    grep -q "status: idle" "$ROOT/queue/tasks/ashigaru1.yaml"
+    [ ! -f "$ROOT/queue/reports/ashigaru2_cmd_done_report.yaml" ]
+    grep -q msg_2 "$ROOT/queue/inbox/ashigaru3.yaml"
+    ! grep -q msg_1 "$ROOT/queue/inbox/ashigaru3.yaml"
+
+    # ...but nothing is written as one-file-per-item
+    [ -z "$(find "$ROOT/queue/archive" -name '*.yaml')" ]
+    [ "$(ls "$STORE")" = "$(printf '%s\n%s' "$TODAY.index.jsonl" "$TODAY.jsonl.gz")" ]
+
+    run query --date "$TODAY"
+    assert_success
+    assert_line "command cmd_done None cmd_done pj_a"
+    assert_line "task subtask_1 ashigaru1 cmd_done pj_a"
+    assert_line "report ashigaru2_cmd_done_report ashigaru2 cmd_done None"
+    assert_line "inbox msg_1 ashigaru3 None None"
+    [ "${#lines[@]}" -eq 4 ]
+}
+
+@test "E2E-012-B: records are fetched by id, agent and cmd with their original data" {
+    python3 "$ROOT/scripts/slim_yaml.py" karo
+
+    run query --id subtask_1
+    assert_output "task subtask_1 ashigaru1 cmd_done pj_a"
+    run query --agent ashigaru3 --kind inbox
+    assert_output "inbox msg_1 ashigaru3 None None"
+    run query --cmd cmd_done --kind report
+    assert_output "report ashigaru2_cmd_done_report ashigaru2 cmd_done None"
+
+    run python3 "$ROOT/scripts/archive_store.py" query --id cmd_done --format yaml
+    assert_success
+    assert_output --partial "project: pj_a"
+    assert_output --partial "status: done"
+
+    run python3 "$ROOT/scripts/archive_store.py" query --id cmd_missing
+    assert_failure
+}
+
+@test "E2E-012-C: a query only decompresses the members holding its records" {
+    python3 "$ROOT/scripts/slim_yaml.py" karo
+    printf 'messages:\n  - id: msg_3\n    from: gunshi\n    read: true\n' > "$ROOT/queue/inbox/ashigaru4.yaml"
+    python3 "$ROOT/scripts/slim_yaml.py" ashigaru4
+
+    # Corrupt the first member in place; the later member must still be readable
+    local first_len
+    first_len="$(python3 -c 'import json, sys; print(json.loads(open(sys.argv[1]).readline())["length"])' "$STORE/$TODAY.index.jsonl")"
+    printf 'XXXXXXXX' | dd of="$STORE/$TODAY.jsonl.gz" bs=1 seek=$((first_len / 2)) conv=notrunc 2>/dev/null
+
+    run query --id msg_3
+    assert_success
+    assert_output "inbox msg_3 ashigaru4 None None"
+}
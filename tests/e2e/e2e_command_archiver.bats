@@ -0,0 +1,184 @@
+#!/usr/bin/env bats
+# ═══════════════════════════════════════════════════════════════
+# E2E-013: unified command archiver for shogun_to_karo.yaml
+# ═══════════════════════════════════════════════════════════════
+# Verifies command_archiver.py is the one archiver behind both
+# `slim_yaml.py karo` and yaml_archive_done.py: same status set,
+# paths resolved from the script location, the slim_yaml lock,
+# configurable statuses/retention/batch size, --dry-run and a
+# throughput report.
+# ═══════════════════════════════════════════════════════════════
+
+# bats file_tags=e2e
+
+load "../test_helper/bats-support/load"
+load "../test_helper/bats-assert/load"
+
+setup_file() {
+    PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export PROJECT_ROOT
+    [ -f "$PROJECT_ROOT/scripts/command_archiver.py" ] || skip "command_archiver.py not found at $PROJECT_ROOT"
+    command -v python3 &>/dev/null || skip "python3 not available"
+}
+
+setup() {
+    ROOT="$(mktemp -d "/tmp/e2e_command_archiver_XXXXXX")"
+    mkdir -p "$ROOT/scripts/bakuhu" "$ROOT/queue"/{inbox,tasks,reports}
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" \
+        "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$ROOT/scripts/"
+    cp "$PROJECT_ROOT/scripts/bakuhu/yaml_archive_done.py" "$ROOT/scripts/bakuhu/"
+
+    cat > "$ROOT/queue/shogun_to_karo.yaml" <<'YAML'
+commands:
+  - id: cmd_done
+    status: done
+    completed_at: "2026-01-01T09:00:00"
+  - id: cmd_completed
+    status: completed
+  - id: cmd_cancelled
+    status: cancelled
+  - id: cmd_upper
+    status: DONE
+  - id: cmd_pending
+    status: pending
+  - id: cmd_running
+    status: in_progress
+YAML
+}
+
+teardown() {
+    rm -rf "$ROOT"
+}
+
+queue_ids() {
+    python3 -c 'import sys, yaml; print(" ".join(c["id"] for c in yaml.safe_load(open(sys.argv[1]))["commands"]))' \
+        "$ROOT/queue/shogun_to_karo.yaml"
+}
+
+archived_ids() {
+    python3 "$ROOT/scripts/archive_store.py" query --kind command \
+        | python3 -c 'import json, sys; print(" ".join(json.loads(l)["id"] for l in sys.stdin))'
+}
+
+@test "E2E-013-A: slim_yaml karo and yaml_archive_done archive the same status set" {
+    cp "$ROOT/queue/shogun_to_karo.yaml" "$ROOT/original.yaml"
+
+    run python3 "$ROOT/scripts/slim_yaml.py" karo
+    assert_success
+    [ "$(queue_ids)" = "cmd_pending cmd_running" ]
+    [ "$(archived_ids)" = "cmd_done cmd_completed cmd_cancelled cmd_upper" ]
+
+    # yaml_archive_done.py, run from an unrelated directory, gives the same queue
+    rm -rf "$ROOT/queue/archive"
+    cp "$ROOT/original.yaml" "$ROOT/queue/shogun_to_karo.yaml"
+    run bash -c "cd / && python3 '$ROOT/scripts/bakuhu/yaml_archive_done.py'"
+    assert_success
+    assert_line --partial "archived: 4 commands → $ROOT/queue/archive/store/"
+    assert_line "remaining: 2 commands"
+    assert_line --regexp "^throughput: 6 commands scanned in [0-9.]+s \([0-9]+ commands/s, 1 batches\)$"
+    [ "$(queue_ids)" = "cmd_pending cmd_running" ]
+    [ "$(archived_ids)" = "cmd_done cmd_completed cmd_cancelled cmd_upper" ]
+
+    # Reports of a cancelled command are no longer held back as "active"
+    run python3 -c 'import sys; sys.path.insert(0, sys.argv[1]); import slim_yaml; print(sorted(slim_yaml.get_active_cmd_ids(slim_yaml.load_queue_snapshot())))' "$ROOT/scripts"
+    assert_output "['cmd_pending', 'cmd_running']"
+}
+
+@test "E2E-013-B: --dry-run, --statuses and --min-age-hours" {
+    cp "$ROOT/queue/shogun_to_karo.yaml" "$ROOT/original.yaml"
+
+    run python3 "$ROOT/scripts/command_archiver.py" --dry-run
+    assert_success
+    assert_line "[DRY-RUN] would archive: 4 commands"
+    cmp "$ROOT/queue/shogun_to_karo.yaml" "$ROOT/original.yaml"
+    [ ! -d "$ROOT/queue/archive" ]
+
+    # Retention: only cmd_done has a completed_at old enough; undated ones are kept
+    run python3 "$ROOT/scripts/command_archiver.py" --min-age-hours 24
+    assert_success
+    assert_line --partial "archived: 1 commands"
+    [ "$(queue_ids)" = "cmd_completed cmd_cancelled cmd_upper cmd_pending cmd_running" ]
+
+    run python3 "$ROOT/scripts/command_archiver.py" --statuses cancelled
+    assert_success
+    [ "$(queue_ids)" = "cmd_completed cmd_upper cmd_pending cmd_running" ]
+    [ "$(archived_ids)" = "cmd_done cmd_cancelled" ]
+}
+
+@test "E2E-013-C: 10k commands are archived in one pass with batched appends" {
+    python3 - "$ROOT/queue/shogun_to_karo.yaml" <<'PYEOF'
+import sys, yaml
+commands = [{'id': f'cmd_{i:05d}', 'status': 'done' if i % 10 else 'pending',
+             'purpose': 'bulk archive test ' * 4} for i in range(10000)]
+yaml.safe_dump({'commands': commands}, open(sys.argv[1], 'w'), sort_keys=False)
+PYEOF
+
+    run python3 "$ROOT/scripts/command_archiver.py" --batch-size 2500
+    assert_success
+    assert_line --partial "archived: 9000 commands"
+    assert_line "remaining: 1000 commands"
+    assert_line --regexp "^throughput: 10000 commands scanned in [0-9.]+s \([0-9]+ commands/s, 4 batches\)$"
+
+    # One compressed member per batch
+    run python3 -c 'import glob, json; print(len({json.loads(l)["offset"] for f in glob.glob("'"$ROOT"'/queue/archive/store/*.index.jsonl") for l in open(f)}))'
+    assert_output "4"
+    run python3 "$ROOT/scripts/archive_store.py" query --id cmd_09999
+    assert_success
+}
+
+@test "E2E-013-D: the archiver waits for the slim_yaml lock" {
+    command -v flock &>/dev/null || skip "flock not available"
+    flock "$ROOT/queue/.slim_yaml.lock" sleep 3 &
+    local holder=$!
+    sleep 0.5
+
+    run python3 "$ROOT/scripts/bakuhu/yaml_archive_done.py" --lock-timeout 1
+    assert_failure
+    assert_output --partial "Failed to acquire lock within 1.0 seconds"
+    grep -q cmd_done "$ROOT/queue/shogun_to_karo.yaml"
+
+    wait "$holder"
+    run python3 "$ROOT/scripts/bakuhu/yaml_archive_done.py"
+    assert_success
+    ! grep -q cmd_done "$ROOT/queue/shogun_to_karo.yaml"
+}
+
+@test "E2E-013-E: slim_yaml.sh and the archiver exclude each other through one lock" {
+    cp "$PROJECT_ROOT/scripts/slim_yaml.sh" "$ROOT/scripts/"
+    # No flock binary on PATH (as on macOS): the lock is taken in Python either way
+    mkdir "$ROOT/bin"
+    ln -s "$(command -v python3)" "$ROOT/bin/python3"
+    ln -s "$(command -v dirname)" "$ROOT/bin/dirname"
+
+    # Hold the lock the way command_archiver.py does
+    python3 -c 'import sys, time; sys.path.insert(0, sys.argv[1]); import command_archiver
+with command_archiver.queue_lock():
+    open(sys.argv[2], "w").close()
+    time.sleep(2)' "$ROOT/scripts" "$ROOT/held" &
+    local holder=$!
+    while [ ! -e "$ROOT/held" ]; do sleep 0.1; done
+
+    PATH="$ROOT/bin" "$(command -v bash)" "$ROOT/scripts/slim_yaml.sh" karo &
+    local slim=$!
+    sleep 1
+    # Still waiting: the queue is untouched while the archiver holds the lock
+    kill -0 "$slim"
+    grep -q cmd_done "$ROOT/queue/shogun_to_karo.yaml"
+
+    wait "$holder"
+    wait "$slim"
+    [ "$(queue_ids)" = "cmd_pending cmd_running" ]
+    [ ! -e "$ROOT/queue/.slim_yaml.lock.d" ]
+
+    # And the archiver waits for (and here times out on) a running slim_yaml
+    python3 -c 'import sys, time; sys.path.insert(0, sys.argv[1]); import slim_yaml, command_archiver
+slim_yaml.slim = lambda *a: time.sleep(3) or True
+sys.argv = ["slim_yaml.py", "karo"]
+slim_yaml.main()' "$ROOT/scripts" &
+    holder=$!
+    sleep 0.5
+    run python3 "$ROOT/scripts/bakuhu/yaml_archive_done.py" --lock-timeout 1
+    assert_failure
+    assert_output --partial "Failed to acquire lock within 1.0 seconds"
+    wait "$holder"
+}
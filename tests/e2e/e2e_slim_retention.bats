@@ -70,6 +70,13 @@ run_slim_yaml() {
     python3 "$root/scripts/slim_yaml.py" "$agent"
 }
 
+archived_ids() {
+    local root="$1"
+    local kind="$2"
+    python3 "$root/scripts/archive_store.py" query --kind "$kind" \
+        | python3 -c 'import json, sys; [print(json.loads(line)["id"]) for line in sys.stdin]'
+}
+
 seed_yaml() {
     local file="$1" value="$2"
     printf '%s\n' "$value" > "$file"
@@ -79,7 +86,7 @@ seed_yaml() {
     local root
     root="$(mktemp -d "/tmp/e2e_slim_retention_XXXXXX")"
     build_tmp_project "$root"
-    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$root/scripts/"
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$root/scripts/"
 
     seed_yaml "$root/queue/shogun_to_karo.yaml" $'commands:\n  - id: cmd_test\n    status: pending\n'
     seed_yaml "$root/queue/reports/ashigaru1_cmd_test_report.yaml" $'parent_cmd: cmd_test\nstatus: done\n'
@@ -103,7 +110,7 @@ seed_yaml() {
     local root
     root="$(mktemp -d "/tmp/e2e_slim_retention_XXXXXX")"
     build_tmp_project "$root"
-    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$root/scripts/"
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$root/scripts/"
 
     seed_yaml "$root/queue/shogun_to_karo.yaml" $'commands:\n  - id: cmd_test\n    status: done\n'
     seed_yaml "$root/queue/reports/ashigaru1_cmd_test_report.yaml" $'parent_cmd: cmd_test\nstatus: done\n'
@@ -115,9 +122,10 @@ seed_yaml() {
     run run_slim_yaml "$root" karo
     assert_success
 
-    # Non-canonical report is archived.
+    # Non-canonical report is archived into the archive store.
     [ ! -f "$root/queue/reports/ashigaru1_cmd_test_report.yaml" ]
-    [ -f "$root/queue/archive/reports/ashigaru1_cmd_test_report.yaml" ]
+    run archived_ids "$root" report
+    assert_output "ashigaru1_cmd_test_report"
     # Canonical report remains.
     [ -f "$root/queue/reports/ashigaru1_report.yaml" ]
 
@@ -128,7 +136,7 @@ seed_yaml() {
     local root
     root="$(mktemp -d "/tmp/e2e_slim_retention_XXXXXX")"
     build_tmp_project "$root"
-    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$root/scripts/"
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$root/scripts/"
 
     seed_yaml "$root/queue/shogun_to_karo.yaml" $'commands:\n  - id: cmd_test\n    status: done\n'
     seed_yaml "$root/queue/reports/ashigaru1_report.yaml" $'parent_cmd: cmd_done\nstatus: done\n'
@@ -142,3 +150,30 @@ seed_yaml() {
 
     rm -rf "$root"
 }
+
+@test "E2E-011-D: recent reports are kept without being parsed" {
+    local root
+    root="$(mktemp -d "/tmp/e2e_slim_retention_XXXXXX")"
+    build_tmp_project "$root"
+    cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$root/scripts/"
+
+    seed_yaml "$root/queue/shogun_to_karo.yaml" $'commands:\n  - id: cmd_test\n    status: pending\n  - id: cmd_old\n    status: done\n'
+    # Unparseable but recent: must be skipped on mtime alone.
+    seed_yaml "$root/queue/reports/ashigaru1_cmd_new_report.yaml" $'parent_cmd: [cmd_new\n'
+    seed_yaml "$root/queue/reports/ashigaru2_cmd_old_report.yaml" $'parent_cmd: cmd_old\nstatus: done\n'
+    touch -d "2 days ago" "$root/queue/reports/ashigaru2_cmd_old_report.yaml"
+
+    run run_slim_yaml "$root" karo
+    assert_success
+    refute_output --partial "Error parsing"
+
+    [ -f "$root/queue/reports/ashigaru1_cmd_new_report.yaml" ]
+    # cmd_old is archived from the queue in the same pass, so its old report goes too.
+    [ ! -f "$root/queue/reports/ashigaru2_cmd_old_report.yaml" ]
+    run archived_ids "$root" report
+    assert_output "ashigaru2_cmd_old_report"
+    grep -q "cmd_test" "$root/queue/shogun_to_karo.yaml"
+    ! grep -q "cmd_old" "$root/queue/shogun_to_karo.yaml"
+
+    rm -rf "$root"
+}
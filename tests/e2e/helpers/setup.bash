@@ -28,6 +28,9 @@ setup_e2e_session() {
     mkdir -p "$E2E_QUEUE/scripts"
     cp "$PROJECT_ROOT/scripts/inbox_write.sh" "$E2E_QUEUE/scripts/"
     cp "$PROJECT_ROOT/scripts/inbox_watcher.sh" "$E2E_QUEUE/scripts/"
+    # imported by inbox_write.sh (write + auto-compaction into the archive store)
+    cp "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/slim_yaml.py" \
+        "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$E2E_QUEUE/scripts/"
     chmod +x "$E2E_QUEUE/scripts/inbox_write.sh"
     chmod +x "$E2E_QUEUE/scripts/inbox_watcher.sh"
 
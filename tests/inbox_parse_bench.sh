@@ -0,0 +1,110 @@
+#!/usr/bin/env bash
+# inbox_parse_bench.sh — inbox YAML のパース時間ベンチマーク（自動圧縮の前後比較）
+# Usage: bash tests/inbox_parse_bench.sh [--messages N,N,...] [--unread N] [--repeat N]
+#
+# メッセージ数を変えながら、inbox_watcher.sh と同じ yaml.safe_load で inbox を読む時間を測る。
+#   before: 圧縮なし（既読が溜まり続けた inbox）
+#   after : slim_yaml.compact_inbox() 適用後（inbox_write.sh が書き込みごとに行う自動圧縮）
+#
+# 既読メッセージに未読を --unread 件混ぜる。圧縮は一時ディレクトリのアーカイブストアへ退避するので
+# 実際の queue/ には触れない。圧縮後に未読が1件でも欠けた場合は exit 1。
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+MESSAGES="50,200,1000,5000"
+UNREAD=3
+REPEAT=5
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --messages) MESSAGES="$2"; shift 2 ;;
+        --unread) UNREAD="$2"; shift 2 ;;
+        --repeat) REPEAT="$2"; shift 2 ;;
+        --help) echo "Usage: $0 [--messages N,N,...] [--unread N] [--repeat N]"; exit 0 ;;
+        *) shift ;;
+    esac
+done
+
+PYTHON="python3"
+[ -x "$PROJECT_ROOT/.venv/bin/python3" ] && PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+
+# slim_yaml.py はアーカイブストアを <scripts>/../queue に置くので、一時ディレクトリへコピーして使う
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+mkdir -p "$WORK_DIR/scripts" "$WORK_DIR/queue/inbox"
+cp "$PROJECT_ROOT/scripts/slim_yaml.py" "$PROJECT_ROOT/scripts/archive_store.py" \
+    "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$WORK_DIR/scripts/"
+
+echo "══ inbox パース時間ベンチマーク ══"
+
+"$PYTHON" - "$WORK_DIR" "$MESSAGES" "$UNREAD" "$REPEAT" <<'PYEOF'
+import os
+import random
+import sys
+import time
+
+work_dir, message_counts, unread_count, repeat = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+sys.path.insert(0, os.path.join(work_dir, 'scripts'))
+import yaml
+import slim_yaml
+
+random.seed(20260101)
+senders = ['karo', 'gunshi', 'shogun'] + [f'ashigaru{i}' for i in range(1, 9)]
+types = ['task_assigned', 'report_received', 'wake_up', 'clear_command']
+
+
+def make_inbox(n):
+    messages = []
+    for i in range(n):
+        messages.append({
+            'id': f'msg_20260101_{i:06d}_{random.getrandbits(32):08x}',
+            'from': random.choice(senders),
+            'timestamp': f'2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}',
+            'type': random.choice(types),
+            'content': '任務完了。報告書を確認されたし。' * random.randint(1, 6),
+            'read': True,
+        })
+    for i in random.sample(range(n), min(unread_count, n)):
+        messages[i]['read'] = False
+    return {'messages': messages}
+
+
+def best_parse(path):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            yaml.safe_load(f)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+missing = 0
+print("")
+print(f"  {'件数':>6} {'before KB':>10} {'before ms':>10} {'after 件数':>10} {'after KB':>9} {'after ms':>9} {'速度比':>7} {'退避':>6}")
+print(f"  {'-' * 76}")
+for n in (int(x) for x in message_counts.split(',')):
+    path = os.path.join(work_dir, 'queue', 'inbox', 'ashigaru1.yaml')
+    data = make_inbox(n)
+    unread_ids = {m['id'] for m in data['messages'] if not m['read']}
+    slim_yaml.save_yaml(path, data)
+    size_before = os.path.getsize(path)
+    t_before = best_parse(path)
+
+    archived = slim_yaml.compact_inbox('ashigaru1', path, data)
+    slim_yaml.save_yaml(path, data)
+    size_after = os.path.getsize(path)
+    t_after = best_parse(path)
+
+    kept_unread = {m['id'] for m in data['messages'] if not m['read']}
+    missing += len(unread_ids - kept_unread)
+    print(f"  {n:>6} {size_before / 1024:>10.1f} {t_before * 1000:>10.2f} {len(data['messages']):>10}"
+          f" {size_after / 1024:>9.1f} {t_after * 1000:>9.2f} {t_before / t_after:>6.1f}x {archived:>6}")
+
+print("")
+print(f"閾値: {slim_yaml.INBOX_COMPACT_MAX_MESSAGES}件 / {slim_yaml.INBOX_COMPACT_MAX_BYTES // 1024}KB"
+      f"（件数超過時は既読を最新{slim_yaml.INBOX_KEEP_READ}件まで残す、サイズ超過時は既読を全て退避）")
+print(f"欠けた未読: {missing}件")
+sys.exit(1 if missing else 0)
+PYEOF
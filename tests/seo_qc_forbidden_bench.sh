@@ -0,0 +1,125 @@
+#!/usr/bin/env bash
+# seo_qc_forbidden_bench.sh — seo_qc.py 禁止語マッチャー ベンチマーク
+# Usage: bash tests/seo_qc_forbidden_bench.sh [--site-dir path] [--words N,N,...] [--repeat N]
+#
+# 禁止語数を変えながら、同じ記事本文群に対して2方式の検出時間を比較する。
+#   regex    : 禁止語の単純な選択肢正規表現（従来の FORBIDDEN_PATTERN 方式。長い語を先に並べる）
+#   automaton: seo_qc.WordMatcher(engine="automaton")（Aho-Corasickオートマトン）
+#   auto     : WordMatcher のデフォルト（REGEX_MAX_WORDS 以下は regex、超えたら automaton）
+#
+# 禁止語は FORBIDDEN_WORDS に合成語を足して指定数にする。一部は本文に埋め込み、実際にヒットさせる。
+# --site-dir 指定時は <site-dir>/src/content/area の実記事本文を使う。未指定時は合成本文。
+# 検出結果が2方式で一致しない場合は exit 1。
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+SITE_DIR=""
+WORDS="7,50,200,500,1000"
+REPEAT=3
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --site-dir) SITE_DIR="$2"; shift 2 ;;
+        --words) WORDS="$2"; shift 2 ;;
+        --repeat) REPEAT="$2"; shift 2 ;;
+        --help) echo "Usage: $0 [--site-dir path] [--words N,N,...] [--repeat N]"; exit 0 ;;
+        *) shift ;;
+    esac
+done
+
+PYTHON="python3"
+[ -x "$PROJECT_ROOT/.venv/bin/python3" ] && PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+
+echo "══ seo_qc 禁止語マッチャー ベンチマーク ══"
+
+"$PYTHON" - "$PROJECT_ROOT/scripts/seo_qc.py" "$SITE_DIR" "$WORDS" "$REPEAT" <<'PYEOF'
+import glob
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+seo_qc_path, site_dir, word_counts, repeat = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+spec = importlib.util.spec_from_file_location("seo_qc", seo_qc_path)
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+
+random.seed(20260101)
+kanji = [chr(c) for c in range(0x4E00, 0x4E00 + 400)]
+kana = [chr(c) for c in range(0x3041, 0x3094)]
+
+
+def make_word():
+    return "".join(random.choice(kanji + kana) for _ in range(random.randint(2, 6)))
+
+
+if site_dir:
+    files = sorted(glob.glob(os.path.join(site_dir, "src", "content", "area", "*.md*")))
+    bodies = [qc.parse_frontmatter(open(f, encoding="utf-8").read())[1] for f in files]
+    print(f"本文: {site_dir} ({len(bodies)}件)")
+else:
+    bodies = []
+    for _ in range(200):
+        paragraphs = ["".join(random.choice(kana * 4 + kanji) for _ in range(random.randint(40, 200))) + "。"
+                      for _ in range(40)]
+        bodies.append("\n\n".join(paragraphs))
+    print(f"本文: 合成 ({len(bodies)}件)")
+total_chars = sum(len(b) for b in bodies)
+print(f"総文字数: {total_chars:,}")
+
+pool = list(qc.FORBIDDEN_WORDS)
+seen = set(pool)
+while len(pool) < max(int(n) for n in word_counts.split(",")):
+    w = make_word()
+    if w not in seen:
+        seen.add(w)
+        pool.append(w)
+
+# 各本文に辞書の語をいくつか埋め込む（ヒットなしの走査だけにならないように）
+planted = []
+for body in bodies:
+    for _ in range(3):
+        i = random.randrange(len(body) + 1)
+        body = body[:i] + random.choice(pool[:7] + pool[-5:]) + body[i:]
+    planted.append(body)
+bodies = planted
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+mismatch = 0
+print("")
+print(f"  {'語数':>6} {'regex ms':>10} {'automaton ms':>12} {'auto ms':>10} {'auto方式':>10} {'AC速度比':>8} {'ヒット':>8}")
+print(f"  {'-' * 74}")
+for n in (int(x) for x in word_counts.split(",")):
+    words = pool[:n]
+    pattern = re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+    automaton = qc.WordMatcher(words, engine="automaton")
+    auto = qc.WordMatcher(words)
+    hits = 0
+    for body in bodies:
+        expected = pattern.findall(body)
+        if automaton.findall(body) != expected or auto.findall(body) != expected:
+            mismatch += 1
+        hits += len(expected)
+    t_regex = best_of(pattern.findall)
+    t_ac = best_of(automaton.findall)
+    t_auto = best_of(auto.findall)
+    print(f"  {n:>6} {t_regex * 1000:>10.1f} {t_ac * 1000:>12.1f} {t_auto * 1000:>10.1f} {auto.engine:>10}"
+          f" {t_regex / t_ac:>7.1f}x {hits:>8}")
+
+print("")
+print(f"検出結果の不一致: {mismatch}件")
+sys.exit(1 if mismatch else 0)
+PYEOF
@@ -0,0 +1,114 @@
+#!/usr/bin/env bash
+# seo_qc_frontmatter_bench.sh — seo_qc.py frontmatter解析ベンチマーク
+# Usage: bash tests/seo_qc_frontmatter_bench.sh [--site-dir path] [--count N] [--repeat N]
+#
+# 3方式で同じfrontmatter群を解析し、1件あたりの時間と速度比を表示する。
+#   safe_load  : yaml.safe_load（純Python SafeLoader。従来の実装）
+#   CSafeLoader: libyaml版ローダー（PyYAMLがlibyaml付きでビルドされている場合のみ）
+#   fast       : seo_qc.fast_frontmatter（平坦なkey/value/listのみ。非対応はフルYAMLへフォールバック）
+#
+# --site-dir 指定時は <site-dir>/src/content/area の実記事を使う。
+# 未指定時は記事と同形の合成frontmatterを --count 件生成する。
+# 解析結果が3方式で一致しない場合は exit 1。
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+SITE_DIR=""
+COUNT=2000
+REPEAT=3
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --site-dir) SITE_DIR="$2"; shift 2 ;;
+        --count) COUNT="$2"; shift 2 ;;
+        --repeat) REPEAT="$2"; shift 2 ;;
+        --help) echo "Usage: $0 [--site-dir path] [--count N] [--repeat N]"; exit 0 ;;
+        *) shift ;;
+    esac
+done
+
+PYTHON="python3"
+[ -x "$PROJECT_ROOT/.venv/bin/python3" ] && PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+
+echo "══ seo_qc frontmatter ベンチマーク ══"
+
+"$PYTHON" - "$PROJECT_ROOT/scripts/seo_qc.py" "$SITE_DIR" "$COUNT" "$REPEAT" <<'EOF'
+import glob
+import importlib.util
+import os
+import sys
+import time
+
+import yaml
+
+seo_qc_path, site_dir, count, repeat = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+spec = importlib.util.spec_from_file_location("seo_qc", seo_qc_path)
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+
+
+def extract(content):
+    end = content.find("---", 3)
+    return content[3:end].strip() if content.startswith("---") and end != -1 else ""
+
+
+if site_dir:
+    files = sorted(glob.glob(os.path.join(site_dir, "src", "content", "area", "*.md*")))
+    corpus = [extract(open(f, encoding="utf-8").read()) for f in files]
+    print(f"コーパス: {site_dir} ({len(corpus)}件)")
+else:
+    corpus = [
+        f'title: "エリア{i}の害虫駆除｜費用相場と選び方"\n'
+        f"description: エリア{i}で害虫駆除を依頼する前に知っておきたいポイントを解説します\n"
+        f"publishedAt: 2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}\n"
+        f"category: area\narea: エリア{i}\nkeyword: 害虫駆除 エリア{i}\n"
+        f"keywords:\n  - 害虫駆除\n  - エリア{i}\n  - 費用"
+        for i in range(count)
+    ]
+    print(f"コーパス: 合成frontmatter ({len(corpus)}件)")
+
+methods = [("safe_load", lambda t: yaml.load(t, Loader=yaml.SafeLoader))]
+if hasattr(yaml, "CSafeLoader"):
+    methods.append(("CSafeLoader", lambda t: yaml.load(t, Loader=yaml.CSafeLoader)))
+else:
+    print("※ PyYAMLにlibyamlが無いため CSafeLoader は計測対象外")
+
+
+def fast(t):
+    fm = qc.fast_frontmatter(t)
+    return fm if fm is not None else yaml.load(t, Loader=qc.YAML_LOADER)
+
+
+methods.append(("fast", fast))
+
+reference = [yaml.safe_load(t) for t in corpus]
+mismatch = 0
+for name, fn in methods[1:]:
+    for t, ref in zip(corpus, reference):
+        if repr(fn(t)) != repr(ref):
+            mismatch += 1
+            print(f"不一致 [{name}]: {t[:80]!r}")
+fallbacks = sum(1 for t in corpus if qc.fast_frontmatter(t) is None)
+
+results = {}
+for name, fn in methods:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in corpus:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    results[name] = best
+
+base = results["safe_load"]
+print("")
+print(f"  {'方式':<14} {'合計ms':>10} {'1件us':>10} {'速度比':>8}")
+print(f"  {'-' * 46}")
+for name, sec in results.items():
+    print(f"  {name:<14} {sec * 1000:>10.1f} {sec / max(len(corpus), 1) * 1e6:>10.1f} {base / sec:>7.1f}x")
+print("")
+print(f"高速パス非対応（フォールバック）: {fallbacks}/{len(corpus)}件")
+print(f"解析結果の不一致: {mismatch}件")
+sys.exit(1 if mismatch else 0)
+EOF
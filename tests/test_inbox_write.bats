@@ -11,6 +11,7 @@
 #   T-010: flock競合時のリトライ
 #   T-011: 特殊文字のエスケープ処理
 #   T-012: inbox初期化（ディレクトリ自動作成）
+#   T-013~T-015: 書き込み時の自動圧縮（件数・サイズ閾値、アーカイブストアへ退避）
 
 # --- セットアップ ---
 
@@ -42,6 +43,9 @@ setup() {
     sed "s|SCRIPT_DIR=\"\$(cd \"\$(dirname \"\${BASH_SOURCE\[0\]}\")/..*|SCRIPT_DIR=\"$TEST_TMPDIR\"|" \
         "$PROJECT_ROOT/scripts/inbox_write.sh" > "$TEST_SCRIPT_DIR/inbox_write.sh"
     chmod +x "$TEST_SCRIPT_DIR/inbox_write.sh"
+    # inbox_write.sh が import するアトミック書き込みヘルパーと自動圧縮（アーカイブストア）
+    cp "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/slim_yaml.py" \
+        "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$TEST_SCRIPT_DIR/"
 
     # .venvをプロジェクトルートからシンボリックリンク（inbox_write.shが$SCRIPT_DIR/.venv/bin/python3を参照）
     ln -sf "$PROJECT_ROOT/.venv" "$TEST_TMPDIR/.venv"
@@ -435,3 +439,106 @@ assert len(data['messages']) == 1, 'Expected 1 message after auto-create'
 print('T-012: PASS')
 EOF
 }
+
+# =============================================================================
+# T-013: 自動圧縮 — 50件超で古い既読をアーカイブストアへ退避
+# =============================================================================
+
+@test "T-013: auto-compaction by count → dropped read messages go to the archive store" {
+    # 既読60件を事前に作成
+    "$VENV_PYTHON" <<EOF
+import yaml
+
+messages = [{'id': f'msg_old_{i:03d}', 'from': 'karo', 'content': f'既読 {i}', 'read': True}
+            for i in range(60)]
+with open('$TEST_INBOX_DIR/ashigaru1.yaml', 'w') as f:
+    yaml.dump({'messages': messages}, f, allow_unicode=True)
+EOF
+
+    run bash "$TEST_INBOX_WRITE" "ashigaru1" "新規メッセージ"
+    [ "$status" -eq 0 ]
+
+    # 残るのは最新の既読30件 + 新規1件、古い30件はストアから取り出せる
+    "$VENV_PYTHON" <<EOF
+import json, subprocess, yaml
+
+with open('$TEST_INBOX_DIR/ashigaru1.yaml') as f:
+    ids = [m['id'] for m in yaml.safe_load(f)['messages']]
+assert len(ids) == 31, len(ids)
+assert ids[0] == 'msg_old_030', ids[0]
+
+out = subprocess.run(['$VENV_PYTHON', '$TEST_SCRIPT_DIR/archive_store.py', 'query',
+                      '--kind', 'inbox', '--agent', 'ashigaru1'],
+                     capture_output=True, text=True, check=True).stdout
+archived = [json.loads(line)['id'] for line in out.splitlines()]
+assert archived == [f'msg_old_{i:03d}' for i in range(30)], archived
+
+print('T-013: PASS')
+EOF
+}
+
+# =============================================================================
+# T-014: 自動圧縮 — サイズ上限超で既読を全て退避
+# =============================================================================
+
+@test "T-014: auto-compaction by size → all read messages are archived, unread kept" {
+    # 件数は少ないが 64KB を超える inbox（既読10件 + 未読1件）
+    "$VENV_PYTHON" <<EOF
+import yaml
+
+messages = [{'id': f'msg_big_{i}', 'content': 'x' * 8000, 'read': True} for i in range(10)]
+messages.append({'id': 'msg_unread', 'content': '未読', 'read': False})
+with open('$TEST_INBOX_DIR/ashigaru1.yaml', 'w') as f:
+    yaml.dump({'messages': messages}, f, allow_unicode=True)
+EOF
+
+    run bash "$TEST_INBOX_WRITE" "ashigaru1" "新規メッセージ"
+    [ "$status" -eq 0 ]
+
+    "$VENV_PYTHON" <<EOF
+import os, yaml
+
+with open('$TEST_INBOX_DIR/ashigaru1.yaml') as f:
+    msgs = yaml.safe_load(f)['messages']
+assert [m['id'] for m in msgs][0] == 'msg_unread', msgs
+assert len(msgs) == 2 and not any(m['read'] for m in msgs), msgs
+assert os.path.getsize('$TEST_INBOX_DIR/ashigaru1.yaml') < 1024
+
+print('T-014: PASS')
+EOF
+
+    # 閾値未満の inbox は書き換え以外に何もしない
+    run bash "$TEST_INBOX_WRITE" "ashigaru2" "小さい inbox"
+    [ "$status" -eq 0 ]
+    [ "$(ls "$TEST_TMPDIR/queue/archive/store" | grep -c index)" -eq 1 ]
+    [ "$("$VENV_PYTHON" "$TEST_SCRIPT_DIR/archive_store.py" query --agent ashigaru1 | wc -l)" -eq 10 ]
+}
+
+# =============================================================================
+# T-015: 自動圧縮 — アーカイブ失敗時は何も捨てない
+# =============================================================================
+
+@test "T-015: auto-compaction never drops messages when the archive store is unwritable" {
+    "$VENV_PYTHON" <<EOF
+import yaml
+
+messages = [{'id': f'msg_old_{i:03d}', 'content': f'既読 {i}', 'read': True} for i in range(60)]
+with open('$TEST_INBOX_DIR/ashigaru1.yaml', 'w') as f:
+    yaml.dump({'messages': messages}, f, allow_unicode=True)
+EOF
+    # queue/archive をファイルにしてストアを作れなくする
+    touch "$TEST_TMPDIR/queue/archive"
+
+    run bash "$TEST_INBOX_WRITE" "ashigaru1" "新規メッセージ"
+    [ "$status" -eq 0 ]
+
+    "$VENV_PYTHON" <<EOF
+import yaml
+
+with open('$TEST_INBOX_DIR/ashigaru1.yaml') as f:
+    msgs = yaml.safe_load(f)['messages']
+assert len(msgs) == 61, len(msgs)
+
+print('T-015: PASS')
+EOF
+}
@@ -0,0 +1,139 @@
+#!/usr/bin/env bats
+# test_atomic_write.bats — atomic_write.py（キュー書き込み共通のアトミック書き込み）のテスト
+#
+# テスト構成:
+#   T-001: ダンプ途中で書き手を SIGKILL しても、対象は旧版か新版の完全なYAMLのまま
+#   T-002: rename 直前に落ちても対象は旧版のまま、残るのは *.yaml に当たらない一時ファイルだけ
+#   T-003: 書き込みエラーは例外になり、一時ファイルを消して対象を残す
+#   T-004: 既存ファイルのパーミッションを保ち、新規ファイルは 0644
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/atomic_write_test.XXXXXX")"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/queue/inbox"
+    cp "$PROJECT_ROOT/scripts/atomic_write.py" "$PROJECT_ROOT/scripts/slim_yaml.py" \
+        "$PROJECT_ROOT/scripts/archive_store.py" "$PROJECT_ROOT/scripts/command_archiver.py" "$TEST_TMPDIR/scripts/"
+    export TARGET="$TEST_TMPDIR/queue/inbox/ashigaru1.yaml"
+    printf 'messages:\n- id: msg_old\n  read: false\n' > "$TARGET"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# scripts/ を import パスに入れて Python コードを実行する
+run_py() {
+    "$PYTHON" -c "
+import os, signal, sys
+sys.path.insert(0, os.path.join(os.environ['TEST_TMPDIR'], 'scripts'))
+$1
+"
+}
+
+# =============================================================================
+# T-001: ダンプ途中の SIGKILL
+# =============================================================================
+
+@test "T-001: killing the writer mid-dump never leaves a partial file" {
+    # slim_yaml.save_yaml で大きな inbox を版 A/B 交互に書き続ける書き手
+    cat > "$TEST_TMPDIR/writer.py" <<'PYEOF'
+import os, sys
+sys.path.insert(0, os.path.join(os.environ['TEST_TMPDIR'], 'scripts'))
+import slim_yaml
+
+body = 'x' * 200
+versions = [
+    {'messages': [{'id': f'msg_{v}_{i}', 'content': body, 'read': False} for i in range(3000)]}
+    for v in ('a', 'b')
+]
+n = 0
+while True:
+    slim_yaml.save_yaml(os.environ['TARGET'], versions[n % 2])
+    n += 1
+PYEOF
+    local i pid
+    for i in $(seq 1 15); do
+        "$PYTHON" "$TEST_TMPDIR/writer.py" &
+        pid=$!
+        sleep "0.$((RANDOM % 9 + 1))"
+        kill -9 "$pid"
+        wait "$pid" 2>/dev/null || true
+
+        run run_py "
+import yaml
+data = yaml.safe_load(open(os.environ['TARGET'], encoding='utf-8'))
+ids = [m['id'] for m in data['messages']]
+assert ids == ['msg_old'] or (len(ids) == 3000 and len({i.split('_')[1] for i in ids}) == 1), ids[:3]
+print('ok')
+"
+        [ "$status" -eq 0 ]
+        [ "$output" = "ok" ]
+    done
+    # 一時ファイルは *.yaml に当たらない
+    [ "$(cd "$TEST_TMPDIR/queue/inbox" && ls *.yaml)" = "ashigaru1.yaml" ]
+}
+
+# =============================================================================
+# T-002: rename 直前のクラッシュ
+# =============================================================================
+
+@test "T-002: a crash just before the rename keeps the old file" {
+    run run_py "
+import atomic_write
+os.replace = lambda *a: os.kill(os.getpid(), signal.SIGKILL)
+atomic_write.dump_yaml_atomic(os.environ['TARGET'], {'messages': []})
+"
+    [ "$status" -ne 0 ]
+    grep -q msg_old "$TARGET"
+    [ "$(cd "$TEST_TMPDIR/queue/inbox" && ls *.yaml)" = "ashigaru1.yaml" ]
+    ls -A "$TEST_TMPDIR/queue/inbox" | grep -q '^\.ashigaru1\.yaml\..*\.tmp$'
+}
+
+# =============================================================================
+# T-003: 書き込みエラー
+# =============================================================================
+
+@test "T-003: a write error propagates and cleans up the temp file" {
+    run run_py "
+import atomic_write
+def failing_fsync(fd):
+    raise OSError(28, 'No space left on device')
+os.fsync = failing_fsync
+try:
+    atomic_write.write_atomic(os.environ['TARGET'], 'messages: []\n')
+except OSError as e:
+    print('raised', e.errno)
+"
+    [ "$status" -eq 0 ]
+    [ "$output" = "raised 28" ]
+    grep -q msg_old "$TARGET"
+    [ "$(ls -A "$TEST_TMPDIR/queue/inbox")" = "ashigaru1.yaml" ]
+}
+
+# =============================================================================
+# T-004: パーミッション
+# =============================================================================
+
+@test "T-004: existing permissions are kept and new files are 0644" {
+    chmod 640 "$TARGET"
+    run run_py "
+import atomic_write
+atomic_write.write_atomic(os.environ['TARGET'], 'messages: []\n')
+atomic_write.write_atomic(os.environ['TARGET'] + '.new.yaml', b'messages: []\n')
+"
+    [ "$status" -eq 0 ]
+    [ "$(stat -c %a "$TARGET")" = "640" ]
+    [ "$(stat -c %a "$TARGET.new.yaml")" = "644" ]
+    [ "$(cat "$TARGET")" = "messages: []" ]
+}
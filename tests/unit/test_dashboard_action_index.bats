@@ -0,0 +1,225 @@
+#!/usr/bin/env bats
+# test_dashboard_action_index.bats — dashboard_write.py 要対応索引・バッチ操作テスト
+#
+# テスト構成:
+#   T-001: add-action --batch が1回の実行で全件を連番で追加する（--pj は行に無い時の既定値）
+#   T-002: remove-action --batch は見つかった分を削除し、見つからない cmd_id は警告して exit 1
+#   T-003: 削除した id 番号は再利用しない
+#   T-004: 索引を通さずに state が変わったら索引を作り直す（id 重複・削除漏れなし）
+#   T-005: 不正なバッチ行はエラー終了し、何も書き込まない
+#   T-006: デーモン経由でも --batch の標準入力が渡る
+#   T-007: add-senka・compact を挟んでも add-action / remove-action は索引を作り直さない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_index_test.XXXXXX")"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$TEST_TMPDIR/queue/tasks" "$TEST_TMPDIR/queue/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+commands_dir: queue/commands
+YAML
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export STATE="$TEST_TMPDIR/queue/dashboard_state.yaml"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    if [ -S "$TEST_TMPDIR/queue/.dashboard_daemon.sock" ]; then
+        DASHBOARD_NO_DAEMON= "$PYTHON" "$TEST_TMPDIR/scripts/dashboard_daemon.py" --stop > /dev/null 2>&1 || true
+    fi
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# 再生後の要対応を id:cmd_id:project で表示する
+show_actions() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$STATE" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_write
+state = dashboard_write.load_state(Path(sys.argv[2]))
+print("action:", *(f"{i['id']}:{i['cmd_id']}:{i['project']}" for i in state.get("action_required", [])))
+PYEOF
+}
+
+# =============================================================================
+# T-001: add-action --batch
+# =============================================================================
+
+@test "T-001: add-action --batch adds every line in one invocation" {
+    run "$PYTHON" "$WRITE" add-action --batch --pj default_pj <<'JSONL'
+{"cmd": "cmd_1", "pj": "pj_a", "type": "t", "content": "c1"}
+
+{"cmd": "cmd_2", "type": "t", "content": "c2"}
+{"cmd": "cmd_3", "pj": "pj_c", "type": "t", "content": "c3"}
+JSONL
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "追加完了: ar_001 (cmd_1 / pj_a)" ]
+    [ "${lines[1]}" = "追加完了: ar_002 (cmd_2 / default_pj)" ]
+    [ "${lines[2]}" = "追加完了: ar_003 (cmd_3 / pj_c)" ]
+
+    run show_actions
+    [ "$output" = "action: ar_001:cmd_1:pj_a ar_002:cmd_2:default_pj ar_003:cmd_3:pj_c" ]
+}
+
+# =============================================================================
+# T-002: remove-action --batch
+# =============================================================================
+
+@test "T-002: remove-action --batch removes found cmd_ids and fails on missing ones" {
+    for i in 1 2 3; do
+        "$PYTHON" "$WRITE" add-action --cmd "cmd_$i" --pj p --type t --content c > /dev/null
+    done
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content again > /dev/null
+
+    run "$PYTHON" "$WRITE" remove-action --batch <<'JSONL'
+{"cmd": "cmd_1"}
+{"cmd": "cmd_missing"}
+{"cmd": "cmd_3"}
+JSONL
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"削除完了: cmd_id=cmd_1 (2件削除)"* ]]
+    [[ "$output" == *"警告: cmd_id=cmd_missing の要対応が見つかりませんでした"* ]]
+    [[ "$output" == *"削除完了: cmd_id=cmd_3 (1件削除)"* ]]
+
+    run show_actions
+    [ "$output" = "action: ar_002:cmd_2:p" ]
+}
+
+# =============================================================================
+# T-003: id を再利用しない
+# =============================================================================
+
+@test "T-003: removed id numbers are not reused" {
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" add-action --cmd cmd_2 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" remove-action --cmd cmd_2 > /dev/null
+
+    run "$PYTHON" "$WRITE" add-action --cmd cmd_3 --pj p --type t --content c
+    [ "$status" -eq 0 ]
+    [ "$output" = "追加完了: ar_003 (cmd_3 / p)" ]
+}
+
+# =============================================================================
+# T-004: 索引の作り直し
+# =============================================================================
+
+@test "T-004: the index is rebuilt when the state changes behind its back" {
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" compact > /dev/null
+    # 手編集（索引を通さない書き込み）で要対応を差し替える
+    cat > "$STATE" <<'YAML'
+oplog_generation: 2
+action_required:
+- id: ar_010
+  cmd_id: cmd_hand
+  project: p
+  type: t
+  content: c
+  added: '2026-01-01'
+projects: []
+archives: []
+YAML
+
+    run "$PYTHON" "$WRITE" remove-action --cmd cmd_1
+    [ "$status" -eq 1 ]
+    run "$PYTHON" "$WRITE" add-action --cmd cmd_2 --pj p --type t --content c
+    [ "$output" = "追加完了: ar_011 (cmd_2 / p)" ]
+    run "$PYTHON" "$WRITE" remove-action --cmd cmd_hand
+    [ "$status" -eq 0 ]
+
+    run show_actions
+    [ "$output" = "action: ar_011:cmd_2:p" ]
+}
+
+# =============================================================================
+# T-005: 不正なバッチ
+# =============================================================================
+
+@test "T-005: a malformed batch line is an error and nothing is written" {
+    run "$PYTHON" "$WRITE" add-action --batch <<'JSONL'
+{"cmd": "cmd_1", "pj": "p", "type": "t", "content": "c"}
+{"cmd": "cmd_2", "pj": "p", "type": "t"}
+JSONL
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"--batch 2行目"* ]]
+
+    run "$PYTHON" "$WRITE" add-action --batch --cmd cmd_1 < /dev/null
+    [ "$status" -eq 1 ]
+
+    [ ! -e "$STATE" ]
+}
+
+# =============================================================================
+# T-006: デーモン経由
+# =============================================================================
+
+@test "T-006: --batch input is forwarded to the daemon" {
+    export DASHBOARD_NO_DAEMON=
+    "$PYTHON" "$TEST_TMPDIR/scripts/dashboard_daemon.py" 2> /dev/null &
+    for _ in $(seq 1 50); do
+        [ -S "$TEST_TMPDIR/queue/.dashboard_daemon.sock" ] && break
+        sleep 0.1
+    done
+    [ -S "$TEST_TMPDIR/queue/.dashboard_daemon.sock" ]
+
+    run "$PYTHON" "$WRITE" add-action --batch <<'JSONL'
+{"cmd": "cmd_1", "pj": "p", "type": "t", "content": "c"}
+{"cmd": "cmd_2", "pj": "p", "type": "t", "content": "c"}
+JSONL
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = "追加完了: ar_002 (cmd_2 / p)" ]
+
+    run "$PYTHON" "$WRITE" remove-action --batch <<< '{"cmd": "cmd_1"}'
+    [ "$status" -eq 0 ]
+
+    run show_actions
+    [ "$output" = "action: ar_002:cmd_2:p" ]
+}
+
+# =============================================================================
+# T-007: 戦果の追記・畳み込みを挟んだ索引
+# =============================================================================
+
+@test "T-007: add-senka and compact do not force an index rebuild" {
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_1 --pj p --content 戦果1 > /dev/null
+    "$PYTHON" "$WRITE" compact > /dev/null
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_1 --pj p --content 戦果2 > /dev/null
+
+    # 続く add-action / remove-action で state の再生（索引の作り直し）が起きないこと
+    run "$PYTHON" - "$TEST_TMPDIR/scripts" "$STATE" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_write
+state_path = Path(sys.argv[2])
+replays = []
+original = dashboard_write._read_state_once
+dashboard_write._read_state_once = lambda path: replays.append(path) or original(path)
+dashboard_write.cmd_add_action(state_path, [{"cmd": "cmd_2", "pj": "p", "type": "t", "content": "c"}])
+dashboard_write.cmd_remove_action(state_path, ["cmd_1"])
+print("replays:", len(replays))
+PYEOF
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "追加完了: ar_002 (cmd_2 / p)" ]
+    [ "${lines[2]}" = "replays: 0" ]
+
+    run show_actions
+    [ "$output" = "action: ar_002:cmd_2:p" ]
+}
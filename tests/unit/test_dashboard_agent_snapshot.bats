@@ -0,0 +1,133 @@
+#!/usr/bin/env bats
+# test_dashboard_agent_snapshot.bats — dashboard_read.py エージェント状態スナップショットのテスト
+#
+# テスト構成:
+#   T-001: settings.yaml の ashigaru_count 人分だけを進行中・要約・JSONに出す
+#   T-002: settings.yaml が無ければ従来どおり足軽8人分を見る
+#   T-003: 要約の生成で各タスクYAMLを1回ずつしか読まない
+#   T-004: 読めないタスクYAMLは unknown、進行中には出さない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_agents_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    printf 'action_required: []\nprojects: []\narchives: []\n' > "$q/dashboard_state.yaml"
+    local i
+    for i in 1 2 3 9; do
+        printf 'cmd_id: cmd_%s\nassigned_to: ashigaru%s\ntask_id: subtask_%s\ntitle: 作業%s\nstatus: in_progress\n' \
+            "$i" "$i" "$i" "$i" > "$q/tasks/ashigaru$i.yaml"
+    done
+    printf 'status: idle\n' > "$q/tasks/gunshi.yaml"
+    export READ="$TEST_TMPDIR/scripts/dashboard_read.py"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# JSON出力のエージェント一覧と進行中タスクを表示する
+show_agents() {
+    "$PYTHON" "$READ" --format json | "$PYTHON" -c "
+import json, sys
+model = json.load(sys.stdin)
+print(' '.join(f\"{a['agent']}={a['status']}\" for a in model['agents']))
+print(' '.join(t['assigned_to'] for t in model['in_progress']))
+print(model['agents'][0]['path'])
+"
+}
+
+# =============================================================================
+# T-001: ashigaru_count
+# =============================================================================
+
+@test "T-001: only ashigaru_count agents from settings.yaml are reported" {
+    printf 'language: ja\nashigaru_count: 2\n' > "$TEST_TMPDIR/config/settings.yaml"
+
+    run show_agents
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "ashigaru1=in_progress ashigaru2=in_progress gunshi=idle" ]
+    [ "${lines[1]}" = "ashigaru1 ashigaru2" ]
+    [ "${lines[2]}" = "queue/tasks/ashigaru1.yaml" ]
+
+    run "$PYTHON" "$READ" --format summary
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"📋 進行中: ashigaru1=subtask_1(?), ashigaru2=subtask_2(?)"* ]]
+    [[ "$output" == *"足軽状態: ashigaru1=in_progress, ashigaru2=in_progress"* ]]
+    [[ "$output" != *"ashigaru3"* ]]
+
+    run "$PYTHON" "$READ" --section progress
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"| ashigaru2 | 作業2 |"* ]]
+    [[ "$output" != *"ashigaru3"* ]]
+}
+
+# =============================================================================
+# T-002: settings.yaml なし
+# =============================================================================
+
+@test "T-002: without settings.yaml the eight default ashigaru are read" {
+    run show_agents
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "ashigaru1=in_progress ashigaru2=in_progress ashigaru3=in_progress gunshi=idle" ]
+    [ "${lines[1]}" = "ashigaru1 ashigaru2 ashigaru3" ]
+}
+
+# =============================================================================
+# T-003: 1回だけ読む
+# =============================================================================
+
+@test "T-003: the summary reads each task YAML only once" {
+    printf 'ashigaru_count: 3\n' > "$TEST_TMPDIR/config/settings.yaml"
+    run "$PYTHON" -c "
+import builtins, collections, os, sys
+sys.path.insert(0, os.path.join(sys.argv[1], 'scripts'))
+sys.argv = ['dashboard_read.py', '--format', 'summary']
+opened = collections.Counter()
+real_open = builtins.open
+def counting_open(file, *args, **kwargs):
+    if '/queue/tasks/' in str(file):
+        opened[os.path.basename(str(file))] += 1
+    return real_open(file, *args, **kwargs)
+builtins.open = counting_open
+import dashboard_read
+dashboard_read.main()
+print(sorted(opened.items()))
+" "$TEST_TMPDIR"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"足軽状態: ashigaru1=in_progress, ashigaru2=in_progress, ashigaru3=in_progress"* ]]
+    [ "${lines[-1]}" = "[('ashigaru1.yaml', 1), ('ashigaru2.yaml', 1), ('ashigaru3.yaml', 1), ('gunshi.yaml', 1)]" ]
+}
+
+# =============================================================================
+# T-004: 読めないファイル
+# =============================================================================
+
+@test "T-004: an unreadable task YAML is unknown and not in progress" {
+    printf 'ashigaru_count: 2\n' > "$TEST_TMPDIR/config/settings.yaml"
+    printf 'status: [in_progress\n' > "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml"
+
+    run show_agents
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "ashigaru1=in_progress ashigaru2=unknown gunshi=idle" ]
+    [ "${lines[1]}" = "ashigaru1" ]
+}
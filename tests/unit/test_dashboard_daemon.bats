@@ -0,0 +1,386 @@
+#!/usr/bin/env bats
+# test_dashboard_daemon.bats — dashboard_daemon.py / dashboard_client.py テスト
+#
+# テスト構成:
+#   T-001: デーモン経由の出力（全体・各セクション・summary・json）が直接実行と同一
+#   T-002: デーモン経由の全体生成が直接実行と同じ dashboard.md を書く
+#   T-003: state ファイル・操作ログ・タスク・報告への外部からの書き込み後、デーモンが読み直す
+#   T-004: --no-cache / --reindex はデーモンに任せず直接処理する（デーモンも fallback を返す）
+#   T-005: デーモンが居ない・ソケットが残骸の時は、読み書きとも直接処理に切り替わる
+#   T-006: 監視イベントがまだ届いていなくても、stat の比較で書いた直後の変更を拾う
+#   T-007: 要求の処理中に SIGTERM を受けても、その要求に応答してから停止する
+#   T-008: 要求を送ってこないクライアントが他の要求を待たせるのは REQUEST_READ_TIMEOUT まで
+#   T-009: デーモンに任せる時の CLI は PyYAML も実装モジュールも import しない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_daemon_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    cat > "$q/dashboard_state.yaml" <<'YAML'
+action_required:
+- id: ar_001
+  cmd_id: cmd_1
+  project: pj_a
+  type: 殿判断待ち
+  content: push許可待ち
+  added: '2026-01-01'
+projects: []
+archives: []
+YAML
+    printf 'cmd_id: cmd_2\nproject: pj_a\nassigned_to: ashigaru1\ntask_id: subtask_2\ntitle: 実装\nstatus: in_progress\n' > "$q/tasks/ashigaru1.yaml"
+    printf 'status: idle\n' > "$q/tasks/gunshi.yaml"
+    printf 'timestamp: "%sT09:00:00"\ncmd_id: cmd_0\nproject: pj_a\nsummary: 朝の戦果\n' "$(date +%Y-%m-%d)" > "$q/reports/r1.yaml"
+    export READ="$TEST_TMPDIR/scripts/dashboard_read.py"
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export DAEMON="$TEST_TMPDIR/scripts/dashboard_daemon.py"
+    export SOCK="$q/.dashboard_daemon.sock"
+    export STATE="$q/dashboard_state.yaml"
+    export DASHBOARD_NO_DAEMON=
+    age "$TEST_TMPDIR/config/dashboard_config.yaml" "$STATE" "$q"/tasks/*.yaml "$q"/reports/*.yaml
+}
+
+teardown() {
+    if [ -S "$SOCK" ]; then
+        "$PYTHON" "$DAEMON" --stop > /dev/null 2>&1 || true
+    fi
+    [ -n "${DAEMON_PID:-}" ] && wait "$DAEMON_PID" 2>/dev/null || true
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# ファイルの mtime を1分前にする（RACY_WINDOW_NS の外に出して、stat の比較で変更を検出させる）
+age() {
+    "$PYTHON" -c 'import os, sys, time
+ns = time.time_ns() - 60_000_000_000
+for path in sys.argv[1:]:
+    if os.path.exists(path):
+        os.utime(path, ns=(ns, ns))' "$@"
+}
+
+start_daemon() {
+    "$PYTHON" "$DAEMON" 2> "$TEST_TMPDIR/daemon.err" &
+    DAEMON_PID=$!
+    local _
+    # 残骸ソケットが先にあるので、ファイルの有無ではなく応答で待つ
+    for _ in $(seq 1 50); do
+        "$PYTHON" "$DAEMON" --status > /dev/null 2>&1 && return 0
+        sleep 0.1
+    done
+    return 1
+}
+
+# デーモンに直接 read 要求を送り、応答の標準出力を表示する（デーモンが答えたことの確認用）
+daemon_read() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$TEST_TMPDIR" "$@" <<'PYEOF'
+import json, sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_client
+response = dashboard_client.request(Path(sys.argv[2]), {"tool": "read", "argv": sys.argv[3:]})
+if response is None or "stdout" not in response:
+    print("no daemon response:", json.dumps(response, ensure_ascii=False))
+    sys.exit(1)
+sys.stdout.write(response["stdout"])
+sys.exit(response["exit"])
+PYEOF
+}
+
+# 直接実行（DASHBOARD_NO_DAEMON=1）の標準出力
+direct_read() {
+    DASHBOARD_NO_DAEMON=1 "$PYTHON" "$READ" "$@" 2> /dev/null
+}
+
+# 時刻に依存する行・キー（最終更新 / generated_at）を取り除く
+normalize() {
+    "$PYTHON" -c 'import json, sys
+text = sys.stdin.read()
+try:
+    model = json.loads(text)
+except ValueError:
+    print("\n".join(l for l in text.splitlines() if "最終更新" not in l))
+else:
+    model.pop("generated_at", None)
+    print(json.dumps(model, ensure_ascii=False, sort_keys=True))'
+}
+
+# =============================================================================
+# T-001: 出力の同一性
+# =============================================================================
+
+@test "T-001: daemon output matches a direct dashboard_read.py run" {
+    start_daemon
+
+    local args
+    for args in "--stdout" "--section action" "--section progress" "--section senka" \
+                "--format summary" "--format json" "--format json --section action"; do
+        # shellcheck disable=SC2086
+        diff <(daemon_read $args | normalize) <(direct_read $args | normalize)
+        # shellcheck disable=SC2086
+        diff <("$PYTHON" "$READ" $args 2> /dev/null | normalize) <(direct_read $args | normalize)
+    done
+    run daemon_read --section action
+    [[ "$output" == *"push許可待ち"* ]]
+}
+
+# =============================================================================
+# T-002: 全体生成
+# =============================================================================
+
+@test "T-002: full generation through the daemon writes the same dashboard.md" {
+    DASHBOARD_NO_DAEMON=1 "$PYTHON" "$READ" 2> /dev/null
+    mv "$TEST_TMPDIR/dashboard.md" "$TEST_TMPDIR/direct.md"
+
+    start_daemon
+    run daemon_read
+    [ "$status" -eq 0 ]
+    diff <(normalize < "$TEST_TMPDIR/direct.md") <(normalize < "$TEST_TMPDIR/dashboard.md")
+
+    # 2回目は内容が同じなので書き込みを省略する
+    run "$PYTHON" "$READ"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"変更なし（書き込み省略）"* ]]
+}
+
+# =============================================================================
+# T-003: 外部からの書き込みで無効化
+# =============================================================================
+
+@test "T-003: the daemon picks up external writes to the state, tasks and reports" {
+    start_daemon
+    daemon_read --stdout > /dev/null
+
+    # state ファイルの手編集（mtime を古くしても、stat が前回と違えば読み直す）
+    cat > "$STATE" <<'YAML'
+action_required:
+- id: ar_005
+  cmd_id: cmd_hand
+  project: pj_b
+  type: 要確認
+  content: 手で書いた要対応
+projects: []
+archives: []
+YAML
+    age "$STATE"
+    run daemon_read --section action
+    [[ "$output" == *"手で書いた要対応"* ]]
+    [[ "$output" != *"push許可待ち"* ]]
+
+    # デーモンを通さない書き手（直接モードの dashboard_write.py → 操作ログへの追記）
+    DASHBOARD_NO_DAEMON=1 "$PYTHON" "$WRITE" add-action --cmd cmd_direct --pj pj_c --type 要確認 --content 直接書いた要対応 > /dev/null
+    run daemon_read --section action
+    [[ "$output" == *"手で書いた要対応"* ]]
+    [[ "$output" == *"直接書いた要対応"* ]]
+
+    # タスクYAML
+    printf 'cmd_id: cmd_7\nproject: pj_a\nassigned_to: ashigaru2\ntask_id: subtask_7\ntitle: 新任務\nstatus: assigned\n' \
+        > "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml"
+    run daemon_read --section progress
+    [[ "$output" == *"新任務"* ]]
+
+    # 報告の追加と書き換え
+    printf 'timestamp: "%sT11:00:00"\ncmd_id: cmd_9\nproject: pj_a\nsummary: 昼の戦果\n' "$(date +%Y-%m-%d)" \
+        > "$TEST_TMPDIR/queue/reports/r2.yaml"
+    run daemon_read --section senka
+    [[ "$output" == *"昼の戦果"* ]]
+    printf 'timestamp: "%sT09:00:00"\ncmd_id: cmd_0\nproject: pj_a\nsummary: 朝の戦果（訂正）\n' "$(date +%Y-%m-%d)" \
+        > "$TEST_TMPDIR/queue/reports/r1.yaml"
+    run daemon_read --section senka
+    [[ "$output" == *"朝の戦果（訂正）"* ]]
+
+    diff <(daemon_read --format json | normalize) <(direct_read --format json | normalize)
+}
+
+# =============================================================================
+# T-004: --no-cache / --reindex
+# =============================================================================
+
+@test "T-004: --no-cache and --reindex are handled directly, not by the daemon" {
+    start_daemon
+
+    run "$PYTHON" - "$TEST_TMPDIR/scripts" "$TEST_TMPDIR" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_client
+for argv in (["--no-cache"], ["--reindex"], ["--stdout", "--no-cache"]):
+    print(dashboard_client.request(Path(sys.argv[2]), {"tool": "read", "argv": argv}))
+PYEOF
+    [ "$status" -eq 0 ]
+    [ "$output" = "{'fallback': True}
+{'fallback': True}
+{'fallback': True}" ]
+
+    # クライアントはそのまま直接処理して結果を出す
+    run "$PYTHON" "$READ" --no-cache --stdout
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"push許可待ち"* ]]
+    run "$PYTHON" "$READ" --reindex
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"生成完了"* ]]
+    [ -d "$TEST_TMPDIR/queue/reports/.report_index" ]
+}
+
+# =============================================================================
+# T-005: デーモン不在・残骸ソケット
+# =============================================================================
+
+@test "T-005: without a live daemon, reads and writes fall back to direct processing" {
+    # ソケットファイルだけが残っている（前回の異常終了）
+    "$PYTHON" -c 'import socket, sys; s = socket.socket(socket.AF_UNIX); s.bind(sys.argv[1])' "$SOCK"
+    [ -S "$SOCK" ]
+
+    run "$PYTHON" "$READ" --section action
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"push許可待ち"* ]]
+    run "$PYTHON" "$WRITE" add-action --cmd cmd_3 --pj pj_a --type 要確認 --content 残骸でも書ける
+    [ "$status" -eq 0 ]
+    run "$PYTHON" "$READ" --no-cache --section action
+    [[ "$output" == *"残骸でも書ける"* ]]
+
+    # デーモンは残骸ソケットを置き換えて起動できる
+    start_daemon
+    run "$PYTHON" "$DAEMON" --status
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"dashboard_daemon 稼働中"* ]]
+
+    # 停止後はソケットが消え、直接処理に戻る
+    "$PYTHON" "$DAEMON" --stop > /dev/null
+    wait "$DAEMON_PID"
+    [ ! -e "$SOCK" ]
+    run "$PYTHON" "$DAEMON" --status
+    [ "$status" -eq 1 ]
+    run "$PYTHON" "$READ" --section action
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"残骸でも書ける"* ]]
+}
+
+# =============================================================================
+# T-006: 監視イベントより先に来た要求
+# =============================================================================
+
+@test "T-006: a request right after a write is fresh even before the watcher reports it" {
+    run "$PYTHON" - "$TEST_TMPDIR/scripts" "$TEST_TMPDIR" <<'PYEOF'
+import argparse, io, sys
+from contextlib import redirect_stdout
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_daemon
+root = Path(sys.argv[2])
+daemon = dashboard_daemon.DashboardDaemon(root)
+daemon._signatures = daemon.poll_signatures()
+# inotifywait が動いているが、まだイベントを1件も読んでいない状態
+daemon._watcher = argparse.Namespace()
+
+def section(name):
+    return daemon.handle({"tool": "read", "argv": ["--section", name]})["stdout"]
+
+assert "実装" in section("progress")
+(root / "queue/tasks/ashigaru1.yaml").write_text(
+    "cmd_id: cmd_2\nproject: pj_a\nassigned_to: ashigaru1\ntask_id: subtask_2\ntitle: 書き換え後\nstatus: in_progress\n",
+    encoding="utf-8")
+assert "書き換え後" in section("progress"), section("progress")
+(root / "queue/dashboard_state.yaml").write_text("action_required: []\nprojects: []\narchives: []\n", encoding="utf-8")
+assert "push許可待ち" not in section("action")
+print("ok")
+PYEOF
+    [ "$status" -eq 0 ]
+    [ "${lines[-1]}" = "ok" ]
+}
+
+# =============================================================================
+# T-007: 処理中の SIGTERM
+# =============================================================================
+
+@test "T-007: SIGTERM during a request answers it and then stops the daemon" {
+    start_daemon
+
+    # state のロックを握って、書き込み要求をデーモンの中で待たせる
+    "$PYTHON" -c 'import fcntl, sys, time
+f = open(sys.argv[1] + ".lock", "a")
+fcntl.flock(f, fcntl.LOCK_EX)
+open(sys.argv[2], "w").close()
+time.sleep(2)' "$STATE" "$TEST_TMPDIR/held" &
+    local holder=$!
+    while [ ! -e "$TEST_TMPDIR/held" ]; do sleep 0.1; done
+    "$PYTHON" "$WRITE" add-action --cmd cmd_t --pj pj_a --type 要確認 --content 停止直前の要対応 \
+        > "$TEST_TMPDIR/write.out" 2>&1 &
+    local writer=$!
+    sleep 0.5
+    kill -TERM "$DAEMON_PID"
+
+    wait "$holder"
+    wait "$writer"
+    grep -q "停止直前の要対応" <(DASHBOARD_NO_DAEMON=1 "$PYTHON" "$WRITE" list-action)
+    # デーモンは応答後に終了し、ソケットを片付ける
+    local _
+    for _ in $(seq 1 30); do
+        kill -0 "$DAEMON_PID" 2> /dev/null || break
+        sleep 0.1
+    done
+    ! kill -0 "$DAEMON_PID" 2> /dev/null
+    [ ! -e "$SOCK" ]
+}
+
+# =============================================================================
+# T-008: 送ってこないクライアント
+# =============================================================================
+
+@test "T-008: a client that never sends its request stalls others only briefly" {
+    start_daemon
+
+    "$PYTHON" -c 'import socket, sys, time
+s = socket.socket(socket.AF_UNIX)
+s.connect(sys.argv[1])
+time.sleep(5)' "$SOCK" &
+    local idle=$!
+    sleep 0.2
+
+    local start end
+    start=$(date +%s%N)
+    run "$PYTHON" "$DAEMON" --status
+    end=$(date +%s%N)
+    kill "$idle" 2> /dev/null || true
+    [ "$status" -eq 0 ]
+    # REQUEST_READ_TIMEOUT（1秒）+ 起動時間。クライアント側の上限（10秒）までは待たない
+    [ $(( (end - start) / 1000000 )) -lt 3000 ]
+}
+
+# =============================================================================
+# T-009: 薄いクライアント
+# =============================================================================
+
+@test "T-009: forwarded CLI runs import neither yaml nor the implementation modules" {
+    start_daemon
+
+    local cmd
+    for cmd in "$READ --section action" "$WRITE list-action"; do
+        # shellcheck disable=SC2086
+        "$PYTHON" -X importtime $cmd 2> "$TEST_TMPDIR/imports" > /dev/null
+        grep -q "dashboard_client" "$TEST_TMPDIR/imports"
+        ! grep -Eq "[| ](yaml|dashboard_validate|dashboard_write|atomic_write)$" "$TEST_TMPDIR/imports"
+    done
+
+    # デーモンが居なければ同じ CLI が直接処理する
+    "$PYTHON" "$DAEMON" --stop > /dev/null
+    wait "$DAEMON_PID"
+    "$PYTHON" -X importtime "$READ" --section action 2> "$TEST_TMPDIR/imports" > /dev/null
+    grep -Eq "[| ]yaml$" "$TEST_TMPDIR/imports"
+}
@@ -0,0 +1,68 @@
+#!/usr/bin/env bats
+# test_dashboard_layout.bats — ダッシュボードスクリプトをリポジトリの配置のまま実行するテスト
+#
+# 他の dashboard テストはスクリプトを1つのディレクトリへ平らにコピーするため、
+# scripts/bakuhu/ から scripts/ 直下の atomic_write.py を import できるかはここで確かめる。
+#
+# テスト構成:
+#   T-001: リポジトリ内の scripts/bakuhu/ から直接起動できる
+#   T-002: scripts/bakuhu/ と scripts/atomic_write.py の配置で書き込み・生成まで動く
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_layout_test.XXXXXX")"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# =============================================================================
+# T-001: リポジトリの場所から起動
+# =============================================================================
+
+@test "T-001: dashboard scripts start from scripts/bakuhu in the repository" {
+    local name
+    for name in dashboard_read dashboard_write dashboard_daemon dashboard_validate; do
+        run "$PYTHON" "$PROJECT_ROOT/scripts/bakuhu/$name.py" --help
+        [ "$status" -eq 0 ]
+        [[ "$output" != *"ModuleNotFoundError"* ]]
+    done
+}
+
+# =============================================================================
+# T-002: 入れ子の配置での書き込みと生成
+# =============================================================================
+
+@test "T-002: write and render work with atomic_write.py one level up" {
+    # scripts/bakuhu/*.py の project_root は scripts/（スクリプトの一つ上）
+    local root="$TEST_TMPDIR/scripts"
+    mkdir -p "$root/bakuhu" "$root/config" "$root/queue/tasks" "$root/queue/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$root/bakuhu/"
+    cp "$PROJECT_ROOT/scripts/atomic_write.py" "$root/"
+    cat > "$root/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    printf 'action_required: []\nprojects: []\narchives: []\n' > "$root/queue/dashboard_state.yaml"
+
+    run "$PYTHON" "$root/bakuhu/dashboard_write.py" add-action --cmd cmd_1 --pj pj_a --type 要確認 --content 配置テスト
+    [ "$status" -eq 0 ]
+    run "$PYTHON" "$root/bakuhu/dashboard_read.py"
+    [ "$status" -eq 0 ]
+    grep -q "配置テスト" "$root/dashboard.md"
+}
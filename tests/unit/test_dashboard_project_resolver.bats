@@ -0,0 +1,143 @@
+#!/usr/bin/env bats
+# test_dashboard_project_resolver.bats — dashboard_write.py cmd_id → project 解決テスト
+#
+# テスト構成:
+#   T-001: commands_dir / tasks / shogun_to_karo / アーカイブの各解決元から解決でき、優先順が保たれる
+#   T-002: slim_yaml でアーカイブへ移されたコマンド・タスクも解決できる
+#   T-003: 解決元のファイルを書き換えると表が更新される
+#   T-004: 解決できなければ従来どおりエラー終了する
+#   T-005: 変化が無ければ表を書き直さない
+#   T-006: archive_store へ退避されたコマンドも索引から解決できる
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_resolver_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports" "$q/commands" "$q/archive/tasks"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+commands_dir: queue/commands
+YAML
+    printf 'project: pj_cmdfile\n' > "$q/commands/cmd_1.yaml"
+    printf 'cmd_id: cmd_1\nproject: pj_task_loses\n' > "$q/tasks/ashigaru1.yaml"
+    printf 'cmd_id: cmd_2\nproject: pj_task\n' > "$q/tasks/ashigaru2.yaml"
+    printf 'commands:\n- id: cmd_3\n  project: pj_queue\n  status: pending\n' > "$q/shogun_to_karo.yaml"
+    printf 'commands:\n- id: cmd_4\n  project: pj_archived_cmd\n  status: done\n' > "$q/archive/shogun_to_karo_20260101000000.yaml"
+    printf 'task:\n  task_id: subtask_5\n  parent_cmd: cmd_5\n  project: pj_archived_task\n  status: done\n' \
+        > "$q/archive/tasks/ashigaru3_20260101000000.yaml"
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export INDEX="$q/.cmd_project_index.json"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# add-senka を --pj なしで実行し、自動解決された project を表示する
+resolve() {
+    "$PYTHON" "$WRITE" add-senka --cmd "$1" --content c 2>&1 >/dev/null | sed -n 's/^--pj 自動解決: \([^ ]*\) .*/\1/p'
+}
+
+# =============================================================================
+# T-001: 各解決元と優先順
+# =============================================================================
+
+@test "T-001: every source resolves and earlier sources take priority" {
+    [ "$(resolve cmd_1)" = "pj_cmdfile" ]
+    [ "$(resolve cmd_2)" = "pj_task" ]
+    [ "$(resolve cmd_3)" = "pj_queue" ]
+    [ "$(resolve cmd_4)" = "pj_archived_cmd" ]
+    [ "$(resolve cmd_5)" = "pj_archived_task" ]
+    [ -f "$INDEX" ]
+}
+
+# =============================================================================
+# T-002: slim_yaml 後
+# =============================================================================
+
+@test "T-002: commands and tasks swept into queue/archive still resolve" {
+    [ "$(resolve cmd_3)" = "pj_queue" ]
+    [ "$(resolve cmd_2)" = "pj_task" ]
+
+    # slim_yaml と同じく、完了コマンドと完了タスクをアーカイブへ移す
+    mv "$TEST_TMPDIR/queue/shogun_to_karo.yaml" "$TEST_TMPDIR/queue/archive/shogun_to_karo_20260102000000.yaml"
+    printf 'commands: []\n' > "$TEST_TMPDIR/queue/shogun_to_karo.yaml"
+    mv "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml" "$TEST_TMPDIR/queue/archive/tasks/ashigaru2_20260102000000.yaml"
+
+    [ "$(resolve cmd_3)" = "pj_queue" ]
+    [ "$(resolve cmd_2)" = "pj_task" ]
+}
+
+# =============================================================================
+# T-003: 書き換えの反映
+# =============================================================================
+
+@test "T-003: editing a source file updates the table" {
+    [ "$(resolve cmd_2)" = "pj_task" ]
+    # mtime の粒度に依らず変化が見えるよう、大きさも変える
+    printf 'cmd_id: cmd_2\nproject: pj_task_renamed\n' > "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml"
+    [ "$(resolve cmd_2)" = "pj_task_renamed" ]
+
+    printf 'project: pj_new_cmdfile\n' > "$TEST_TMPDIR/queue/commands/cmd_9.yaml"
+    [ "$(resolve cmd_9)" = "pj_new_cmdfile" ]
+}
+
+# =============================================================================
+# T-004: 解決不能
+# =============================================================================
+
+@test "T-004: an unknown cmd_id without --pj is still an error" {
+    run "$PYTHON" "$WRITE" add-action --cmd cmd_unknown --type t --content c
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"cmd_id=cmd_unknown からプロジェクトを自動解決できませんでした"* ]]
+}
+
+# =============================================================================
+# T-005: 無変更なら書き直さない
+# =============================================================================
+
+@test "T-005: the table is not rewritten when nothing changed" {
+    # 全解決元を racy window の外へ
+    find "$TEST_TMPDIR/queue" -exec touch -d '1 hour ago' {} +
+    resolve cmd_1 > /dev/null
+    local before
+    before="$(stat -c '%i %Y' "$INDEX")"
+
+    [ "$(resolve cmd_4)" = "pj_archived_cmd" ]
+    [ "$(stat -c '%i %Y' "$INDEX")" = "$before" ]
+}
+
+# =============================================================================
+# T-006: archive_store の索引
+# =============================================================================
+
+@test "T-006: commands moved into the archive store resolve from its index" {
+    local store="$TEST_TMPDIR/queue/archive/store"
+    mkdir -p "$store"
+    printf '%s\n' '{"kind": "command", "id": "cmd_7", "agent": null, "cmd_id": "cmd_7", "project": "pj_store", "segment": "2026-01-01.jsonl.gz", "offset": 0, "length": 1, "seq": 0}' \
+        > "$store/2026-01-01.index.jsonl"
+    [ "$(resolve cmd_7)" = "pj_store" ]
+
+    # 当日の索引への追記も拾う（追記途中の行は読み飛ばす）
+    printf '%s\n%s' '{"kind": "task", "id": "subtask_8", "cmd_id": "cmd_8", "project": "pj_store_task"}' '{"kind": "tas' \
+        >> "$store/2026-01-01.index.jsonl"
+    [ "$(resolve cmd_8)" = "pj_store_task" ]
+    # 既存の解決元が優先
+    [ "$(resolve cmd_1)" = "pj_cmdfile" ]
+}
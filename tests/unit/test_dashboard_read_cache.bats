@@ -0,0 +1,252 @@
+#!/usr/bin/env bats
+# test_dashboard_read_cache.bats — dashboard_read.py セクションキャッシュ・書き込み省略テスト
+#
+# テスト構成:
+#   T-001: 変更のない再実行は全セクションがキャッシュヒットし、state もタスクも読まない
+#   T-002: state の変更で action / related だけ作り直し、タスクは読まない
+#   T-003: タスクYAMLの変更で progress だけ作り直し、state は読まない
+#   T-004: 生成内容が同じならダッシュボードを書き直さない（mtime が変わらない）
+#   T-005: 直近に更新された入力（RACY_WINDOW_NS 内）のセクションはキャッシュしない
+#   T-006: --no-cache はキャッシュを読まず、キャッシュファイルも書かない
+#   T-007: 直近に更新された config ではキャッシュを読みも書きもしない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_cache_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    cat > "$q/dashboard_state.yaml" <<'YAML'
+action_required:
+- id: ar_001
+  cmd_id: cmd_1
+  project: pj_a
+  type: 要確認
+  content: 初回の要対応
+  added: '2026-01-01'
+projects: []
+archives: []
+YAML
+    printf 'cmd_id: cmd_2\nproject: pj_a\nassigned_to: ashigaru1\ntask_id: subtask_2\ntitle: 実装\nstatus: in_progress\n' > "$q/tasks/ashigaru1.yaml"
+    export READ="$TEST_TMPDIR/scripts/dashboard_read.py"
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export STATE="$q/dashboard_state.yaml"
+    export DASHBOARD="$TEST_TMPDIR/dashboard.md"
+    export DASHBOARD_NO_DAEMON=1
+    age "$TEST_TMPDIR/config/dashboard_config.yaml" "$STATE" "$q/tasks/ashigaru1.yaml"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# ファイルの mtime を1分前にする（RACY_WINDOW_NS の外に出して、キャッシュに載るようにする）
+age() {
+    "$PYTHON" -c 'import os, sys, time
+ns = time.time_ns() - 60_000_000_000
+for path in sys.argv[1:]:
+    if os.path.exists(path):
+        os.utime(path, ns=(ns, ns))' "$@"
+}
+
+# dashboard_read.main() を実行し、state / タスク / 報告を読んだ回数と再計算したセクションを表示する
+read_counts() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$@" <<'PYEOF' 2> "$TEST_TMPDIR/read.err"
+import sys
+sys.path.insert(0, sys.argv[1])
+import dashboard_read
+calls = {"state": 0, "agents": 0, "reports": 0}
+built = []
+for name, key in (("load_state", "state"), ("load_agent_snapshot", "agents"), ("load_today_reports", "reports")):
+    def wrapper(*a, _orig=getattr(dashboard_read, name), _key=key):
+        calls[_key] += 1
+        return _orig(*a)
+    setattr(dashboard_read, name, wrapper)
+for name in ("action", "progress", "related"):
+    builder = f"build_{name}_section" if name != "related" else "build_related_files_section"
+    def build(*a, _orig=getattr(dashboard_read, builder), _name=name):
+        built.append(_name)
+        return _orig(*a)
+    setattr(dashboard_read, builder, build)
+sys.argv = ["dashboard_read.py"] + sys.argv[2:]
+dashboard_read.main()
+print(" ".join(f"{k}={v}" for k, v in calls.items()), "built:", *built)
+PYEOF
+}
+
+mtime_ns() {
+    "$PYTHON" -c 'import os, sys; print(os.stat(sys.argv[1]).st_mtime_ns)' "$1"
+}
+
+# =============================================================================
+# T-001: 変更なし → キャッシュヒット
+# =============================================================================
+
+@test "T-001: an unchanged tree is served from the section cache" {
+    run read_counts
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=1 agents=1 reports=1 built: action progress related" ]
+    [ -f "$TEST_TMPDIR/queue/.dashboard_read_cache.json" ]
+    cp "$DASHBOARD" "$TEST_TMPDIR/first.md"
+
+    # senka は報告索引から毎回組み立てるので reports だけは読む
+    run read_counts
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=0 agents=0 reports=1 built:" ]
+    diff "$TEST_TMPDIR/first.md" "$DASHBOARD"
+}
+
+# =============================================================================
+# T-002: state の変更
+# =============================================================================
+
+@test "T-002: a state change rebuilds the action and related sections only" {
+    read_counts > /dev/null
+    "$PYTHON" "$WRITE" add-action --cmd cmd_9 --pj pj_b --type 要確認 --content 追加の要対応 > /dev/null
+    age "$STATE" "$TEST_TMPDIR/queue/dashboard_state.oplog.jsonl"
+
+    run read_counts
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=1 agents=0 reports=1 built: action related" ]
+    grep -q "追加の要対応" "$DASHBOARD"
+    grep -q "初回の要対応" "$DASHBOARD"
+
+    run read_counts
+    [ "$output" = "state=0 agents=0 reports=1 built:" ]
+}
+
+# =============================================================================
+# T-003: タスクの変更
+# =============================================================================
+
+@test "T-003: a task change rebuilds the progress section only" {
+    read_counts > /dev/null
+    printf 'cmd_id: cmd_3\nproject: pj_c\nassigned_to: ashigaru2\ntask_id: subtask_3\ntitle: 新しい任務\nstatus: assigned\n' \
+        > "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml"
+    age "$TEST_TMPDIR/queue/tasks/ashigaru2.yaml"
+
+    run read_counts
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=0 agents=1 reports=1 built: progress" ]
+    grep -q "新しい任務" "$DASHBOARD"
+
+    # 足軽の人数（settings.yaml）も progress の入力
+    printf 'ashigaru_count: 1\n' > "$TEST_TMPDIR/config/settings.yaml"
+    age "$TEST_TMPDIR/config/settings.yaml"
+    run read_counts
+    [ "$output" = "state=0 agents=1 reports=1 built: progress" ]
+    ! grep -q "新しい任務" "$DASHBOARD"
+}
+
+# =============================================================================
+# T-004: 書き込み省略
+# =============================================================================
+
+@test "T-004: unchanged output does not rewrite the dashboard" {
+    read_counts > /dev/null
+    local before
+    before="$(mtime_ns "$DASHBOARD")"
+
+    run read_counts
+    [ "$status" -eq 0 ]
+    grep -q "変更なし（書き込み省略）" "$TEST_TMPDIR/read.err"
+    [ "$(mtime_ns "$DASHBOARD")" = "$before" ]
+
+    # 入力が変わってもセクションの内容が同じなら書き直さない（mtime だけ変わった state）
+    age "$STATE"
+    run read_counts
+    [ "$output" = "state=1 agents=0 reports=1 built: action related" ]
+    [ "$(mtime_ns "$DASHBOARD")" = "$before" ]
+
+    # 出力ファイルを外から書き換えられたら、内容が同じでも書き直す
+    echo "手書き" > "$DASHBOARD"
+    run read_counts
+    grep -q "生成完了" "$TEST_TMPDIR/read.err"
+    grep -q "初回の要対応" "$DASHBOARD"
+
+    # 内容が変われば書き直す
+    before="$(mtime_ns "$DASHBOARD")"
+    "$PYTHON" "$WRITE" add-action --cmd cmd_9 --pj pj_b --type 要確認 --content 次の要対応 > /dev/null
+    run read_counts
+    [ "$(mtime_ns "$DASHBOARD")" != "$before" ]
+    grep -q "次の要対応" "$DASHBOARD"
+}
+
+# =============================================================================
+# T-005: 直近に更新された入力
+# =============================================================================
+
+@test "T-005: sections whose inputs changed within the racy window are not cached" {
+    read_counts > /dev/null
+    "$PYTHON" "$WRITE" add-action --cmd cmd_9 --pj pj_b --type 要確認 --content 直後の要対応 > /dev/null
+
+    run read_counts
+    [ "$output" = "state=1 agents=0 reports=1 built: action related" ]
+    # mtime が粗い FS では同じ秒の次の書き込みを見逃し得るので、落ち着くまで毎回作り直す
+    run read_counts
+    [ "$output" = "state=1 agents=0 reports=1 built: action related" ]
+    grep -q "直後の要対応" "$DASHBOARD"
+}
+
+# =============================================================================
+# T-006: --no-cache
+# =============================================================================
+
+@test "T-006: --no-cache rebuilds everything and leaves no cache file" {
+    run read_counts --no-cache
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=1 agents=1 reports=1 built: action progress related" ]
+    [ ! -e "$TEST_TMPDIR/queue/.dashboard_read_cache.json" ]
+
+    run read_counts --no-cache
+    [ "$output" = "state=1 agents=1 reports=1 built: action progress related" ]
+}
+
+# =============================================================================
+# T-007: 直近に更新された config
+# =============================================================================
+
+@test "T-007: a config changed within the racy window neither uses nor saves the cache" {
+    local config="$TEST_TMPDIR/config/dashboard_config.yaml"
+    local cache="$TEST_TMPDIR/queue/.dashboard_read_cache.json"
+    read_counts > /dev/null
+    local before
+    before="$(mtime_ns "$cache")"
+
+    echo "# 1回目" >> "$config"
+    run read_counts
+    [ "$status" -eq 0 ]
+    [ "$output" = "state=1 agents=1 reports=1 built: action progress related" ]
+    [ "$(mtime_ns "$cache")" = "$before" ]
+
+    # 同じ大きさ・同じ mtime のまま再び書き換えられても、前回の結果を使わない
+    local stamp
+    stamp="$(mtime_ns "$config")"
+    sed -i 's/1回目/2回目/' "$config"
+    "$PYTHON" -c 'import os, sys; os.utime(sys.argv[1], ns=(int(sys.argv[2]), int(sys.argv[2])))' "$config" "$stamp"
+    run read_counts
+    [ "$output" = "state=1 agents=1 reports=1 built: action progress related" ]
+
+    # 落ち着けば、また使う
+    age "$config"
+    read_counts > /dev/null
+    run read_counts
+    [ "$output" = "state=0 agents=0 reports=1 built:" ]
+}
@@ -0,0 +1,141 @@
+#!/usr/bin/env bats
+# test_dashboard_read_json.bats — dashboard_read.py --format json テスト
+#
+# テスト構成:
+#   T-001: JSONの件数・内容が Markdown / summary と同じデータを表す
+#   T-002: --section で該当キーだけを出力する
+#   T-003: 値の無いフィールドは null、内容は切り詰めない
+#   T-004: --format json はダッシュボードファイルもセクションキャッシュも書かない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_json_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    cat > "$q/dashboard_state.yaml" <<'YAML'
+action_required:
+- id: ar_001
+  cmd_id: cmd_1
+  project: pj_a
+  type: 殿判断待ち
+  content: push許可待ち
+  added: '2026-01-01'
+- id: ar_002
+  cmd_id: cmd_2
+  project: pj_b
+  type: 要確認
+  content: 確認
+projects: []
+archives: []
+YAML
+    printf 'cmd_id: cmd_3\nproject: pj_c\nassigned_to: ashigaru1\ntask_id: subtask_3\ntitle: 実装\nstatus: in_progress\n' > "$q/tasks/ashigaru1.yaml"
+    printf 'status: idle\n' > "$q/tasks/ashigaru2.yaml"
+    printf 'status: done\n' > "$q/tasks/gunshi.yaml"
+    local today long
+    today="$(date +%Y-%m-%d)"
+    long="$(printf 'あ%.0s' $(seq 1 100))"
+    printf 'timestamp: "%sT09:00:00"\ncmd_id: cmd_3\nproject: pj_c\nsummary: 朝の戦果\n' "$today" > "$q/reports/r1.yaml"
+    printf 'timestamp: "%sT10:00:00"\ntask_id: subtask_4\nsummary: %s\n' "$today" "$long" > "$q/reports/r2.yaml"
+    export READ="$TEST_TMPDIR/scripts/dashboard_read.py"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# JSON出力を変数 model に読んでPythonコードを実行する
+run_json() {
+    local code="$1"
+    shift
+    "$PYTHON" "$READ" --format json "$@" > "$TEST_TMPDIR/out.json" || return 1
+    "$PYTHON" -c "
+import json, sys
+model = json.load(open(sys.argv[1], encoding='utf-8'))
+$code
+" "$TEST_TMPDIR/out.json"
+}
+
+# =============================================================================
+# T-001: Markdown / summary と同じデータ
+# =============================================================================
+
+@test "T-001: JSON carries the same data as the Markdown and summary outputs" {
+    run run_json '
+print(model["counts"])
+print([a["cmd_id"] for a in model["actions"]])
+print(model["action_types"])
+print([(t["assigned_to"], t["task_id"], t["status"]) for t in model["in_progress"]])
+print([s["cmd_id"] for s in model["senka"]])
+print([(a["agent"], a["status"]) for a in model["agents"]])
+'
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "{'action': 2, 'in_progress': 1, 'senka': 2}" ]
+    [ "${lines[1]}" = "['cmd_1', 'cmd_2']" ]
+    [ "${lines[2]}" = "[{'type': '殿判断待ち', 'count': 1}, {'type': '要確認', 'count': 1}]" ]
+    [ "${lines[3]}" = "[('ashigaru1', 'subtask_3', 'in_progress')]" ]
+    [ "${lines[4]}" = "['subtask_4', 'cmd_3']" ]
+    [ "${lines[5]}" = "[('ashigaru1', 'in_progress'), ('ashigaru2', 'idle'), ('gunshi', 'done')]" ]
+
+    run "$PYTHON" "$READ" --format summary
+    [[ "$output" == *"🚨 要対応: 2件"* ]]
+    [[ "$output" == *"✅ 本日の戦果: 2件"* ]]
+    [[ "$output" == *"足軽状態: ashigaru1=in_progress, ashigaru2=idle"* ]]
+    [[ "$output" == *"軍師: done"* ]]
+}
+
+# =============================================================================
+# T-002: --section
+# =============================================================================
+
+@test "T-002: --section limits the JSON to one key" {
+    for pair in action:actions progress:in_progress senka:senka agents:agents; do
+        run run_json 'print(list(model))' --section "${pair%%:*}"
+        [ "$status" -eq 0 ]
+        [ "$output" = "['${pair##*:}']" ]
+    done
+}
+
+# =============================================================================
+# T-003: null と切り詰めなし
+# =============================================================================
+
+@test "T-003: missing fields are null and content is not truncated" {
+    run run_json '
+print(model["actions"][1]["added"])
+senka = model["senka"][0]
+print(senka["project"], len(senka["content"]), senka["timestamp"][11:])
+'
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "None" ]
+    [ "${lines[1]}" = "None 100 10:00:00" ]
+}
+
+# =============================================================================
+# T-004: 書き込みなし
+# =============================================================================
+
+@test "T-004: --format json writes neither the dashboard nor the section cache" {
+    run "$PYTHON" "$READ" --format json
+    [ "$status" -eq 0 ]
+    [ ! -e "$TEST_TMPDIR/dashboard.md" ]
+    [ ! -e "$TEST_TMPDIR/queue/.dashboard_read_cache.json" ]
+}
@@ -0,0 +1,218 @@
+#!/usr/bin/env bats
+# test_dashboard_report_index.bats — dashboard_read.py 報告索引（reports_dir/.report_index）テスト
+#
+# テスト構成:
+#   T-001: 索引から返す本日の報告が、全報告YAMLの走査（scan_today_reports）と一致する
+#   T-002: 報告の追加・本日分の書き換え・削除を索引が拾う
+#   T-003: reports_dir も報告も変わらなければ、報告YAMLを解析し直さない
+#   T-004: 過去日の報告の書き換えは --reindex で作り直すと反映される
+#   T-005: 壊れた・古い形式の索引は作り直す
+#   T-006: --reindex は索引のロックを取ってから消し、.lock は消さない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_index_test.XXXXXX")"
+    export REPORTS="$TEST_TMPDIR/queue/reports"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$TEST_TMPDIR/queue/tasks" "$REPORTS"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    printf 'action_required: []\nprojects: []\narchives: []\n' > "$TEST_TMPDIR/queue/dashboard_state.yaml"
+    export TODAY="$(date +%Y-%m-%d)"
+    export PAST="2026-01-01"
+    write_report r1 "$TODAY" 朝の戦果
+    write_report r2 "$PAST" 過去の戦果
+    printf 'completed_at: "%sT12:00:00"\ntask_id: subtask_3\nsummary: 昼の戦果\n' "$TODAY" > "$REPORTS/r3.yaml"
+    printf 'not: [valid\n' > "$REPORTS/broken.yaml"
+    printf 'summary: 日付なし\n' > "$REPORTS/undated.yaml"
+    export READ="$TEST_TMPDIR/scripts/dashboard_read.py"
+    export DASHBOARD_NO_DAEMON=1
+    age
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+write_report() {
+    printf 'timestamp: "%sT09:00:00"\ncmd_id: cmd_%s\nproject: pj_a\nsummary: %s\n' "$2" "$1" "$3" > "$REPORTS/$1.yaml"
+}
+
+# 報告と reports_dir の mtime を1分前にする（RACY_WINDOW_NS の外に出す）
+age() {
+    "$PYTHON" -c 'import os, sys, time
+ns = time.time_ns() - 60_000_000_000
+for entry in os.scandir(sys.argv[1]):
+    if entry.name.endswith(".yaml"):
+        os.utime(entry.path, ns=(ns, ns))
+os.utime(sys.argv[1], ns=(ns, ns))' "$REPORTS"
+}
+
+# 指定日（既定は本日）の報告の summary を索引から表示し、その間に解析した報告YAMLを添える
+indexed() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$REPORTS" "${1:-$TODAY}" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_read
+parsed = []
+original = dashboard_read.index_report
+dashboard_read.index_report = lambda path: parsed.append(path.name) or original(path)
+reports = dashboard_read.load_indexed_reports(Path(sys.argv[2]), sys.argv[3])
+print("reports:", *(r["summary"] for r in reports))
+print("parsed:", *parsed)
+PYEOF
+}
+
+# =============================================================================
+# T-001: 全走査と一致
+# =============================================================================
+
+@test "T-001: indexed reports for today match a full scan of the report YAMLs" {
+    run indexed
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "reports: 朝の戦果 昼の戦果" ]
+    [ "${lines[1]}" = "parsed: broken.yaml r1.yaml r2.yaml r3.yaml undated.yaml" ]
+
+    run "$PYTHON" - "$TEST_TMPDIR" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1] + "/scripts")
+import dashboard_read
+root = Path(sys.argv[1])
+config = dashboard_read.load_config(root)
+fields = dashboard_read.REPORT_INDEX_FIELDS
+scanned = [{k: r[k] for k in fields if k in r} for r in dashboard_read.scan_today_reports(root, config)]
+indexed = dashboard_read.load_today_reports(root, config)
+assert indexed == scanned, (indexed, scanned)
+print("ok")
+PYEOF
+    [ "$output" = "ok" ]
+
+    run indexed "$PAST"
+    [ "${lines[0]}" = "reports: 過去の戦果" ]
+}
+
+# =============================================================================
+# T-002: 追加・書き換え・削除
+# =============================================================================
+
+@test "T-002: new, rewritten and deleted reports are picked up" {
+    indexed > /dev/null
+
+    # 追加（reports_dir の mtime が変わる）
+    write_report r4 "$TODAY" 夕方の戦果
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果 昼の戦果 夕方の戦果" ]
+
+    # 本日分の書き換え（同じファイルへの上書きでは reports_dir の mtime は変わらない）
+    age
+    write_report r1 "$TODAY" 朝の戦果（訂正）
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果（訂正） 昼の戦果 夕方の戦果" ]
+
+    # 本日分から過去日への書き換えで本日の一覧から外れる
+    age
+    write_report r3 "$PAST" 日付を訂正
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果（訂正） 夕方の戦果" ]
+    run indexed "$PAST"
+    [ "${lines[0]}" = "reports: 過去の戦果 日付を訂正" ]
+
+    # 削除
+    rm "$REPORTS/r4.yaml"
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果（訂正）" ]
+    [ "$(grep -c r4.yaml "$REPORTS/.report_index/$TODAY.json")" -eq 0 ]
+    run "$PYTHON" -c 'import json, sys; print(sorted(json.load(open(sys.argv[1]))))' "$REPORTS/.report_index/files.json"
+    [ "$output" = "['broken.yaml', 'r1.yaml', 'r2.yaml', 'r3.yaml', 'undated.yaml']" ]
+}
+
+# =============================================================================
+# T-003: 変更なし → 解析し直さない
+# =============================================================================
+
+@test "T-003: an unchanged reports directory is not parsed again" {
+    indexed > /dev/null
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果 昼の戦果" ]
+    [ "${lines[1]}" = "parsed:" ]
+}
+
+# =============================================================================
+# T-004: 過去日の書き換えと --reindex
+# =============================================================================
+
+@test "T-004: --reindex rebuilds the index and picks up rewritten past reports" {
+    indexed > /dev/null
+    # 過去日の報告の上書きは、本日分を引く通常の読み込みでは索引に反映されない
+    write_report r2 "$PAST" 過去の戦果（訂正）
+    age
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果 昼の戦果" ]
+    grep -q '"過去の戦果"' "$REPORTS/.report_index/$PAST.json"
+
+    run "$PYTHON" "$READ" --reindex
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"本日の戦果: 2件"* ]]
+    grep -q '"過去の戦果（訂正）"' "$REPORTS/.report_index/$PAST.json"
+    ! grep -q '"過去の戦果"' "$REPORTS/.report_index/$PAST.json"
+}
+
+# =============================================================================
+# T-005: 壊れた・古い索引
+# =============================================================================
+
+@test "T-005: a corrupt or outdated index is rebuilt" {
+    indexed > /dev/null
+    echo '{broken' > "$REPORTS/.report_index/$TODAY.json"
+    echo '{"version": 0, "dir_mtime_ns": 0}' > "$REPORTS/.report_index/meta.json"
+    echo '{"stale": "x"}' > "$REPORTS/.report_index/1999-01-01.json"
+
+    run indexed
+    [ "${lines[0]}" = "reports: 朝の戦果 昼の戦果" ]
+    [ "${lines[1]}" = "parsed: broken.yaml r1.yaml r2.yaml r3.yaml undated.yaml" ]
+    [ ! -e "$REPORTS/.report_index/1999-01-01.json" ]
+}
+
+# =============================================================================
+# T-006: --reindex とロック
+# =============================================================================
+
+@test "T-006: --reindex clears the index under its lock and keeps the lock file" {
+    indexed > /dev/null
+    local inode
+    inode="$(stat -c %i "$REPORTS/.report_index/.lock")"
+
+    # 索引を更新中の dashboard_read の代わりにロックを握る
+    "$PYTHON" -c 'import fcntl, sys, time
+with open(sys.argv[1], "w") as f:
+    fcntl.flock(f, fcntl.LOCK_EX)
+    open(sys.argv[2], "w").close()
+    time.sleep(1.5)' "$REPORTS/.report_index/.lock" "$TEST_TMPDIR/locked" &
+    local holder=$!
+    while [ ! -e "$TEST_TMPDIR/locked" ]; do sleep 0.05; done
+
+    run "$PYTHON" "$READ" --reindex
+    [ "$status" -eq 0 ]
+    # ロックが解放されるまで待ってから消している
+    ! kill -0 "$holder" 2> /dev/null
+    wait "$holder"
+    [ "$(stat -c %i "$REPORTS/.report_index/.lock")" = "$inode" ]
+    grep -q '"過去の戦果"' "$REPORTS/.report_index/$PAST.json"
+}
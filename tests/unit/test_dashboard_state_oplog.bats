@@ -0,0 +1,168 @@
+#!/usr/bin/env bats
+# test_dashboard_state_oplog.bats — dashboard_write.py 操作ログ・畳み込みテスト
+#
+# テスト構成:
+#   T-001: 書き込みは操作ログへの追記だけで、スナップショットを書き直さない
+#   T-002: compact の前後で state が同一、ログは次の世代の空ログになる
+#   T-003: 旧形式の state（世代なし・ログなし）が初回書き込みで移行され、内容が保たれる
+#   T-004: 畳み込みの途中で落ちた（新スナップショット + 古い世代のログ）場合、操作を二重適用しない
+#   T-005: 末尾の書きかけ行は無視され、次の追記は壊れずに続く
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_oplog_test.XXXXXX")"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$TEST_TMPDIR/queue/tasks" "$TEST_TMPDIR/queue/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+commands_dir: queue/commands
+YAML
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export STATE="$TEST_TMPDIR/queue/dashboard_state.yaml"
+    export OPLOG="$TEST_TMPDIR/queue/dashboard_state.oplog.jsonl"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# 再生後の state を要約して表示する（action の id:cmd_id / senka の cmd_id / projects の name）
+show_state() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$STATE" <<'PYEOF'
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_write
+state = dashboard_write.load_state(Path(sys.argv[2]))
+print("action:", *(f"{i['id']}:{i['cmd_id']}" for i in state.get("action_required", [])))
+print("senka:", *(s["cmd_id"] for s in state.get("senka", [])))
+print("projects:", *(p["name"] for p in state.get("projects", [])))
+PYEOF
+}
+
+# =============================================================================
+# T-001: 追記のみ
+# =============================================================================
+
+@test "T-001: writes append to the operation log without rewriting the snapshot" {
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_1 --pj p --content c > /dev/null
+    local before
+    before="$(stat -c '%i %s %Y' "$STATE")"
+    local log_lines
+    log_lines="$(wc -l < "$OPLOG")"
+
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_2 --pj p --content c > /dev/null
+    "$PYTHON" "$WRITE" add-action --cmd cmd_3 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" remove-action --cmd cmd_3 > /dev/null
+
+    [ "$(stat -c '%i %s %Y' "$STATE")" = "$before" ]
+    [ "$(wc -l < "$OPLOG")" -eq $((log_lines + 3)) ]
+
+    run show_state
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = "senka: cmd_1 cmd_2" ]
+}
+
+# =============================================================================
+# T-002: compact
+# =============================================================================
+
+@test "T-002: compact folds the log into the snapshot without changing the state" {
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" add-action --cmd cmd_2 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" remove-action --cmd cmd_1 > /dev/null
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_2 --pj p --content c > /dev/null
+    run show_state
+    local before="$output"
+
+    run "$PYTHON" "$WRITE" compact
+    [ "$status" -eq 0 ]
+
+    run show_state
+    [ "$output" = "$before" ]
+    [ "$(head -1 "$STATE")" = "oplog_generation: 2" ]
+    [ "$(cat "$OPLOG")" = '{"generation": 2}' ]
+}
+
+# =============================================================================
+# T-003: 旧形式からの移行
+# =============================================================================
+
+@test "T-003: a legacy state file without a log is migrated on the first write" {
+    cat > "$STATE" <<'YAML'
+action_required:
+- id: ar_007
+  cmd_id: cmd_old
+  project: p
+  type: t
+  content: c
+  added: '2026-01-01'
+projects:
+- name: legacy_pj
+archives: []
+YAML
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_new --pj p --content c > /dev/null
+
+    run show_state
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "action: ar_007:cmd_old" ]
+    [ "${lines[1]}" = "senka: cmd_new" ]
+    [ "${lines[2]}" = "projects: legacy_pj" ]
+    [ "$(head -1 "$STATE")" = "oplog_generation: 1" ]
+}
+
+# =============================================================================
+# T-004: 畳み込み途中のクラッシュ
+# =============================================================================
+
+@test "T-004: a log left behind by an interrupted compaction is not replayed twice" {
+    "$PYTHON" "$WRITE" add-action --cmd cmd_1 --pj p --type t --content c > /dev/null
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_2 --pj p --content c > /dev/null
+    cp "$OPLOG" "$TEST_TMPDIR/old_log"
+    "$PYTHON" "$WRITE" compact > /dev/null
+    # スナップショットを書いた直後、ログを置き換える前に落ちた状態を再現する
+    cp "$TEST_TMPDIR/old_log" "$OPLOG"
+
+    run show_state
+    [ "${lines[0]}" = "action: ar_001:cmd_1" ]
+    [ "${lines[1]}" = "senka: cmd_2" ]
+
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_3 --pj p --content c > /dev/null
+    run show_state
+    [ "${lines[0]}" = "action: ar_001:cmd_1" ]
+    [ "${lines[1]}" = "senka: cmd_2 cmd_3" ]
+}
+
+# =============================================================================
+# T-005: 書きかけの行
+# =============================================================================
+
+@test "T-005: a torn trailing log line is ignored and later appends stay intact" {
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_1 --pj p --content c > /dev/null
+    printf '{"op": "add-senka", "item": {"cmd_id": "cmd_to' >> "$OPLOG"
+
+    run show_state
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"操作ログの壊れた行を無視します"* ]]
+    [[ "$output" == *"senka: cmd_1"* ]]
+
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_2 --pj p --content c > /dev/null 2>&1
+    run show_state
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"senka: cmd_1 cmd_2"* ]]
+}
@@ -0,0 +1,172 @@
+#!/usr/bin/env bats
+# test_dashboard_validate.bats — dashboard_validate.py ルールエンジンのテスト
+#
+# テスト構成:
+#   T-001: 既定ルール（必須セクション・🚨要対応の✅・200行上限）は従来どおり
+#   T-002: dashboard_config.yaml の validation のルールを1回の走査で検査し、行番号つきで報告する
+#   T-003: --format json は件数・問題・所要時間を出力する
+#   T-004: null にしたルールは検査しない
+#   T-005: dashboard_read.py は検証 ERROR の生成内容を書き込まない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_validate_test.XXXXXX")"
+    local q="$TEST_TMPDIR/queue"
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$q/tasks" "$q/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+YAML
+    printf 'action_required: []\nprojects: []\narchives: []\n' > "$q/dashboard_state.yaml"
+    cat > "$TEST_TMPDIR/dashboard.md" <<'MD'
+# 戦況報告書（Dashboard）
+
+> **最終更新**: 2026-01-01 09:00
+
+## 🚨 要対応（殿のご判断待ち）
+
+| # | cmd_id | PJ | 種別 | 内容 |
+|---|--------|-----|------|------|
+| 1 | cmd_1 | pj | 要確認 | 2026-01-01 追加 |
+| 2 | cmd_2 | pj | 要確認 | ✅ 済 |
+
+## 📋 進行中
+
+（なし）
+
+## ✅ 本日の戦果
+
+| 時刻 | cmd_id | PJ | 内容 |
+|------|--------|-----|------|
+| 09:00 | cmd_3 | pj | ✅ 完了 |
+
+## 📁 関連ファイル
+MD
+    export VALIDATE="$TEST_TMPDIR/scripts/dashboard_validate.py"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# =============================================================================
+# T-001: 既定ルール
+# =============================================================================
+
+@test "T-001: default rules keep the previous checks" {
+    run "$PYTHON" "$VALIDATE"
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"行数: 22"* ]]
+    [[ "$output" == *"⚠️ [WARNING] 🚨 要対応セクションに禁止マーカー(✅)が残存しています: | 2 | cmd_2 | pj | 要確認 | ✅ 済 | (L10)"* ]]
+    # 戦果セクションの✅は対象外
+    [[ "$output" != *"cmd_3"* ]]
+
+    sed -i '/✅ 済/d' "$TEST_TMPDIR/dashboard.md"
+    run "$PYTHON" "$VALIDATE"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"✅ 問題なし"* ]]
+
+    sed -i '/📋 進行中/d' "$TEST_TMPDIR/dashboard.md"
+    for i in $(seq 1 200); do echo "- $i"; done >> "$TEST_TMPDIR/dashboard.md"
+    run "$PYTHON" "$VALIDATE"
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"❌ [ERROR] 必須セクション「📋 進行中」が存在しません"* ]]
+    [[ "$output" == *"⚠️ [WARNING] 行数が上限を超えています: 220行 (上限: 200行)"* ]]
+}
+
+# =============================================================================
+# T-002: 設定したルール
+# =============================================================================
+
+@test "T-002: rules from dashboard_config.yaml are applied with line numbers" {
+    cat >> "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+validation:
+  forbidden_markers:
+    "✅ 本日の戦果": ["完了"]
+  max_bytes: 100
+  max_rows:
+    "🚨 要対応": 1
+  stale_days:
+    "🚨 要対応": 30
+  max_update_age_hours: 24
+YAML
+    run "$PYTHON" "$VALIDATE"
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"最終更新が古すぎます: 2026-01-01 09:00 (上限: 24時間) (L3)"* ]]
+    [[ "$output" == *"🚨 要対応セクションに"*"より古い日付(2026-01-01)があります"*"(L9)"* ]]
+    [[ "$output" == *"🚨 要対応セクションの表の行数が上限を超えています (上限: 1行) (L10)"* ]]
+    [[ "$output" == *"✅ 本日の戦果セクションに禁止マーカー(完了)が残存しています"*"(L20)"* ]]
+    [[ "$output" == *"サイズが上限を超えています"* ]]
+    # forbidden_markers を上書きしたので🚨要対応の✅は検査しない
+    [[ "$output" != *"禁止マーカー(✅)"* ]]
+}
+
+# =============================================================================
+# T-003: JSON出力
+# =============================================================================
+
+@test "T-003: --format json reports counts, issues and timing" {
+    run "$PYTHON" "$VALIDATE" --format json
+    [ "$status" -eq 1 ]
+    run "$PYTHON" -c "
+import json, sys
+result = json.loads(sys.argv[1])
+print(result['lines'], result['ok'], isinstance(result['elapsed_ms'], float), result['bytes'] > 0)
+print([(i['level'], i['rule'], i['line']) for i in result['issues']])
+" "$output"
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "22 True True True" ]
+    [ "${lines[1]}" = "[('WARNING', 'forbidden_markers', 10)]" ]
+}
+
+# =============================================================================
+# T-004: null で無効化
+# =============================================================================
+
+@test "T-004: a rule set to null is not checked" {
+    printf 'validation:\n  max_lines: null\n  forbidden_markers: null\n' >> "$TEST_TMPDIR/config/dashboard_config.yaml"
+    for i in $(seq 1 300); do echo "- $i"; done >> "$TEST_TMPDIR/dashboard.md"
+    run "$PYTHON" "$VALIDATE"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"✅ 問題なし"* ]]
+}
+
+# =============================================================================
+# T-005: 書き込み前の検証
+# =============================================================================
+
+@test "T-005: dashboard_read.py never writes a render that fails validation" {
+    run "$PYTHON" "$TEST_TMPDIR/scripts/dashboard_read.py"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"生成完了"* ]]
+    cp "$TEST_TMPDIR/dashboard.md" "$TEST_TMPDIR/before.md"
+
+    printf 'validation:\n  required_sections: ["🏯 本陣"]\n' >> "$TEST_TMPDIR/config/dashboard_config.yaml"
+    printf 'action_required: []\nprojects:\n- name: pj_new\n  path: /tmp/pj_new\narchives: []\n' \
+        > "$TEST_TMPDIR/queue/dashboard_state.yaml"
+    run "$PYTHON" "$TEST_TMPDIR/scripts/dashboard_read.py"
+    [ "$status" -eq 1 ]
+    [[ "$output" == *"❌ [ERROR] 必須セクション「🏯 本陣」が存在しません"* ]]
+    [[ "$output" == *"検証エラーのため書き込みません"* ]]
+    cmp "$TEST_TMPDIR/dashboard.md" "$TEST_TMPDIR/before.md"
+
+    # 標準出力への表示は書き込みではないので検証しない
+    run "$PYTHON" "$TEST_TMPDIR/scripts/dashboard_read.py" --stdout
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"pj_new"* ]]
+}
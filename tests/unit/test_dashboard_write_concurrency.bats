@@ -0,0 +1,169 @@
+#!/usr/bin/env bats
+# test_dashboard_write_concurrency.bats — dashboard_write.py 同時書き込みストレステスト
+#
+# テスト構成:
+#   T-001: 20並列の add-senka で更新が1件も失われない
+#   T-002: 20並列の add-action で全件が残り、id が重複しない
+#   T-003: 書き込み・畳み込み中に読み手が書きかけや巻き戻った state を一度も見ない
+#   T-004: add-action と remove-action の並列混在で、削除対象だけが消える
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/dashboard_write_test.XXXXXX")"
+    # スクリプトは <root>/scripts/ に置かれる前提（project_root = スクリプトの親の親）
+    mkdir -p "$TEST_TMPDIR/scripts" "$TEST_TMPDIR/config" "$TEST_TMPDIR/queue/tasks" "$TEST_TMPDIR/queue/reports"
+    cp "$PROJECT_ROOT"/scripts/bakuhu/dashboard_*.py "$PROJECT_ROOT/scripts/atomic_write.py" "$TEST_TMPDIR/scripts/"
+    cat > "$TEST_TMPDIR/config/dashboard_config.yaml" <<'YAML'
+state_path: queue/dashboard_state.yaml
+tasks_dir: queue/tasks
+reports_dir: queue/reports
+output_path: dashboard.md
+commands_dir: queue/commands
+YAML
+    export WRITE="$TEST_TMPDIR/scripts/dashboard_write.py"
+    export STATE="$TEST_TMPDIR/queue/dashboard_state.yaml"
+    export DASHBOARD_NO_DAEMON=1
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# 20並列でコマンドを実行し、全プロセスの成功を確認する（$1 = 各回の引数を出すシェル関数）
+run_parallel() {
+    local pids=() i
+    for i in $(seq 1 20); do
+        "$PYTHON" "$WRITE" $($1 "$i") > /dev/null 2>&1 &
+        pids+=($!)
+    done
+    local failed=0
+    for pid in "${pids[@]}"; do
+        wait "$pid" || failed=$((failed + 1))
+    done
+    [ "$failed" -eq 0 ]
+}
+
+# スナップショット + 操作ログを再生した state を変数 state に読んでPythonコードを実行する
+run_state_py() {
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$STATE" <<PYEOF
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_write
+state = dashboard_write.load_state(Path(sys.argv[2]))
+$1
+PYEOF
+}
+
+senka_args() { echo "add-senka --cmd cmd_$1 --pj stress --content c$1"; }
+action_args() { echo "add-action --cmd cmd_$1 --pj stress --type t --content c$1"; }
+
+# =============================================================================
+# T-001: add-senka 20並列
+# =============================================================================
+
+@test "T-001: 20 parallel add-senka writers lose no updates" {
+    run_parallel senka_args
+
+    run run_state_py "
+print(sorted(s['cmd_id'] for s in state['senka']) == sorted(f'cmd_{i}' for i in range(1, 21)))
+"
+    [ "$status" -eq 0 ]
+    [ "$output" = "True" ]
+}
+
+# =============================================================================
+# T-002: add-action 20並列
+# =============================================================================
+
+@test "T-002: 20 parallel add-action writers keep every item with unique ids" {
+    run_parallel action_args
+
+    run run_state_py "
+items = state['action_required']
+print(len(items), len({i['id'] for i in items}), len({i['cmd_id'] for i in items}))
+"
+    [ "$status" -eq 0 ]
+    [ "$output" = "20 20 20" ]
+}
+
+# =============================================================================
+# T-003: 読み手は書きかけ・巻き戻りを見ない
+# =============================================================================
+
+@test "T-003: readers never observe a partial or rolled-back state during writes and compaction" {
+    # 畳み込み（スナップショットとログの置き換え）も並行して起こるよう閾値を下げる
+    sed -i 's/^OPLOG_COMPACT_BYTES = .*/OPLOG_COMPACT_BYTES = 1024/' "$WRITE"
+    "$PYTHON" "$WRITE" add-senka --cmd cmd_0 --pj stress --content "$(printf 'x%.0s' $(seq 1 2000))" > /dev/null
+
+    "$PYTHON" - "$TEST_TMPDIR/scripts" "$STATE" > "$TEST_TMPDIR/reader.out" <<'PYEOF' &
+import sys, time, yaml
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import dashboard_write
+path = Path(sys.argv[2])
+bad = 0
+reads = 0
+last = 1
+deadline = time.time() + 30
+while time.time() < deadline:
+    try:
+        state = dashboard_write.load_state(path)
+    except (OSError, yaml.YAMLError):
+        bad += 1
+        continue
+    reads += 1
+    # 確定済みの戦果は、読むたびに減らずに増えていくだけのはず
+    count = len(state.get("senka", []))
+    if count < last:
+        bad += 1
+    last = count
+    if count >= 21:
+        break
+print(bad, reads)
+PYEOF
+    local reader=$!
+    run_parallel senka_args
+    wait "$reader"
+
+    read -r bad reads < "$TEST_TMPDIR/reader.out"
+    [ "$bad" -eq 0 ]
+    [ "$reads" -gt 0 ]
+}
+
+# =============================================================================
+# T-004: add / remove 混在
+# =============================================================================
+
+@test "T-004: concurrent add-action and remove-action only remove their targets" {
+    for i in $(seq 1 10); do
+        "$PYTHON" "$WRITE" add-action --cmd "old_$i" --pj stress --type t --content c > /dev/null
+    done
+
+    mixed_args() {
+        if [ "$1" -le 10 ]; then
+            echo "remove-action --cmd old_$1"
+        else
+            echo "add-action --cmd new_$1 --pj stress --type t --content c"
+        fi
+    }
+    run_parallel mixed_args
+
+    run run_state_py "
+items = state['action_required']
+print(sorted(i['cmd_id'] for i in items) == sorted(f'new_{i}' for i in range(11, 21)), len({i['id'] for i in items}))
+"
+    [ "$status" -eq 0 ]
+    [ "$output" = "True 10" ]
+}
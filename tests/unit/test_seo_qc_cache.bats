@@ -0,0 +1,232 @@
+#!/usr/bin/env bats
+# test_seo_qc_cache.bats — seo_qc.py 記事単位の結果キャッシュテスト
+#
+# テスト構成:
+#   T-001: 変更のない再実行は全件キャッシュヒットし、レポートも同一
+#   T-002: 本文を編集した記事だけがキャッシュミスになる
+#   T-003: FORBIDDEN_WORDS / REQUIRED_FIELDS / THRESHOLDS の変更でキャッシュ全体を破棄する
+#   T-004: 禁止語設定ファイルの変更でもキャッシュ全体を破棄する
+#   T-005: 本文が同じでも画像の増減で check_014 は再判定される
+#   T-006: --plugin のチェック本体を編集するとキャッシュ全体を破棄する
+#   T-007: 内容ハッシュに含まれない入力（site_dir / filepath 等）を取るチェックはヒット時も再実行する
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_cache_test.XXXXXX")"
+    export AREA="$TEST_TMPDIR/base/testsite/src/content/area"
+    export IMAGES="$TEST_TMPDIR/base/testsite/public/images/articles"
+    mkdir -p "$AREA" "$IMAGES"
+    local i
+    for i in 1 2 3; do
+        printf -- '---\ntitle: "t%s"\ndescription: d\npublishedAt: 2025-01-01\ncategory: area\narea: 東京\nkeyword: k\nkeywords:\n  - k\n---\n東京 PR\n' "$i" > "$AREA/a$i.md"
+    done
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# キャッシュを使って testsite を実行する（レポートは $TEST_TMPDIR/<引数>/ へ）
+run_qc() {
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --output yaml --no-history \
+        --cache-dir "$TEST_TMPDIR/cache" --report-dir "$TEST_TMPDIR/$1" "${@:2}"
+}
+
+# seo_qc.py をモジュールとして読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+$1
+EOF
+}
+
+# =============================================================================
+# T-001: 変更なしの再実行
+# =============================================================================
+
+@test "T-001: an unchanged rerun is answered entirely from the cache" {
+    run run_qc first
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (0 cached)"* ]]
+    [ -f "$TEST_TMPDIR/cache/testsite.json" ]
+
+    run run_qc second
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (3 cached)"* ]]
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/first/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/second/qc_result_testsite.yaml")
+}
+
+# =============================================================================
+# T-002: 本文の編集
+# =============================================================================
+
+@test "T-002: editing an article's content is a cache miss for that article only" {
+    run_qc first 2> /dev/null
+    printf -- '---\ntitle: "t2"\n---\n絶対 PR\n' > "$AREA/a2.md"
+
+    run run_qc second
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (2 cached)"* ]]
+    # 編集後の内容で判定されている
+    run "$PYTHON" -c 'import sys, yaml; r = yaml.safe_load(open(sys.argv[1]))["results"]; print(r["check_001"]["fail_files"], r["check_009"]["fail_files"])' \
+        "$TEST_TMPDIR/second/qc_result_testsite.yaml"
+    [ "$output" = "['a2.md'] ['a2.md']" ]
+}
+
+# =============================================================================
+# T-003: チェック定義の変更
+# =============================================================================
+
+@test "T-003: changing FORBIDDEN_WORDS, REQUIRED_FIELDS or THRESHOLDS drops the whole cache" {
+    run run_py '
+import os
+cache_dir = os.path.join(os.environ["TEST_TMPDIR"], "cache")
+cache_path = os.path.join(cache_dir, "testsite.json")
+qc.run_site("testsite", os.path.join(os.environ["TEST_TMPDIR"], "base"), cache_dir=cache_dir)
+assert len(qc.load_cache(cache_path)["files"]) == 3
+base = qc.suite_fingerprint()
+changes = {
+    "FORBIDDEN_WORDS": lambda: qc.FORBIDDEN_WORDS.append("新しい禁止語"),
+    "REQUIRED_FIELDS": lambda: qc.REQUIRED_FIELDS.append("author"),
+    "THRESHOLDS": lambda: qc.THRESHOLDS.__setitem__("min_chars", 3000),
+}
+for name, change in changes.items():
+    saved = {n: getattr(qc, n).copy() for n in changes}
+    change()
+    assert qc.suite_fingerprint() != base, name
+    assert qc.load_cache(cache_path)["files"] == {}, name
+    for n, value in saved.items():
+        setattr(qc, n, value)
+    assert qc.suite_fingerprint() == base, name
+    assert len(qc.load_cache(cache_path)["files"]) == 3, name
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "Checking testsite: 3 articles (0 cached)..." ]
+    [ "${lines[1]}" = "ok" ]
+}
+
+# =============================================================================
+# T-004: 禁止語設定ファイルの変更
+# =============================================================================
+
+@test "T-004: changing the forbidden-word config drops the whole cache" {
+    printf 'common: [東京]\n' > "$TEST_TMPDIR/words.yaml"
+    run_qc first --forbidden-words "$TEST_TMPDIR/words.yaml" 2> /dev/null
+
+    run run_qc second --forbidden-words "$TEST_TMPDIR/words.yaml"
+    [[ "$output" == *"(3 cached)"* ]]
+
+    printf 'common: [大阪]\n' > "$TEST_TMPDIR/words.yaml"
+    run run_qc third --forbidden-words "$TEST_TMPDIR/words.yaml"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (0 cached)"* ]]
+    grep -A1 '^  check_009:' "$TEST_TMPDIR/third/qc_result_testsite.yaml" | grep -q 'pass: 3'
+}
+
+# =============================================================================
+# T-005: 画像だけの変更
+# =============================================================================
+
+@test "T-005: an image-set change re-runs check_014 on cached articles" {
+    run_qc first 2> /dev/null
+    touch "$IMAGES/a1-ogp.png" "$IMAGES/a1-thumb.png" "$IMAGES/a3-ogp.png"
+
+    run run_qc second
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (3 cached)"* ]]
+    run "$PYTHON" -c 'import sys, yaml; r = yaml.safe_load(open(sys.argv[1]))["results"]["check_014"]; print(r["pass"], r["fail_files"])' \
+        "$TEST_TMPDIR/second/qc_result_testsite.yaml"
+    [ "$output" = "1 ['a2.md', 'a3.md']" ]
+
+    # 画像を消せばまた不合格に戻る（キャッシュに古い判定が残らない）
+    rm "$IMAGES/a1-thumb.png"
+    run run_qc third
+    run "$PYTHON" -c 'import sys, yaml; r = yaml.safe_load(open(sys.argv[1]))["results"]["check_014"]; print(r["pass"], r["fail_files"])' \
+        "$TEST_TMPDIR/third/qc_result_testsite.yaml"
+    [ "$output" = "0 ['a1.md', 'a2.md', 'a3.md']" ]
+}
+
+# =============================================================================
+# T-006: プラグインの編集
+# =============================================================================
+
+@test "T-006: editing a --plugin check's body drops the whole cache" {
+    cat > "$TEST_TMPDIR/plugin.py" <<'PYEOF'
+from seo_qc import register_check
+
+@register_check("check_101", "PR表記2")
+def check_pr(article):
+    return "PR" in article.body, "no PR"
+PYEOF
+    run_qc first --plugin "$TEST_TMPDIR/plugin.py" 2> /dev/null
+    run run_qc second --plugin "$TEST_TMPDIR/plugin.py"
+    [[ "$output" == *"(3 cached)"* ]]
+    grep -A1 '^  check_101:' "$TEST_TMPDIR/second/qc_result_testsite.yaml" | grep -q 'pass: 3'
+
+    # 関数名も引数も同じまま本体だけ変える
+    sed -i 's/"PR" in article.body/"PR" not in article.body/' "$TEST_TMPDIR/plugin.py"
+    run run_qc third --plugin "$TEST_TMPDIR/plugin.py"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (0 cached)"* ]]
+    grep -A1 '^  check_101:' "$TEST_TMPDIR/third/qc_result_testsite.yaml" | grep -q 'pass: 0'
+}
+
+# =============================================================================
+# T-007: 内容ハッシュ外の入力を取るチェック
+# =============================================================================
+
+@test "T-007: checks reading inputs outside the content hash are re-run on a cache hit" {
+    # 記事の隣の承認ファイル（site_dir 配下）を見るチェック
+    cat > "$TEST_TMPDIR/plugin.py" <<'PYEOF'
+import os
+from seo_qc import register_check
+
+@register_check("check_102", "承認済み", args=("slug", "site_dir"))
+def check_approved(slug, site_dir):
+    return os.path.exists(os.path.join(site_dir, "approved", slug)), "not approved"
+PYEOF
+    mkdir "$TEST_TMPDIR/base/testsite/approved"
+    run_qc first --plugin "$TEST_TMPDIR/plugin.py" 2> /dev/null
+    grep -A1 '^  check_102:' "$TEST_TMPDIR/first/qc_result_testsite.yaml" | grep -q 'pass: 0'
+
+    touch "$TEST_TMPDIR/base/testsite/approved/a1" "$TEST_TMPDIR/base/testsite/approved/a3"
+    run run_qc second --plugin "$TEST_TMPDIR/plugin.py"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (3 cached)"* ]]
+    run "$PYTHON" -c 'import sys, yaml; r = yaml.safe_load(open(sys.argv[1]))["results"]["check_102"]; print(r["pass"], r["fail_files"])' \
+        "$TEST_TMPDIR/second/qc_result_testsite.yaml"
+    [ "$output" = "2 ['a2.md']" ]
+
+    # 本文と filepath の両方を取るチェックは、本文を読み直さないと答えられないので毎回全件チェックする
+    cat > "$TEST_TMPDIR/plugin2.py" <<'PYEOF'
+import os
+from seo_qc import register_check
+
+@register_check("check_103", "更新日", args=("article", "filepath"))
+def check_fresh(article, filepath):
+    return os.path.getsize(filepath) > 0, "empty"
+PYEOF
+    run_qc third --plugin "$TEST_TMPDIR/plugin2.py" 2> /dev/null
+    run run_qc fourth --plugin "$TEST_TMPDIR/plugin2.py"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Checking testsite: 3 articles (0 cached)"* ]]
+}
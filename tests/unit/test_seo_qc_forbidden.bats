@@ -0,0 +1,112 @@
+#!/usr/bin/env bats
+# test_seo_qc_forbidden.bats — seo_qc.py 禁止語マッチャー・サイト別禁止語設定テスト
+#
+# テスト構成:
+#   T-001: WordMatcher（regex / automaton）が最長優先の選択肢正規表現と同一の結果を返す
+#   T-002: --forbidden-words の common / sites が該当サイトの check_009 にだけ効く
+#   T-003: 不正な --forbidden-words はエラー終了する
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_forbidden_test.XXXXXX")"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# seo_qc.py をモジュールとして読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+$1
+EOF
+}
+
+# =============================================================================
+# T-001: WordMatcher == 最長優先の選択肢正規表現
+# =============================================================================
+
+@test "T-001: WordMatcher matches like a longest-first alternation with either engine" {
+    run run_py '
+import random, re
+random.seed(20260101)
+for _ in range(3000):
+    words = list({"".join(random.choice("abcde") for _ in range(random.randint(1, 4)))
+                  for _ in range(random.randint(0, 10))})
+    text = "".join(random.choice("abcdexy") for _ in range(random.randint(0, 80)))
+    expected = []
+    if words:
+        expected = re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))).findall(text)
+    for engine in ("regex", "automaton"):
+        got = qc.WordMatcher(words, engine=engine).findall(text)
+        assert got == expected, (engine, words, text, got, expected)
+assert qc.WordMatcher(["x", "y"]).engine == "regex"
+assert qc.WordMatcher([str(i) for i in range(qc.WordMatcher.REGEX_MAX_WORDS + 1)]).engine == "automaton"
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-002: サイト別禁止語
+# =============================================================================
+
+@test "T-002: configured common and per-site words apply to check_009" {
+    for site in sitea siteb; do
+        mkdir -p "$TEST_TMPDIR/base/$site/src/content/area" "$TEST_TMPDIR/base/$site/public/images/articles"
+        printf -- '---\ntitle: t\n---\n業界最安で完全駆除します。\n' > "$TEST_TMPDIR/base/$site/src/content/area/a.md"
+    done
+    printf 'common:\n  - 業界最安\nsites:\n  sitea:\n    - 完全駆除\n' > "$TEST_TMPDIR/words.yaml"
+
+    for site in sitea siteb; do
+        run "$PYTHON" "$SEO_QC" "$site" --base-dir "$TEST_TMPDIR/base" --output jsonl --no-cache --no-history \
+            --forbidden-words "$TEST_TMPDIR/words.yaml" --report-dir "$TEST_TMPDIR/reports"
+        [ "$status" -eq 0 ]
+    done
+
+    run "$PYTHON" -c "
+import json, sys
+for site in ('sitea', 'siteb'):
+    with open(sys.argv[1] + '/qc_result_' + site + '.jsonl', encoding='utf-8') as f:
+        record = json.loads(f.readline())
+    print(site, record['results']['check_009']['detail'])
+" "$TEST_TMPDIR/reports"
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "sitea ['業界最安(1)', '完全駆除(1)']" ]
+    [ "${lines[1]}" = "siteb ['業界最安(1)']" ]
+}
+
+# =============================================================================
+# T-003: 不正な設定
+# =============================================================================
+
+@test "T-003: an unreadable or malformed --forbidden-words file is an error" {
+    mkdir -p "$TEST_TMPDIR/base/sitea/src/content/area"
+    printf -- '- just\n- a list\n' > "$TEST_TMPDIR/bad.yaml"
+
+    run "$PYTHON" "$SEO_QC" sitea --base-dir "$TEST_TMPDIR/base" --no-history --forbidden-words "$TEST_TMPDIR/bad.yaml"
+    [ "$status" -ne 0 ]
+    [[ "$output" == *"--forbidden-words"* ]]
+
+    run "$PYTHON" "$SEO_QC" sitea --base-dir "$TEST_TMPDIR/base" --no-history --forbidden-words "$TEST_TMPDIR/missing.yaml"
+    [ "$status" -ne 0 ]
+}
@@ -0,0 +1,186 @@
+#!/usr/bin/env bats
+# test_seo_qc_frontmatter.bats — seo_qc.py frontmatter高速パーサ 等価性テスト
+#
+# テスト構成:
+#   T-001: 記事で使う平坦なfrontmatterが高速パスで safe_load と同一に解析される
+#   T-002: 複雑な構文は高速パスを通らず、フルYAMLへフォールバックする
+#   T-003: ランダム生成frontmatterで高速パス結果が safe_load と完全一致（型含む）
+#   T-004: --no-fast-frontmatter とデフォルトでQCレポートが同一
+#   T-005: 高速パスの型変換は構築済みオブジェクトを溜め込まない（--watch の長時間実行）
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_fm_test.XXXXXX")"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# seo_qc.py をモジュールとして読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, sys, yaml
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+$1
+EOF
+}
+
+# =============================================================================
+# T-001: 平坦なfrontmatter → 高速パスで safe_load と同一
+# =============================================================================
+
+@test "T-001: flat article frontmatter is parsed by the fast path identically to safe_load" {
+    run run_py '
+text = """title: "東京の害虫駆除｜費用相場と業者の選び方"
+description: 東京で害虫駆除を依頼する前に知っておきたいこと
+publishedAt: 2025-01-15
+updatedAt: "2025-02-01"
+category: area
+area: 東京
+keyword: 害虫駆除 東京
+draft: false
+order: 3
+# comment line
+keywords:
+  - 害虫駆除
+  - "ゴキブリ 駆除"
+  - 2025
+tags:
+- a
+- b"""
+fast = qc.fast_frontmatter(text)
+assert fast is not None, "fast path rejected flat frontmatter"
+assert repr(fast) == repr(yaml.safe_load(text)), (fast, yaml.safe_load(text))
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-002: 複雑な構文 → 高速パス不可、parse_frontmatterはフルYAMLと同一
+# =============================================================================
+
+@test "T-002: complex syntax falls back to full YAML" {
+    run run_py '
+cases = [
+    "title: x\nmeta:\n  author: a\n  date: 2025-01-01",
+    "keywords: [a, b, c]",
+    "description: |\n  line1\n  line2",
+    "base: &b x\ncopy: *b",
+    "title: \"esc \\\" quote\"",
+    "title: a # trailing comment",
+    "title: multi\n  line plain",
+    "true: yes",
+    "tags:\n  - a\n    - b",
+    "title: x\n- orphan item",
+    "items:\n  - name: a",
+    "title: \x27it\x27\x27s\x27",
+]
+for text in cases:
+    assert qc.fast_frontmatter(text) is None, f"fast path accepted: {text!r}"
+    fm, _ = qc.parse_frontmatter("---\n" + text + "\n---\nbody")
+    try:
+        ref = yaml.safe_load(text)
+    except yaml.YAMLError:
+        ref = {}
+    if not isinstance(ref, dict):
+        ref = {}
+    assert repr(fm) == repr(ref), (text, fm, ref)
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-003: ランダム生成 → 高速パス採用時は safe_load と完全一致
+# =============================================================================
+
+@test "T-003: randomized frontmatter parses identically whenever the fast path accepts it" {
+    run run_py '
+import random
+keys = ["title", "publishedAt", "keywords", "true", "1", "a b", "C#", "~", "on", "タイトル"]
+vals = ["", "東京", "2025-01-01", "2025-01-01 10:00:00", "\x27q\x27", "\"dq\"", "1", "-5", "0x1F", "1:30",
+        "3.14", ".inf", "yes", "~", "a: b", "a #c", "C#", "x:", "[a]", "&a x", "*a", "|", "- x", "?x", ":x",
+        "=", "\x27open", "foo bar  ", "%x", ",x", "http://a.b/c"]
+seps = [" ", ""]
+indents = ["", "  ", "    "]
+random.seed(20260101)
+accepted = 0
+for _ in range(5000):
+    lines = []
+    for _ in range(random.randint(0, 8)):
+        r = random.random()
+        if r < 0.6:
+            lines.append(random.choice(keys) + ":" + random.choice(seps) + random.choice(vals))
+        elif r < 0.8:
+            lines.append(random.choice(indents) + "- " + random.choice(vals))
+        else:
+            lines.append(random.choice(["", "# c", "  cont", "...", random.choice(keys) + ":"]))
+    text = random.choice(["\n", "\r\n"]).join(lines).strip()
+    fast = qc.fast_frontmatter(text)
+    if fast is None:
+        continue
+    accepted += 1
+    ref = yaml.safe_load(text) or {}
+    assert repr(fast) == repr(ref), (text, fast, ref)
+assert accepted > 300, accepted
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-004: --no-fast-frontmatter とデフォルトでレポート同一
+# =============================================================================
+
+@test "T-004: QC report is identical with and without the fast frontmatter path" {
+    local area="$TEST_TMPDIR/base/testsite/src/content/area"
+    mkdir -p "$area" "$TEST_TMPDIR/base/testsite/public/images/articles"
+    printf -- '---\ntitle: "t"\ndescription: d\npublishedAt: 2025-01-01\ncategory: area\narea: 東京\nkeyword: k\nkeywords:\n  - k\n---\n東京 東京 東京 PR\n' > "$area/a.md"
+    printf -- '---\ntitle: x\nmeta:\n  nested: 1\nkeywords: [a]\n---\nbody\n' > "$area/b.md"
+    printf -- '---\ntitle: [broken\n---\nbody\n' > "$area/c.mdx"
+
+    run "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --output yaml --no-cache --no-history --report-dir "$TEST_TMPDIR/fast"
+    [ "$status" -eq 0 ]
+    run "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --output yaml --no-cache --no-fast-frontmatter --no-history --report-dir "$TEST_TMPDIR/full"
+    [ "$status" -eq 0 ]
+
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/fast/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/full/qc_result_testsite.yaml")
+}
+
+# =============================================================================
+# T-005: 構築済みオブジェクトを溜め込まない
+# =============================================================================
+
+@test "T-005: fast-path scalar construction keeps no per-call state" {
+    run run_py '
+for i in range(2000):
+    fm = qc.fast_frontmatter(f"publishedAt: 2025-01-{i % 28 + 1:02d}\norder: {i}\ndraft: false\nratio: {i}.5\n")
+    assert fm["order"] == i and fm["draft"] is False, fm
+c = qc._FM_CONSTRUCTOR
+print(len(c.constructed_objects), len(c.recursive_objects), len(c.state_generators))
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "0 0 0" ]
+}
@@ -0,0 +1,135 @@
+#!/usr/bin/env bats
+# test_seo_qc_images.bats — seo_qc.py 画像インデックス（check_014・孤立画像レポート）テスト
+#
+# テスト構成:
+#   T-001: check_014 が欠けている画像（ogp / thumb）を記事ごとに報告する
+#   T-002: どの記事からも参照されない画像を件数・合計サイズ付きで images に報告する
+#   T-003: 孤立画像の一覧は FAIL_FILES_LIMIT 件まで、件数は全数
+#   T-004: 画像ディレクトリが無いサイトでも実行でき、summary に孤立画像の行を出さない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_images_test.XXXXXX")"
+    export AREA="$TEST_TMPDIR/base/testsite/src/content/area"
+    export IMAGES="$TEST_TMPDIR/base/testsite/public/images/articles"
+    export REPORT="$TEST_TMPDIR/report/qc_result_testsite.yaml"
+    mkdir -p "$AREA" "$IMAGES"
+    local slug
+    for slug in both ogp-only none; do
+        printf -- '---\ntitle: t\n---\nPR\n' > "$AREA/$slug.md"
+    done
+    printf -- '---\ntitle: t\n---\nPR\n' > "$AREA/mdx-article.mdx"
+    touch "$IMAGES/both-ogp.png" "$IMAGES/both-thumb.png" "$IMAGES/ogp-only-ogp.png" "$IMAGES/mdx-article-thumb.png"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+run_qc() {
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --no-cache --no-history \
+        --report-dir "$TEST_TMPDIR/report" "$@"
+}
+
+# 記事ごとの check_014 を JSONL から「file=detail」で表示する
+show_check_014() {
+    "$PYTHON" -c 'import json, sys
+for line in open(sys.argv[1], encoding="utf-8"):
+    r = json.loads(line)
+    c = r["results"]["check_014"]
+    print("%s=%s" % (r["file"], "ok" if c["pass"] else c["detail"]))' "$TEST_TMPDIR/report/qc_result_testsite.jsonl"
+}
+
+# レポートの images セクションを1行で表示する
+show_images() {
+    "$PYTHON" -c 'import sys, yaml
+i = yaml.safe_load(open(sys.argv[1]))["images"]
+print(i["total_images"], i["orphaned"], i["orphaned_bytes"], i["orphaned_files"])' "$REPORT"
+}
+
+# =============================================================================
+# T-001: 欠けている画像
+# =============================================================================
+
+@test "T-001: check_014 reports which of the OGP and thumbnail images are missing" {
+    run run_qc --output jsonl
+    [ "$status" -eq 0 ]
+
+    run show_check_014
+    [ "${lines[0]}" = "both.md=ok" ]
+    [ "${lines[1]}" = "none.md=missing: ogp, thumb" ]
+    [ "${lines[2]}" = "ogp-only.md=missing: thumb" ]
+    [ "${lines[3]}" = "mdx-article.mdx=missing: ogp" ]
+}
+
+# =============================================================================
+# T-002: 孤立画像
+# =============================================================================
+
+@test "T-002: images no article references are reported with their total size" {
+    head -c 1000 /dev/zero > "$IMAGES/deleted-article-ogp.png"
+    head -c 24 /dev/zero > "$IMAGES/banner.jpg"
+    # サブディレクトリは画像として数えない
+    mkdir "$IMAGES/archive"
+
+    run run_qc --output yaml
+    [ "$status" -eq 0 ]
+    run show_images
+    [ "$output" = "6 2 1024 ['banner.jpg', 'deleted-article-ogp.png']" ]
+
+    # 記事を消すとその画像が孤立側に移る
+    rm "$AREA/both.md"
+    run run_qc --output yaml
+    run show_images
+    [ "$output" = "6 4 1024 ['banner.jpg', 'both-ogp.png', 'both-thumb.png', 'deleted-article-ogp.png']" ]
+}
+
+# =============================================================================
+# T-003: 孤立画像一覧の上限
+# =============================================================================
+
+@test "T-003: the orphan list is capped at FAIL_FILES_LIMIT while the count is complete" {
+    local i
+    for i in $(seq -w 1 30); do
+        head -c 100 /dev/zero > "$IMAGES/old-$i-ogp.png"
+    done
+
+    run run_qc --output yaml
+    [ "$status" -eq 0 ]
+    run "$PYTHON" -c 'import sys, yaml
+i = yaml.safe_load(open(sys.argv[1]))["images"]
+print(i["total_images"], i["orphaned"], i["orphaned_bytes"], len(i["orphaned_files"]), i["orphaned_files"][0], i["orphaned_files"][-1])' "$REPORT"
+    [ "$output" = "34 30 3000 20 old-01-ogp.png old-20-ogp.png" ]
+
+    run run_qc --output summary
+    [[ "$output" == *"orphaned images: 30/34 (0.0 MB)"* ]]
+}
+
+# =============================================================================
+# T-004: 画像ディレクトリなし
+# =============================================================================
+
+@test "T-004: a site without an images directory still runs" {
+    rm -rf "$TEST_TMPDIR/base/testsite/public"
+
+    run run_qc --output both
+    [ "$status" -eq 0 ]
+    [[ "$output" != *"orphaned images"* ]]
+    run show_images
+    [ "$output" = "0 0 0 []" ]
+    grep -A2 '^  check_014:' "$REPORT" | grep -q 'fail: 4'
+}
@@ -0,0 +1,124 @@
+#!/usr/bin/env bats
+# test_seo_qc_jsonl.bats — seo_qc.py --output jsonl（記事単位のストリーム出力）テスト
+#
+# テスト構成:
+#   T-001: 記事1件につき1レコードを記事順に書き、YAML サマリーも --output yaml と同一に書く
+#   T-002: レコードはサイトの実行中から逐次読める（行バッファ）
+#   T-003: 読めない記事はエラーレコード、キャッシュ済みの記事も通常レコードになる
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_jsonl_test.XXXXXX")"
+    export AREA="$TEST_TMPDIR/base/testsite/src/content/area"
+    export JSONL="$TEST_TMPDIR/report/qc_result_testsite.jsonl"
+    mkdir -p "$AREA" "$TEST_TMPDIR/base/testsite/public/images/articles"
+    printf -- '---\ntitle: t\narea: 東京\n---\nPR\n' > "$AREA/a1.md"
+    printf -- '---\ntitle: t\n---\n絶対\n' > "$AREA/a2.md"
+    printf -- '---\ntitle: t\n---\nPR\n' > "$AREA/a3.mdx"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+run_qc() {
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --no-history "$@"
+}
+
+# JSONL の各レコードを「file:pass」（エラーは「file:error」）で1行に表示する
+show_records() {
+    "$PYTHON" -c 'import json, sys
+records = [json.loads(l) for l in open(sys.argv[1], encoding="utf-8")]
+assert all(r["site"] == "testsite" for r in records)
+print(" ".join("%s:%s" % (r["file"], "error" if "error" in r else r["pass"]) for r in records))' "$JSONL"
+}
+
+# =============================================================================
+# T-001: 1記事1レコード + YAML サマリー
+# =============================================================================
+
+@test "T-001: one record per article in file order, plus the usual YAML summary" {
+    run run_qc --output jsonl --no-cache --report-dir "$TEST_TMPDIR/report"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"-> $JSONL"* ]]
+
+    run show_records
+    [ "$output" = "a1.md:False a2.md:False a3.mdx:False" ]
+
+    # 各レコードは全チェックの結果を持ち、pass はその論理積
+    run "$PYTHON" -c 'import json, sys
+for line in open(sys.argv[1], encoding="utf-8"):
+    r = json.loads(line)
+    assert sorted(r["results"]) == ["check_%03d" % n for n in range(1, 15)], r
+    assert r["pass"] == all(v["pass"] for v in r["results"].values())
+r = json.loads(open(sys.argv[1], encoding="utf-8").readlines()[1])
+print(r["results"]["check_009"])' "$JSONL"
+    [ "$output" = "{'pass': False, 'detail': ['絶対(1)']}" ]
+
+    run run_qc --output yaml --no-cache --report-dir "$TEST_TMPDIR/yaml"
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/report/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/yaml/qc_result_testsite.yaml")
+    [ ! -e "$TEST_TMPDIR/yaml/qc_result_testsite.jsonl" ]
+}
+
+# =============================================================================
+# T-002: 実行中の逐次読み出し
+# =============================================================================
+
+@test "T-002: records can be read while the site is still running" {
+    # a3.mdx の検査時点で、先行2記事のレコードが既にファイルへ出ているかを記録するプラグイン
+    cat > "$TEST_TMPDIR/peek.py" <<'PYEOF'
+import os
+from seo_qc import register_check
+
+
+@register_check("check_900", "逐次出力", args=("slug",))
+def check_900_peek(slug):
+    if slug != "a3":
+        return True, ""
+    with open(os.environ["JSONL"], encoding="utf-8") as f:
+        seen = [line for line in f if line.endswith("\n")]
+    return len(seen) == 2, f"records visible: {len(seen)}"
+PYEOF
+    run run_qc --output jsonl --no-cache --plugin "$TEST_TMPDIR/peek.py" --report-dir "$TEST_TMPDIR/report"
+    [ "$status" -eq 0 ]
+
+    run "$PYTHON" -c 'import json, sys
+r = json.loads(open(sys.argv[1], encoding="utf-8").readlines()[2])
+print(r["file"], r["results"]["check_900"])' "$JSONL"
+    [ "$output" = "a3.mdx {'pass': True, 'detail': ''}" ]
+}
+
+# =============================================================================
+# T-003: エラー記事とキャッシュ済み記事
+# =============================================================================
+
+@test "T-003: unreadable articles give error records and cached articles are streamed too" {
+    printf -- '---\ntitle: \xff\n---\n' > "$AREA/a2b.md"
+
+    run run_qc --output jsonl --cache-dir "$TEST_TMPDIR/cache" --report-dir "$TEST_TMPDIR/report"
+    [ "$status" -eq 0 ]
+    run show_records
+    [ "$output" = "a1.md:False a2.md:False a2b.md:error a3.mdx:False" ]
+    cp "$JSONL" "$TEST_TMPDIR/first.jsonl"
+
+    run run_qc --output jsonl --cache-dir "$TEST_TMPDIR/cache" --report-dir "$TEST_TMPDIR/report"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"(3 cached)"* ]]
+    diff "$TEST_TMPDIR/first.jsonl" "$JSONL"
+    grep -q '^total_articles: 4$' "$TEST_TMPDIR/report/qc_result_testsite.yaml"
+}
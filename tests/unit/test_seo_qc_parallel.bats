@@ -0,0 +1,110 @@
+#!/usr/bin/env bats
+# test_seo_qc_parallel.bats — seo_qc.py --jobs 並列実行と逐次実行の等価性テスト
+#
+# テスト構成:
+#   T-001: --jobs 2 の YAML レポートが逐次実行と同一（timestamp を除く）
+#   T-002: --jobs 2 の JSONL が逐次実行と同一（記事順・壊れた記事のエラー記録を含む）
+#   T-003: 読めない記事のエラーは並列でもファイル順に出力される
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_parallel_test.XXXXXX")"
+    make_site
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# 合否の混ざった記事40件と、読めない記事（不正UTF-8・壊れたシンボリックリンク）を置く
+make_site() {
+    local site="$TEST_TMPDIR/base/testsite"
+    mkdir -p "$site/src/content/area" "$site/public/images/articles"
+    "$PYTHON" - "$site" <<'PYEOF'
+import os, sys
+site = sys.argv[1]
+area = os.path.join(site, "src", "content", "area")
+for i in range(40):
+    fm = f'title: "記事{i}"\ndescription: d\npublishedAt: 2025-01-01\ncategory: area\narea: 東京\nkeyword: k\n'
+    if i % 3:
+        fm += "keywords:\n  - k\n"
+    body = "PR\n" + "## 見出し\n東京の本文\n" * (i % 7) + ("最安値" if i % 5 == 0 else "")
+    ext = ".mdx" if i % 4 == 0 else ".md"
+    with open(os.path.join(area, f"article-{i:02d}{ext}"), "w", encoding="utf-8") as f:
+        f.write(f"---\n{fm}---\n{body}\n")
+    if i % 2:
+        for suffix in ("-ogp.png", "-thumb.png"):
+            open(os.path.join(site, "public", "images", "articles", f"article-{i:02d}{suffix}"), "wb").close()
+with open(os.path.join(area, "article-07b.md"), "wb") as f:
+    f.write(b"---\ntitle: \xff\xfe\n---\nbody\n")
+os.symlink(os.path.join(area, "missing-target.md"), os.path.join(area, "article-31b.mdx"))
+PYEOF
+}
+
+# 逐次（serial）と --jobs 2（parallel）で同じ出力形式のレポートを作る
+run_both() {
+    local output="$1"
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --output "$output" --no-cache --no-history \
+        --report-dir "$TEST_TMPDIR/serial" 2> "$TEST_TMPDIR/serial.err"
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --output "$output" --no-cache --no-history \
+        --jobs 2 --report-dir "$TEST_TMPDIR/parallel" 2> "$TEST_TMPDIR/parallel.err"
+}
+
+# =============================================================================
+# T-001: YAML レポートの等価性
+# =============================================================================
+
+@test "T-001: --jobs 2 writes the same YAML report as a serial run" {
+    run run_both yaml
+    [ "$status" -eq 0 ]
+
+    grep -q '^total_articles: 42$' "$TEST_TMPDIR/serial/qc_result_testsite.yaml"
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/serial/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/parallel/qc_result_testsite.yaml")
+}
+
+# =============================================================================
+# T-002: JSONL の等価性
+# =============================================================================
+
+@test "T-002: --jobs 2 streams the same JSONL records in the same order" {
+    run run_both jsonl
+    [ "$status" -eq 0 ]
+
+    [ "$(wc -l < "$TEST_TMPDIR/serial/qc_result_testsite.jsonl")" -eq 42 ]
+    # 壊れた記事もエラー記録として記事順の位置に入る
+    grep -q '"file": "article-07b.md", "error"' "$TEST_TMPDIR/serial/qc_result_testsite.jsonl"
+    grep -q '"file": "article-31b.mdx", "error"' "$TEST_TMPDIR/serial/qc_result_testsite.jsonl"
+    diff "$TEST_TMPDIR/serial/qc_result_testsite.jsonl" "$TEST_TMPDIR/parallel/qc_result_testsite.jsonl"
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/serial/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/parallel/qc_result_testsite.yaml")
+}
+
+# =============================================================================
+# T-003: エラー出力の順序
+# =============================================================================
+
+@test "T-003: errors for unreadable articles are reported in file order" {
+    run run_both yaml
+    [ "$status" -eq 0 ]
+
+    run grep '^  ERROR:' "$TEST_TMPDIR/serial.err"
+    [ "${#lines[@]}" -eq 2 ]
+    [[ "${lines[0]}" == "  ERROR: article-07b.md: "* ]]
+    [[ "${lines[1]}" == "  ERROR: article-31b.mdx: "* ]]
+    diff <(grep '^  ERROR:' "$TEST_TMPDIR/serial.err") <(grep '^  ERROR:' "$TEST_TMPDIR/parallel.err")
+}
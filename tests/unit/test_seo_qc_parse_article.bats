@@ -0,0 +1,329 @@
+#!/usr/bin/env bats
+# test_seo_qc_parse_article.bats — seo_qc.py parse_article（本文の一括走査）等価性テスト
+#
+# parse_article 導入前のチェックは本文を検査ごとに split / 正規表現で走査していた。
+# その複数パス版をテスト内に参照実装として残し、一括走査版と突き合わせる。
+#
+# テスト構成:
+#   T-001: ランダム生成本文で check_003〜013 の結果が複数パス版と完全一致
+#   T-002: H2 セクション・文字数・表構文の指摘が複数パス版と一致
+#   T-003: 境界的な本文（空・見出しのみ・表で終わる・CRLF）でも一致
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_parse_test.XXXXXX")"
+    # 複数パス版の参照実装（parse_article 導入前のチェック本体）
+    cat > "$TEST_TMPDIR/multipass.py" <<'PYEOF'
+import re
+from collections import defaultdict
+
+
+def setup(qc):
+    global FORBIDDEN_PATTERN, THRESHOLDS
+    words = sorted(qc.FORBIDDEN_WORDS, key=len, reverse=True)
+    FORBIDDEN_PATTERN = re.compile("|".join(re.escape(w) for w in words))
+    THRESHOLDS = qc.THRESHOLDS
+
+
+def strip_html_tags(text):
+    return re.sub(r"<[^>]+>", "", text)
+
+
+def count_japanese_chars(text):
+    text = strip_html_tags(text)
+    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"[#*_`|>-]", "", text)
+    text = re.sub(r"\s+", "", text)
+    return len(text)
+
+
+def find_h2_sections(body):
+    lines = body.split("\n")
+    sections = []
+    current_heading = None
+    current_lines = []
+    for line in lines:
+        if line.startswith("## "):
+            if current_heading is not None:
+                sections.append((current_heading, "\n".join(current_lines)))
+            current_heading = line
+            current_lines = []
+        elif current_heading is not None:
+            current_lines.append(line)
+    if current_heading is not None:
+        sections.append((current_heading, "\n".join(current_lines)))
+    return sections
+
+
+def table_issues(body):
+    lines = body.split("\n")
+    issues = []
+    in_table = False
+    has_separator = False
+    for i in range(len(lines)):
+        line = lines[i].strip()
+        if line.startswith("|"):
+            if not in_table:
+                in_table = True
+                has_separator = False
+                if i + 1 < len(lines):
+                    next_line = lines[i + 1].strip()
+                    if next_line.startswith("|") and re.search(r"-{2,}", next_line):
+                        has_separator = True
+                    else:
+                        issues.append(f"line {i+1}: table header not followed by separator")
+        elif in_table:
+            in_table = False
+            if not has_separator:
+                issues.append(f"table ending at line {i}: no separator row found")
+    return issues
+
+
+def check_003(body):
+    limit = THRESHOLDS["pr_scan_lines"]
+    text = "\n".join(body.split("\n")[:limit])
+    if "アフィリエイト広告" in text or "PR" in text:
+        return True, ""
+    return False, f"PR notation not found in first {limit} lines"
+
+
+def check_004(body):
+    count = body.count('<div class="cta-box">')
+    cta_comments = len(re.findall(r"<!--\s*CTA:", body))
+    total = count + cta_comments
+    if total == THRESHOLDS["cta_count"]:
+        return True, ""
+    return False, f"CTA count: {total} (div: {count}, comment: {cta_comments})"
+
+
+def check_005(body):
+    cta_blocks = re.findall(r'<div class="cta-box">.*?</div>\s*</div>', body, re.DOTALL)
+    cta_comments = len(re.findall(r"<!--\s*CTA:", body))
+    if not cta_blocks and cta_comments == 0:
+        return False, "no CTA found"
+    issues = []
+    for i, block in enumerate(cta_blocks):
+        if 'cta-badge' not in block and 'cta-button' not in block:
+            issues.append(f"CTA#{i+1}: missing badge or button")
+        if 'nofollow' not in block or 'sponsored' not in block:
+            issues.append(f"CTA#{i+1}: missing nofollow/sponsored")
+    if issues:
+        return False, "; ".join(issues)
+    return True, ""
+
+
+def check_006(body):
+    count = len(re.findall(r"^## .+", body, re.MULTILINE))
+    if count == THRESHOLDS["h2_count"]:
+        return True, ""
+    return False, f"H2 count: {count}"
+
+
+def check_007(body):
+    sections = find_h2_sections(body)
+    faq_content = ""
+    for heading, content in sections:
+        if "FAQ" in heading or "よくある質問" in heading:
+            faq_content = content
+            break
+    if not faq_content and len(sections) >= 4:
+        faq_content = sections[3][1]
+    if not faq_content:
+        return False, "FAQ section not found"
+    count = len(re.findall(r"^#{3,4} .+", faq_content, re.MULTILINE))
+    if count >= THRESHOLDS["faq_min_questions"]:
+        return True, ""
+    return False, f"FAQ questions: {count}"
+
+
+def check_008(body):
+    char_count = count_japanese_chars(body)
+    if char_count >= THRESHOLDS["min_chars"]:
+        return True, ""
+    return False, f"chars: {char_count}"
+
+
+def check_009(body):
+    matches = FORBIDDEN_PATTERN.findall(body)
+    if not matches:
+        return True, []
+    word_counts = defaultdict(int)
+    for m in matches:
+        word_counts[m] += 1
+    return False, [f"{w}({c})" for w, c in word_counts.items()]
+
+
+def check_010(body):
+    sections = find_h2_sections(body)
+    if not sections:
+        return False, "no H2 sections"
+    table_lines = [l for l in sections[0][1].split("\n") if l.strip().startswith("|")]
+    if len(table_lines) >= THRESHOLDS["cost_table_min_lines"]:
+        return True, ""
+    return False, f"table lines in H2-1: {len(table_lines)}"
+
+
+def check_011(body):
+    issues = table_issues(body)
+    if issues:
+        return False, "; ".join(issues[:3])
+    return True, ""
+
+
+def check_012(body):
+    matches = re.findall(r"である。|であろう。|[^い]だ。", strip_html_tags(body))
+    if not matches:
+        return True, ""
+    return False, f"常体 found: {matches[:5]}"
+
+
+def check_013(fm, body):
+    area = fm.get("area", "")
+    if not area:
+        return False, "no area in frontmatter"
+    count = body.count(area)
+    if count >= THRESHOLDS["area_min_count"]:
+        return True, ""
+    return False, f"area '{area}' count: {count}"
+
+
+def run(fm, body):
+    results = {f"check_{n:03d}": globals()[f"check_{n:03d}"](body) for n in range(3, 13)}
+    results["check_013"] = check_013(fm, body)
+    return results
+PYEOF
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# seo_qc.py と参照実装（mp）を読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, os, random, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+sys.path.insert(0, os.environ["TEST_TMPDIR"])
+import multipass as mp
+mp.setup(qc)
+
+def single_pass(fm, body):
+    article = qc.parse_article(body)
+    inputs = {"fm": fm, "article": article, "site": "testsite"}
+    return {cid: qc.CHECKS[cid]["func"](*(inputs[a] for a in qc.CHECKS[cid]["args"]))
+            for cid in sorted(qc.CHECKS) if "check_003" <= cid <= "check_013"}
+
+PIECES = [
+    "", "", "本文です。", "東京の害虫駆除は早めが安心です。", "これは常体である。", "いいだ。", "雨だ。",
+    "PR", "アフィリエイト広告を利用しています", "## 費用相場", "## よくある質問", "## FAQ", "## ", "##",
+    "##x", " ## 字下げ", "### Q1", "#### Q2", "###Q", "##### Q", "| 項目 | 費用 |", "|---|---|",
+    "|-|-|", " | 字下げ | 行 |", "| a |", "|", "<!-- CTA: main -->", "<!--CTA:x-->",
+    '<div class="cta-box"><span class="cta-badge">PR</span><a rel="nofollow sponsored">申込</a></div></div>',
+    '<div class="cta-box">', '<a class="cta-button" rel="nofollow">x</a></div>', "</div>",
+    "[リンク](https://example.com)", "**強調**", "- 箇条書き", "> 引用", "\`code\`",
+    "必ず", "絶対に", "No.1", "ナンバーワンの一番", "東京", "東京都", "\t 東京 \t",
+]
+
+def random_body(rng):
+    lines = [rng.choice(PIECES) for _ in range(rng.randint(0, 60))]
+    if rng.random() < 0.3:
+        lines = lines + ["## 見出し" + str(i) for i in range(rng.randint(1, 6))]
+        rng.shuffle(lines)
+    return rng.choice(["\n", "\n\n"]).join(lines) + rng.choice(["", "\n", "\n|"])
+
+$1
+EOF
+}
+
+# =============================================================================
+# T-001: ランダム本文でチェック結果が一致
+# =============================================================================
+
+@test "T-001: checks 003-013 on parse_article match the multi-pass results on fuzzed bodies" {
+    run run_py '
+rng = random.Random(20260101)
+# 閾値を下げて合格側にも十分振れるようにする
+qc.THRESHOLDS.update({"min_chars": 40, "h2_count": 3, "faq_min_questions": 2, "cost_table_min_lines": 2})
+passed = {}
+for n in range(3000):
+    body = random_body(rng)
+    fm = {"area": rng.choice(["東京", "", "大阪"])}
+    got, expected = single_pass(fm, body), mp.run(fm, body)
+    assert got == expected, (body, [(c, got[c], expected[c]) for c in got if got[c] != expected[c]])
+    for cid, (ok, _) in got.items():
+        passed.setdefault(cid, set()).add(ok)
+# どのチェックも合否の両方を通っている
+assert all(v == {True, False} for v in passed.values()), passed
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-002: 中間結果の一致
+# =============================================================================
+
+@test "T-002: sections, character count and table issues match the multi-pass helpers" {
+    run run_py '
+rng = random.Random(20260102)
+for n in range(3000):
+    body = random_body(rng)
+    article = qc.parse_article(body)
+    assert [(s.heading, s.content) for s in article.sections] == mp.find_h2_sections(body), body
+    assert article.char_count == mp.count_japanese_chars(body), body
+    assert article.table_issues == mp.table_issues(body), body
+    assert article.lines == body.split("\n")
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-003: 境界的な本文
+# =============================================================================
+
+@test "T-003: edge-case bodies give the same results" {
+    run run_py '
+bodies = [
+    "",
+    "\n",
+    "## ",
+    "## 見出し",
+    "## A\n## B\n## C\n## D",
+    "## A\n\n## B\n\n## C\n\n## よくある質問\n",
+    "| a | b |",
+    "| a | b |\n|---|---|",
+    "| a |\n| b |\ntext",
+    "text\n| a |\n|--|\n| b |\n\n| c |\n",
+    "## 費用\r\n| a |\r\n|---|\r\n| b |\r\n## FAQ\r\n### Q1\r\n",
+    "<div class=\"cta-box\">\n<span class=\"cta-badge\">x</span>\n<a rel=\"nofollow sponsored\">y</a>\n</div>\n</div>",
+    "PR\n" * 60,
+    "x\n" * 50 + "PR",
+]
+for body in bodies:
+    for fm in ({"area": "東京"}, {}):
+        got, expected = single_pass(fm, body), mp.run(fm, body)
+        assert got == expected, (body, got, expected)
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
@@ -0,0 +1,171 @@
+#!/usr/bin/env bats
+# test_seo_qc_registry.bats — seo_qc.py チェック登録（@register_check）・--plugin・--profile テスト
+#
+# テスト構成:
+#   T-001: 組み込みチェック check_001〜014 が登録順に関係なく ID 順で適用される
+#   T-002: sites 指定のチェックは該当サイトにだけ適用される
+#   T-003: --plugin のチェックがレポートに載り、--jobs 2 のワーカーにも登録される
+#   T-004: --profile が YAML にチェック別の呼び出し回数・時間を出力し、summary に表を出す
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_registry_test.XXXXXX")"
+    local site i
+    for site in site_a site_b; do
+        mkdir -p "$TEST_TMPDIR/base/$site/src/content/area" "$TEST_TMPDIR/base/$site/public/images/articles"
+        for i in 1 2 3; do
+            printf -- '---\ntitle: t\narea: 東京\n---\nPR 料金%s円\n' "$i" > "$TEST_TMPDIR/base/$site/src/content/area/a$i.md"
+        done
+    done
+    printf -- '---\ntitle: t\n---\n無料\n' > "$TEST_TMPDIR/base/site_a/src/content/area/a4.md"
+
+    cat > "$TEST_TMPDIR/plugin.py" <<'PYEOF'
+from seo_qc import register_check
+
+
+@register_check("check_101", "料金表記", sites=["site_a"])
+def check_101_price(article):
+    return ("円" in article.body), "" if "円" in article.body else "no price"
+
+
+@register_check("check_102", "タイトル", args=("fm", "slug"))
+def check_102_title(fm, slug):
+    return bool(fm.get("title")), f"{slug}: no title"
+PYEOF
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# seo_qc.py をモジュールとして読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+$1
+EOF
+}
+
+run_qc() {
+    "$PYTHON" "$SEO_QC" "$1" --base-dir "$TEST_TMPDIR/base" --no-cache --no-history "${@:2}"
+}
+
+# レポートの check ID と pass/fail を1行で表示する
+show_results() {
+    "$PYTHON" -c 'import sys, yaml
+r = yaml.safe_load(open(sys.argv[1]))["results"]
+print(" ".join("%s=%s/%s" % (c, v["pass"], v["fail"]) for c, v in r.items()))' "$1"
+}
+
+# =============================================================================
+# T-001: 組み込みチェックの登録
+# =============================================================================
+
+@test "T-001: built-in checks 001-014 are registered and applied in ID order" {
+    run run_py '
+ids = sorted(qc.CHECKS)
+assert ids == [f"check_{n:03d}" for n in range(1, 15)], ids
+assert all(qc.CHECKS[c]["sites"] is None for c in ids)
+assert qc.checks_for_site("anything") == ids
+assert qc.CHECKS["check_014"]["args"] == ("slug", "images")
+assert qc.CHECKS["check_009"]["args"] == ("article", "site")
+
+@qc.register_check("check_000", "先頭")
+def first(article):
+    return True, ""
+assert qc.checks_for_site("anything")[0] == "check_000"
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-002: sites 指定
+# =============================================================================
+
+@test "T-002: a check registered with sites applies to those sites only" {
+    run run_py '
+@qc.register_check("check_050", "限定", sites=["site_a", "site_c"])
+def limited(article):
+    return True, ""
+assert "check_050" in qc.checks_for_site("site_a")
+assert "check_050" in qc.checks_for_site("site_c")
+assert "check_050" not in qc.checks_for_site("site_b")
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-003: --plugin
+# =============================================================================
+
+@test "T-003: --plugin checks appear in reports, serially and with --jobs 2" {
+    local site jobs
+    for jobs in 1 2; do
+        for site in site_a site_b; do
+            run run_qc "$site" --output yaml --plugin "$TEST_TMPDIR/plugin.py" --jobs "$jobs" \
+                --report-dir "$TEST_TMPDIR/jobs$jobs"
+            [ "$status" -eq 0 ]
+        done
+    done
+
+    run show_results "$TEST_TMPDIR/jobs1/qc_result_site_a.yaml"
+    [[ "$output" == *" check_014=0/4 check_101=3/1 check_102=4/0" ]]
+    run show_results "$TEST_TMPDIR/jobs1/qc_result_site_b.yaml"
+    [[ "$output" == *" check_014=0/3 check_102=3/0" ]]
+    [[ "$output" != *"check_101"* ]]
+
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/jobs1/qc_result_site_a.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/jobs2/qc_result_site_a.yaml")
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/jobs1/qc_result_site_b.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/jobs2/qc_result_site_b.yaml")
+}
+
+# =============================================================================
+# T-004: --profile
+# =============================================================================
+
+@test "T-004: --profile records per-check calls and timings" {
+    run run_qc site_a --output yaml --profile --plugin "$TEST_TMPDIR/plugin.py" --report-dir "$TEST_TMPDIR/report"
+    [ "$status" -eq 0 ]
+
+    run "$PYTHON" -c 'import sys, yaml
+p = yaml.safe_load(open(sys.argv[1]))["profile"]
+times = [v["total_ms"] for v in p.values()]
+assert times == sorted(times, reverse=True), times
+assert all(v["total_ms"] >= 0 and v["avg_us"] >= 0 for v in p.values())
+print(" ".join("%s:%s" % (k, p[k]["calls"]) for k in sorted(p)))' "$TEST_TMPDIR/report/qc_result_site_a.yaml"
+    [ "$status" -eq 0 ]
+    [ "$output" = "check_001:4 check_002:4 check_003:4 check_004:4 check_005:4 check_006:4 check_007:4 check_008:4 check_009:4 check_010:4 check_011:4 check_012:4 check_013:4 check_014:4 check_101:4 check_102:4 parse_article:4 read+frontmatter:4" ]
+
+    # --profile なしでは profile セクションを出さない
+    run run_qc site_a --output yaml --report-dir "$TEST_TMPDIR/plain"
+    ! grep -q '^profile:' "$TEST_TMPDIR/plain/qc_result_site_a.yaml"
+
+    # summary 出力にはチェック名付きの表が出る
+    run run_qc site_a --output summary --profile
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"Profile"*"Calls"*"Total ms"*"Avg us"* ]]
+    [[ "$output" == *"check_014 画像存在"* ]]
+    [[ "$output" == *"parse_article"* ]]
+}
@@ -0,0 +1,122 @@
+#!/usr/bin/env bats
+# test_seo_qc_trend.bats — seo_qc.py 履歴DB・trendサブコマンド テスト
+#
+# テスト構成:
+#   T-001: 実行ごとにサイト別・チェック別の件数が履歴DBへ追記される
+#   T-002: trend がチェック別の推移を古い順に返す（--format json）
+#   T-003: trend all は同一実行の複数サイトを合算する
+#   T-004: --no-history では履歴DBを作らない
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_trend_test.XXXXXX")"
+    export HISTORY="$TEST_TMPDIR/history.db"
+    for site in sitea siteb; do
+        mkdir -p "$TEST_TMPDIR/base/$site/src/content/area" "$TEST_TMPDIR/base/$site/public/images/articles"
+    done
+    printf -- '---\ntitle: t\ndescription: d\npublishedAt: 2025-01-01\ncategory: area\narea: 東京\nkeyword: k\nkeywords:\n  - k\n---\n東京 東京 東京\n' \
+        > "$TEST_TMPDIR/base/sitea/src/content/area/a.md"
+    printf -- '---\ntitle: t\n---\nbody\n' > "$TEST_TMPDIR/base/siteb/src/content/area/b.md"
+}
+
+teardown() {
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# 指定サイトのQCを履歴付きで実行する
+run_qc() {
+    "$PYTHON" "$SEO_QC" "$1" --base-dir "$TEST_TMPDIR/base" --output yaml --no-cache \
+        --report-dir "$TEST_TMPDIR/reports" --history "$HISTORY" "${@:2}"
+}
+
+# =============================================================================
+# T-001: 実行ごとに履歴が追記される
+# =============================================================================
+
+@test "T-001: each run appends per-site and per-check rows to the history" {
+    run_qc sitea
+    run_qc sitea
+
+    run "$PYTHON" -c "
+import sqlite3, sys
+conn = sqlite3.connect(sys.argv[1])
+print(conn.execute('SELECT COUNT(*) FROM runs WHERE site = \"sitea\"').fetchone()[0])
+print(conn.execute('SELECT COUNT(*) FROM check_stats WHERE check_id = \"check_001\"').fetchone()[0])
+" "$HISTORY"
+    [ "$status" -eq 0 ]
+    [ "${lines[0]}" = "2" ]
+    [ "${lines[1]}" = "2" ]
+}
+
+# =============================================================================
+# T-002: trend --check の推移
+# =============================================================================
+
+@test "T-002: trend reports a single check over time, oldest first" {
+    run_qc sitea
+    printf -- '---\ntitle: t\n---\nbody\n' > "$TEST_TMPDIR/base/sitea/src/content/area/c.md"
+    run_qc sitea
+
+    run "$PYTHON" "$SEO_QC" trend sitea --check check_001 --history "$HISTORY" --format json
+    [ "$status" -eq 0 ]
+    echo "$output" | "$PYTHON" -c "
+import json, sys
+data = json.load(sys.stdin)
+runs = data['runs']
+assert [r['total_articles'] for r in runs] == [1, 2], runs
+assert [r['pass'] for r in runs] == [1, 1], runs
+assert [r['fail'] for r in runs] == [0, 1], runs
+assert runs[-1]['pass_rate'] == 50.0, runs
+"
+}
+
+# =============================================================================
+# T-003: trend all は実行単位で合算
+# =============================================================================
+
+@test "T-003: trend all sums the sites of one invocation" {
+    "$PYTHON" - "$SEO_QC" "$HISTORY" "$TEST_TMPDIR/base" <<'PYEOF'
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+reports = [qc.run_site(site, sys.argv[3]) for site in ("sitea", "siteb")]
+qc.record_history(sys.argv[2], reports)
+PYEOF
+
+    run "$PYTHON" "$SEO_QC" trend all --history "$HISTORY" --format json
+    [ "$status" -eq 0 ]
+    echo "$output" | "$PYTHON" -c "
+import json, sys
+runs = json.load(sys.stdin)['runs']
+assert len(runs) == 1, runs
+assert runs[0]['sites'] == 2 and runs[0]['total_articles'] == 2, runs
+"
+}
+
+# =============================================================================
+# T-004: --no-history
+# =============================================================================
+
+@test "T-004: --no-history leaves no history database behind" {
+    run_qc sitea --no-history
+    [ ! -e "$HISTORY" ]
+
+    run "$PYTHON" "$SEO_QC" trend sitea --history "$HISTORY"
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"No history"* ]]
+}
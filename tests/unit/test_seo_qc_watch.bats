@@ -0,0 +1,154 @@
+#!/usr/bin/env bats
+# test_seo_qc_watch.bats — seo_qc.py --watch（LiveSummary の差分更新）テスト
+#
+# テスト構成:
+#   T-001: LiveSummary の update / discard を重ねた結果が全件集計（aggregate_results）と一致
+#   T-002: --watch が記事の追加・編集・削除ごとに、全件実行と同じ YAML レポートへ書き換える
+#   T-003: --watch で画像だけが増えても check_014 と孤立画像が更新される
+
+# --- セットアップ ---
+
+setup_file() {
+    export PROJECT_ROOT="$(cd "$(dirname "$BATS_TEST_FILENAME")/../.." && pwd)"
+    export SEO_QC="$PROJECT_ROOT/scripts/seo_qc.py"
+    if [ -x "$PROJECT_ROOT/.venv/bin/python3" ]; then
+        export PYTHON="$PROJECT_ROOT/.venv/bin/python3"
+    else
+        export PYTHON="python3"
+    fi
+
+    [ -f "$SEO_QC" ] || return 1
+    "$PYTHON" -c "import yaml" 2>/dev/null || return 1
+}
+
+setup() {
+    export TEST_TMPDIR="$(mktemp -d "$BATS_TMPDIR/seo_qc_watch_test.XXXXXX")"
+    export AREA="$TEST_TMPDIR/base/testsite/src/content/area"
+    export IMAGES="$TEST_TMPDIR/base/testsite/public/images/articles"
+    mkdir -p "$AREA" "$IMAGES"
+    printf -- '---\ntitle: t\narea: 東京\n---\nPR 東京\n' > "$AREA/a1.md"
+    printf -- '---\ntitle: t\n---\n絶対\n' > "$AREA/a2.mdx"
+    touch "$IMAGES/a1-ogp.png"
+}
+
+teardown() {
+    if [ -n "${WATCH_PID:-}" ]; then
+        kill "$WATCH_PID" 2>/dev/null || true
+        wait "$WATCH_PID" 2>/dev/null || true
+    fi
+    [ -n "$TEST_TMPDIR" ] && [ -d "$TEST_TMPDIR" ] && rm -rf "$TEST_TMPDIR"
+}
+
+# seo_qc.py をモジュールとして読み込んだ上でPythonコードを実行する
+run_py() {
+    "$PYTHON" - "$SEO_QC" <<EOF
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("seo_qc", sys.argv[1])
+qc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(qc)
+$1
+EOF
+}
+
+start_watch() {
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --no-cache --no-history --watch \
+        --poll-interval 0.2 --debounce 0.2 --report-dir "$TEST_TMPDIR/watch" 2> "$TEST_TMPDIR/watch.err" &
+    WATCH_PID=$!
+    local _
+    for _ in $(seq 1 100); do
+        [ -f "$TEST_TMPDIR/watch/qc_result_testsite.yaml" ] && return 0
+        sleep 0.1
+    done
+    return 1
+}
+
+# watch のレポートが、その時点の全件実行（キャッシュなし）と同じになるまで待つ
+wait_for_full_run_match() {
+    "$PYTHON" "$SEO_QC" testsite --base-dir "$TEST_TMPDIR/base" --no-cache --no-history --output yaml \
+        --report-dir "$TEST_TMPDIR/full" 2> /dev/null
+    local _
+    for _ in $(seq 1 100); do
+        if diff <(grep -v '^timestamp:' "$TEST_TMPDIR/full/qc_result_testsite.yaml") \
+                <(grep -v '^timestamp:' "$TEST_TMPDIR/watch/qc_result_testsite.yaml") > /dev/null 2>&1; then
+            return 0
+        fi
+        sleep 0.1
+    done
+    diff <(grep -v '^timestamp:' "$TEST_TMPDIR/full/qc_result_testsite.yaml") \
+         <(grep -v '^timestamp:' "$TEST_TMPDIR/watch/qc_result_testsite.yaml")
+}
+
+# =============================================================================
+# T-001: LiveSummary == aggregate_results
+# =============================================================================
+
+@test "T-001: LiveSummary updates and discards match a full aggregate" {
+    run run_py '
+import random
+rng = random.Random(20260101)
+qc.FAIL_FILES_LIMIT = 5
+check_ids = ["check_001", "check_002", "check_003"]
+names = [f"a{i:02d}{ext}" for i in range(15) for ext in (".md", ".mdx")]
+live = qc.LiveSummary(check_ids)
+current = {}
+for step in range(3000):
+    name = rng.choice(names)
+    if rng.random() < 0.25:
+        live.discard(name)
+        current.pop(name, None)
+    else:
+        results = {cid: {"pass": rng.random() < 0.5, "detail": ""} for cid in check_ids
+                   if rng.random() < 0.9}
+        if rng.random() < 0.05:
+            results = {"error": "broken"}
+        live.update(name, results)
+        current[name] = results
+    # 全件実行と同じく find_articles の順（.md の後に .mdx）で集計する
+    ordered = dict(sorted(current.items(), key=lambda kv: qc.article_sort_key(kv[0])))
+    assert live.summary() == qc.aggregate_results(ordered, check_ids), step
+print("ok")
+'
+    [ "$status" -eq 0 ]
+    [ "$output" = "ok" ]
+}
+
+# =============================================================================
+# T-002: 記事の追加・編集・削除
+# =============================================================================
+
+@test "T-002: --watch rewrites the report after an add, an edit and a delete" {
+    start_watch
+    wait_for_full_run_match
+
+    # 追加
+    printf -- '---\ntitle: t\narea: 大阪\n---\n大阪 大阪 大阪\n' > "$AREA/a3.md"
+    wait_for_full_run_match
+    grep -q '^total_articles: 3$' "$TEST_TMPDIR/watch/qc_result_testsite.yaml"
+
+    # 編集（禁止語を消す）
+    printf -- '---\ntitle: t\n---\nPR\n' > "$AREA/a2.mdx"
+    wait_for_full_run_match
+    grep -A2 '^  check_009:' "$TEST_TMPDIR/watch/qc_result_testsite.yaml" | grep -q 'fail: 0'
+
+    # 削除
+    rm "$AREA/a1.md"
+    wait_for_full_run_match
+    grep -q '^total_articles: 2$' "$TEST_TMPDIR/watch/qc_result_testsite.yaml"
+
+    grep -q '^\[watch\] testsite: 1 re-checked' "$TEST_TMPDIR/watch.err"
+}
+
+# =============================================================================
+# T-003: 画像だけの変更
+# =============================================================================
+
+@test "T-003: --watch picks up image-only changes" {
+    start_watch
+    wait_for_full_run_match
+
+    touch "$IMAGES/a1-thumb.png" "$IMAGES/a2-ogp.png" "$IMAGES/orphan-ogp.png"
+    wait_for_full_run_match
+    grep -A2 '^  check_014:' "$TEST_TMPDIR/watch/qc_result_testsite.yaml" | grep -q 'pass: 1'
+    grep -q 'orphaned: 1$' "$TEST_TMPDIR/watch/qc_result_testsite.yaml"
+    grep -q '(images changed)' "$TEST_TMPDIR/watch.err"
+}